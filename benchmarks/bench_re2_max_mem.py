@@ -0,0 +1,120 @@
+"""
+This module benchmarks the re2 backend with a single regex set against the
+regex sets partitioned by memory budget. A single set exceeds its memory budget
+with enough patterns. Then it either fails to compile, or runs out of DFA
+memory while matching, and fails to match any file. Whether the set compiled
+and the number of files which failed to match are recorded in the extra info
+of each benchmark.
+"""
+
+import random
+from typing import (
+	Callable)  # Replaced by `collections.abc.Callable` in 3.9.2.
+
+import pytest
+from pytest_benchmark.fixture import (
+	BenchmarkFixture)
+
+try:
+	import re2
+except ModuleNotFoundError:
+	re2 = None
+
+from pathspec.patterns.gitignore.basic import (
+	GitIgnoreBasicPattern)
+from pathspec._backends.re2.pathspec import (
+	Re2PsBackend)
+
+FILE_COUNT = 1000
+
+PATTERN_COUNTS = [100, 1000, 5000, 20000]
+
+
+@pytest.fixture(scope='module')
+def files() -> list[str]:
+	rand = random.Random(0)
+	return [
+		f"dir{rand.randrange(100)}/sub{rand.randrange(100)}/name{__i}.ext{rand.randrange(20)}"
+		for __i in range(FILE_COUNT)
+	]
+
+
+@pytest.mark.parametrize('count', PATTERN_COUNTS)
+@pytest.mark.parametrize('mode', ['single', 'partitioned'])
+def bench_compile(benchmark: BenchmarkFixture, count: int, mode: str):
+	benchmark.group = f"re2 max_mem: compile {count} patterns"
+	patterns = make_patterns(count)
+	benchmark(make_matcher, mode, patterns)
+
+
+@pytest.mark.parametrize('count', PATTERN_COUNTS)
+@pytest.mark.parametrize('mode', ['single', 'partitioned'])
+def bench_match(
+	benchmark: BenchmarkFixture,
+	count: int,
+	files: list[str],
+	mode: str,
+):
+	benchmark.group = f"re2 max_mem: match {count} patterns"
+	match, compiled = make_matcher(mode, make_patterns(count))
+	benchmark.extra_info['compiled'] = compiled
+	benchmark.extra_info['misses'] = sum(not match(__file) for __file in files)
+	benchmark(run_match, match, files)
+
+
+def make_matcher(
+	mode: str,
+	patterns: list[GitIgnoreBasicPattern],
+) -> tuple[Callable[[str], bool], bool]:
+	if re2 is None:
+		pytest.skip("re2 is not installed.")
+
+	if mode == 'partitioned':
+		backend = Re2PsBackend(patterns)
+
+		def match(file: str) -> bool:
+			return backend.match_file(file)[0] is not None
+
+		return (match, True)
+
+	elif mode == 'single':
+		# Compile every pattern into one set with the default budget.
+		options = re2.Options()
+		options.log_errors = False
+		options.never_capture = True
+		regex_set = re2.Set.SearchSet(options)
+		for pattern in patterns:
+			regex_set.Add(pattern._get_match_regex('re2'))
+
+		try:
+			regex_set.Compile()
+		except re2.error:
+			# The set exceeded the budget, so every file is a miss.
+			def miss(file: str) -> bool:
+				return False
+
+			return (miss, False)
+
+		def match(file: str) -> bool:
+			return bool(regex_set.Match(file))
+
+		return (match, True)
+
+	else:
+		raise ValueError(f"{mode=!r} is not supported.")
+
+
+def make_patterns(count: int) -> list[GitIgnoreBasicPattern]:
+	# Every file is matched by the last pattern. Wildcards in the middle of the
+	# patterns keep the set from being reduced to literals.
+	patterns = [
+		GitIgnoreBasicPattern(f"dir{__i % 100}/*/name{__i}*.ext{__i % 20}")
+		for __i in range(count - 1)
+	]
+	patterns.append(GitIgnoreBasicPattern("*.ext*"))
+	return patterns
+
+
+def run_match(match: Callable[[str], bool], files: list[str]):
+	for file in files:
+		match(file)
@@ -0,0 +1,156 @@
+"""
+This module benchmarks the regular expressions lowered from the gitignore
+patterns with the optimizations for each regular expression engine. Each rewrite
+is benchmarked with the original and optimized regular expressions.
+"""
+
+import random
+import re
+from typing import (
+	Callable)  # Replaced by `collections.abc.Callable` in 3.9.2.
+
+import pytest
+from pytest_benchmark.fixture import (
+	BenchmarkFixture)
+
+try:
+	import hyperscan
+except ModuleNotFoundError:
+	hyperscan = None
+
+try:
+	import re2
+except ModuleNotFoundError:
+	re2 = None
+
+from pathspec.patterns.gitignore.basic import (
+	GitIgnoreBasicPattern)
+
+ENGINES = ['hyperscan', 're', 're2']
+
+FILE_COUNT = 1000
+
+PATTERN_COUNT = 1000
+
+SHAPES = {
+	'literal': lambda i: f"name{i}",
+	'literal_dir': lambda i: f"name{i}/",
+	'suffix': lambda i: f"*.ext{i}",
+}
+"""
+Maps rewrite name to the function generating its pattern for an index.
+"""
+
+
+@pytest.fixture(scope='module')
+def files() -> list[str]:
+	rand = random.Random(0)
+	return [
+		f"dir{rand.randrange(10)}/name{rand.randrange(20)}/file{__i}.ext{rand.randrange(20)}"
+		for __i in range(FILE_COUNT)
+	]
+
+
+@pytest.mark.parametrize('optimize', [False, True], ids=['original', 'optimized'])
+@pytest.mark.parametrize('shape', sorted(SHAPES))
+@pytest.mark.parametrize('engine', ['hyperscan', 're2'])
+def bench_compile(
+	benchmark: BenchmarkFixture,
+	engine: str,
+	shape: str,
+	optimize: bool,
+):
+	benchmark.group = f"Regex optimization: compile {PATTERN_COUNT} {shape}, {engine}"
+	regexes = make_regexes(engine, shape, optimize, PATTERN_COUNT)
+	benchmark(make_matcher, engine, regexes)
+
+
+@pytest.mark.parametrize('optimize', [False, True], ids=['original', 'optimized'])
+@pytest.mark.parametrize('shape', sorted(SHAPES))
+@pytest.mark.parametrize('engine', ENGINES)
+def bench_match(
+	benchmark: BenchmarkFixture,
+	engine: str,
+	files: list[str],
+	shape: str,
+	optimize: bool,
+):
+	benchmark.group = f"Regex optimization: match {shape}, {engine}"
+	regexes = make_regexes(engine, shape, optimize, 1)
+	match = make_matcher(engine, regexes)
+	benchmark(run_match, match, files)
+
+
+def make_matcher(engine: str, regexes: list[str]) -> Callable[[str], object]:
+	if engine == 're':
+		compiled = [re.compile(__regex).search for __regex in regexes]
+
+		def match(file: str) -> bool:
+			for search in compiled:
+				if search(file) is not None:
+					return True
+			return False
+
+		return match
+
+	elif engine == 're2':
+		if re2 is None:
+			pytest.skip("re2 is not installed.")
+
+		options = re2.Options()
+		options.log_errors = False
+		options.never_capture = True
+		regex_set = re2.Set.SearchSet(options)
+		for regex in regexes:
+			regex_set.Add(regex)
+
+		regex_set.Compile()
+		return regex_set.Match
+
+	elif engine == 'hyperscan':
+		if hyperscan is None:
+			pytest.skip("hyperscan is not installed.")
+
+		db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+		db.compile(
+			expressions=[__regex.encode('utf8') for __regex in regexes],
+			ids=list(range(len(regexes))),
+			elements=len(regexes),
+			flags=hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8,
+		)
+
+		def on_match(*_args) -> None:
+			return None
+
+		def match(file: str) -> None:
+			db.scan(file.encode('utf8'), match_event_handler=on_match)
+
+		return match
+
+	else:
+		raise ValueError(f"{engine=!r} is not supported.")
+
+
+def make_regexes(
+	engine: str,
+	shape: str,
+	optimize: bool,
+	count: int,
+) -> list[str]:
+	make_pattern = SHAPES[shape]
+	regexes = []
+	for i in range(count):
+		ir = GitIgnoreBasicPattern(make_pattern(i))._get_ir()
+		assert ir is not None, make_pattern(i)
+		regex = ir.to_match_regex(engine if optimize else None)  # type: ignore[arg-type]
+		if optimize:
+			assert regex != ir.to_match_regex(), regex
+
+		regexes.append(regex)
+
+	return regexes
+
+
+def run_match(match: Callable[[str], object], files: list[str]):
+	for file in files:
+		match(file)
@@ -7,8 +7,14 @@ The following classes are imported and made available from the root of the
 
 -	:class:`pathspec.gitignore.GitIgnoreSpec`
 
+-	:class:`pathspec.gitignore.LayeredGitIgnoreSpec`
+
 -	:class:`pathspec.pathspec.PathSpec`
 
+-	:class:`pathspec.specmap.PathSpecMap`
+
+-	:class:`pathspec.specset.PathSpecSet`
+
 -	:class:`pathspec.pattern.Pattern`
 
 -	:class:`pathspec.pattern.RegexPattern`
@@ -28,12 +34,17 @@ compatibility:
 """
 
 from .gitignore import (
-	GitIgnoreSpec)
+	GitIgnoreSpec,
+	LayeredGitIgnoreSpec)
 from .pathspec import (
 	PathSpec)
 from .pattern import (
 	Pattern,
 	RegexPattern)
+from .specmap import (
+	PathSpecMap)
+from .specset import (
+	PathSpecSet)
 from .util import (
 	RecursionError,
 	iter_tree,  # Deprecated since 0.10.0.
@@ -55,7 +66,10 @@ from . import patterns
 # are deliberately excluded.
 __all__ = [
 	'GitIgnoreSpec',
+	'LayeredGitIgnoreSpec',
 	'PathSpec',
+	'PathSpecMap',
+	'PathSpecSet',
 	'Pattern',
 	'RecursionError',
 	'RegexPattern',
@@ -5,16 +5,32 @@ WARNING: The *pathspec._backends* package is not part of the public API. Its
 contents and structure are likely to change.
 """
 
+import os
 from collections.abc import (
 	Iterable)
 from typing import (
-	TypeVar)
+	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
+	Generic,
+	Optional,  # Replaced by `X | None` in 3.10.
+	TypeVar,
+	Union)  # Replaced by `X | Y` in 3.10.
 
 from pathspec.pattern import (
-	Pattern)
+	Pattern,
+	RegexPattern)
+from pathspec.patterns.gitignore.base import (
+	_BYTES_ENCODING,
+	_GitIgnoreBasePattern)
+from pathspec.patterns.gitignore.spec import (
+	_DIR_MARK_CG)
+from pathspec.patterns.gitignore._ir import (
+	GitIgnorePatternIR,
+	RegexEngineHint)
 
 TPattern = TypeVar("TPattern", bound=Pattern)
 
+TResult = TypeVar("TResult")
+
 
 def enumerate_patterns(
 	patterns: Iterable[TPattern],
@@ -43,3 +59,359 @@ def enumerate_patterns(
 		out_patterns.reverse()
 
 	return out_patterns
+
+
+def fold_gitignore_match(
+	out: tuple[Optional[bool], int, int],
+	include: bool,
+	index: int,
+	is_dir_pattern: bool,
+) -> tuple[Optional[bool], int, int]:
+	"""
+	Fold a match into the current match for :class:`~pathspec.gitignore.GitIgnoreSpec`.
+	A match by a file pattern takes precedence over a match by a directory
+	pattern, and then the last pattern takes precedence. This is the same result
+	as checking the patterns in reverse order. The result only depends on the
+	priority and index of each match so the matches can be folded in any order.
+
+	*out* (:class:`tuple`) is the current match. It contains the match include
+	(:class:`bool` or :data:`None`), the match index (:class:`int`), and the
+	match priority (:class:`int`). Use ``(None, -1, 0)`` for no match.
+
+	*include* (:class:`bool`) is whether the matched pattern includes the file.
+
+	*index* (:class:`int`) is the index of the matched pattern.
+
+	*is_dir_pattern* (:class:`bool`) is whether the pattern matched by a
+	directory pattern.
+
+	Returns the new current match (:class:`tuple`).
+	"""
+	if is_dir_pattern:
+		# Pattern matched by a directory pattern.
+		priority = 1
+	else:
+		# Pattern matched by a file pattern.
+		priority = 2
+
+	out_priority = out[2]
+	if priority > out_priority or (priority == out_priority and index > out[1]):
+		return (include, index, priority)
+	else:
+		return out
+
+
+def get_dir_key(file: str) -> str:
+	"""
+	Get the directory portion of the file path used to look up memoized directory
+	results.
+
+	*file* (:class:`str`) is the normalized file path.
+
+	Returns the directory path including its trailing slash (:class:`str`), or an
+	empty string for a file in the root directory.
+	"""
+	return file[:file.rfind('/') + 1]
+
+
+def is_dir_only_pattern(pattern: Pattern) -> bool:
+	"""
+	Get whether the pattern can only match a file by one of its parent
+	directories. The result of such a pattern is the same for every file under the
+	same directory, and the pattern can be matched against the directory key (see
+	:func:`get_dir_key`) instead of the full file path.
+
+	*pattern* (:class:`.Pattern`) is the pattern.
+
+	Returns whether the pattern only depends on the directory components
+	(:class:`bool`).
+	"""
+	if (
+		not isinstance(pattern, _GitIgnoreBasePattern)
+		or pattern.include is None
+		or pattern.raw_regex is None
+	):
+		# Only the regular expressions generated for gitignore patterns have a known
+		# structure.
+		return False
+
+	if (ir := pattern._get_ir()) is not None:
+		# A gitignore pattern ending with double-asterisks (or a slash) must match a
+		# leading part of the path ending with a slash. That part is always within
+		# the directory key of the file.
+		return ir.is_dir_only
+
+	# A precompiled regular expression ending with a slash (or the directory
+	# marker) is treated the same.
+	regex = pattern.raw_regex
+	if isinstance(regex, bytes):
+		regex = regex.decode(_BYTES_ENCODING)
+
+	return regex.endswith('/') or regex.endswith(_DIR_MARK_CG)
+
+
+def lower_set_regexes(
+	pattern: RegexPattern,
+	gitignore: bool,
+	engine: RegexEngineHint,
+) -> list[tuple[Union[str, bytes], bool]]:
+	"""
+	Lower the pattern into the regular expressions to compile into a regex set
+	(or database) the same as the backend for its path-spec.
+
+	*pattern* (:class:`.RegexPattern`) is the pattern.
+
+	*gitignore* (:class:`bool`) is whether the pattern is used by
+	:class:`~pathspec.gitignore.GitIgnoreSpec` (:data:`True`), or
+	:class:`~pathspec.pathspec.PathSpec` (:data:`False`).
+
+	*engine* (:class:`str`) is the regular expression engine to optimize for.
+
+	Returns a :class:`list` containing each regular expression (:class:`str` or
+	:class:`bytes`), and whether it matches by a directory pattern
+	(:class:`bool`).
+	"""
+	regex = pattern.raw_regex
+	assert regex is not None, pattern
+
+	if isinstance(pattern, _GitIgnoreBasePattern):
+		if gitignore:
+			# Lower the pattern into its directory and file variants.
+			return pattern._get_regex_variants(engine)  # type: ignore[return-value]
+		else:
+			# Lower the gitignore pattern into a regular expression optimized for the
+			# engine.
+			match_regex = pattern._get_match_regex(engine)
+			assert match_regex is not None, pattern
+			return [(match_regex, False)]
+
+	return [(regex, False)]
+
+
+def match_pattern_bits(
+	patterns: Iterable[tuple[int, Pattern]],
+	file: Union[str, bytes],
+) -> int:
+	"""
+	Check the file against each pattern, and collect every match.
+
+	*patterns* (:class:`Iterable` of :class:`tuple`) contains the enumerated
+	patterns.
+
+	*file* (:class:`str` or :class:`bytes`) is the normalized file path to check.
+	A :class:`bytes` path is decoded with :func:`os.fsdecode`.
+
+	Returns the bitset of the matched patterns (:class:`int`). Bit *i* is set
+	when the pattern at index *i* matched.
+	"""
+	matches = 0
+	str_file: Optional[str] = None
+	for index, pattern in patterns:
+		if str_file is None:
+			str_file = os.fsdecode(file)
+
+		if pattern.include is not None and pattern.matches_file(str_file):
+			matches |= 1 << index
+
+	return matches
+
+
+def minimize_patterns(
+	patterns: list[tuple[int, TPattern]],
+) -> tuple[list[tuple[int, TPattern]], list[tuple[int, TPattern]]]:
+	"""
+	Remove the patterns which cannot affect the result of a match. A pattern is
+	removed when a later pattern with the same include is identical, or matches
+	every path it matches with at least the same priority (see
+	:meth:`.GitIgnorePatternIR.covers`). The later pattern is always the last
+	match in its place, so the result and its pattern index are unchanged.
+
+	*patterns* (:class:`list` of :class:`tuple`) contains the enumerated patterns
+	in order without no-op patterns (see :func:`enumerate_patterns`).
+
+	Returns a :class:`tuple` containing the remaining enumerated patterns
+	(:class:`list` of :class:`tuple`) in order, and the removed enumerated
+	patterns (:class:`list` of :class:`tuple`) in order.
+	"""
+	# Check each pattern against the later patterns.
+	later_keys: set[tuple] = set()
+	later_irs: dict[tuple, list[GitIgnorePatternIR]] = {}
+	out_patterns: list[tuple[int, TPattern]] = []
+	removed_patterns: list[tuple[int, TPattern]] = []
+	for index_pattern in reversed(patterns):
+		pattern = index_pattern[1]
+		include = pattern.include
+		if (
+			isinstance(pattern, RegexPattern)
+			and (regex_key := pattern._get_regex_key()) is not None
+		):
+			# Remove an identical pattern.
+			key = (pattern.__class__, include, regex_key)
+			if key in later_keys:
+				removed_patterns.append(index_pattern)
+				continue
+
+			later_keys.add(key)
+
+		if (
+			isinstance(pattern, _GitIgnoreBasePattern)
+			and (ir := pattern._get_ir()) is not None
+		):
+			# Remove a pattern covered by a later pattern. Only a pattern with the
+			# same segments, or without segments can cover another pattern.
+			seg_key = (pattern.__class__, include, ir.segments)
+			any_key = (pattern.__class__, include, ())
+			if any(
+				__ir.covers(ir)
+				for __key in {seg_key, any_key}
+				for __ir in later_irs.get(__key, ())
+			):
+				removed_patterns.append(index_pattern)
+				continue
+
+			later_irs.setdefault(seg_key, []).append(ir)
+
+		out_patterns.append(index_pattern)
+
+	out_patterns.reverse()
+	removed_patterns.reverse()
+	return out_patterns, removed_patterns
+
+
+def split_dir_patterns(
+	patterns: Iterable[tuple[int, TPattern]],
+) -> tuple[list[tuple[int, TPattern]], list[tuple[int, TPattern]]]:
+	"""
+	Split the enumerated patterns by whether they only depend on the directory
+	components of a path. See :func:`is_dir_only_pattern`.
+
+	*patterns* (:class:`Iterable` of :class:`tuple`) contains the enumerated
+	patterns.
+
+	Returns a :class:`tuple` containing the enumerated directory patterns
+	(:class:`list` of :class:`tuple`), and the enumerated remaining patterns
+	(:class:`list` of :class:`tuple`). Each keeps the order of *patterns*.
+	"""
+	dir_patterns: list[tuple[int, TPattern]] = []
+	file_patterns: list[tuple[int, TPattern]] = []
+	for index_pattern in patterns:
+		if is_dir_only_pattern(index_pattern[1]):
+			dir_patterns.append(index_pattern)
+		else:
+			file_patterns.append(index_pattern)
+
+	return dir_patterns, file_patterns
+
+
+class DirResultMemo(Generic[TResult]):
+	"""
+	The :class:`DirResultMemo` class memoizes the result for each directory
+	encountered while checking a batch of files.
+	"""
+
+	def __init__(self, compute: Callable[[str], TResult]) -> None:
+		"""
+		Initialize the :class:`DirResultMemo` instance.
+
+		*compute* (:class:`~collections.abc.Callable`) is used to compute the result
+		for a directory key (:class:`str`). See :func:`get_dir_key`.
+		"""
+
+		self._compute = compute
+		"""
+		*_compute* (:class:`~collections.abc.Callable`) is used to compute the
+		result for a directory key.
+		"""
+
+		self._memo: dict[str, TResult] = {}
+		"""
+		*_memo* (:class:`dict`) maps directory key (:class:`str`) to result.
+		"""
+
+	def get(self, dir_key: str) -> TResult:
+		"""
+		Get the result for the directory.
+
+		*dir_key* (:class:`str`) is the directory key.
+
+		Returns the result.
+		"""
+		memo = self._memo
+		if dir_key in memo:
+			return memo[dir_key]
+
+		result = memo[dir_key] = self._compute(dir_key)
+		return result
+
+
+class DirResultStack(Generic[TResult]):
+	"""
+	The :class:`DirResultStack` class memoizes the result for each directory of
+	the previous path. Only the memoized results of the parent directories shared
+	with the new path are kept, so the memo is bounded by the depth of the path
+	instead of the number of directories. The result of a directory which is not
+	memoized is computed in full, and is not derived from the result of its
+	parent. This works best when the paths are sorted (or grouped by directory as
+	when walking a tree) so the result of a directory is reused by the paths
+	after it. The results are correct regardless of order.
+	"""
+
+	def __init__(self, compute: Callable[[str], TResult]) -> None:
+		"""
+		Initialize the :class:`DirResultStack` instance.
+
+		*compute* (:class:`~collections.abc.Callable`) is used to compute the result
+		for a directory key (:class:`str`). See :func:`get_dir_key`.
+		"""
+
+		self._compute = compute
+		"""
+		*_compute* (:class:`~collections.abc.Callable`) is used to compute the
+		result for a directory key.
+		"""
+
+		self._dir = ''
+		"""
+		*_dir* (:class:`str`) is the directory key of the previous path.
+		"""
+
+		self._stack: list[list] = [[0, None]]
+		"""
+		*_stack* (:class:`list`) contains an entry (:class:`list`) for each
+		directory of :attr:`self._dir <DirResultStack._dir>`, starting with the
+		root. Each entry contains the length of the directory key (:class:`int`),
+		and its lazily computed result (or :data:`None`).
+		"""
+
+	def get(self, dir_key: str) -> TResult:
+		"""
+		Get the result for the directory.
+
+		*dir_key* (:class:`str`) is the directory key.
+
+		Returns the result.
+		"""
+		stack = self._stack
+		if dir_key != self._dir:
+			# Pop the directories not shared with the new directory.
+			prev_dir = self._dir
+			while len(stack) > 1:
+				end = stack[-1][0]
+				if dir_key[:end] == prev_dir[:end]:
+					break
+				stack.pop()
+
+			# Push the new directories. Their results are computed on first use.
+			end = stack[-1][0]
+			while (pos := dir_key.find('/', end)) != -1:
+				end = pos + 1
+				stack.append([end, None])
+
+			self._dir = dir_key
+
+		entry = stack[-1]
+		result: Optional[TResult] = entry[1]
+		if result is None:
+			result = entry[1] = self._compute(dir_key)
+
+		return result
@@ -13,27 +13,37 @@ from typing import (
 
 from pathspec.backend import (
 	BackendNamesHint,
-	_Backend)
+	_Backend,
+	_SetBackend)
 from pathspec.pattern import (
 	Pattern,
 	RegexPattern)
 
+from .cone.pathspec import (
+	ConePsBackend,
+	is_cone_patterns)
 from .hyperscan.base import (
 	hyperscan_error)
 from .hyperscan.gitignore import (
 	HyperscanGiBackend)
 from .hyperscan.pathspec import (
 	HyperscanPsBackend)
+from .hyperscan.specset import (
+	HyperscanSetBackend)
 from .re2.base import (
 	re2_error)
 from .re2.gitignore import (
 	Re2GiBackend)
 from .re2.pathspec import (
 	Re2PsBackend)
+from .re2.specset import (
+	Re2SetBackend)
 from .simple.gitignore import (
 	SimpleGiBackend)
 from .simple.pathspec import (
 	SimplePsBackend)
+from .simple.specset import (
+	SimpleSetBackend)
 
 _BEST_BACKEND: BackendNamesHint
 """
@@ -92,6 +102,10 @@ def make_pathspec_backend(
 	Returns the backend (:class:`._Backend`).
 	"""
 	if name == 'best':
+		if is_cone_patterns(patterns):
+			# The sparse-checkout cone-mode patterns are matched by their directories.
+			return ConePsBackend(patterns)
+
 		name = _BEST_BACKEND
 
 	if name == 'hyperscan':
@@ -102,3 +116,32 @@ def make_pathspec_backend(
 		return SimplePsBackend(patterns)
 	else:
 		raise ValueError(f"Backend {name=!r} is invalid.")
+
+
+def make_specset_backend(
+	name: BackendNamesHint,
+	specs: Sequence[tuple[Sequence[Pattern], bool]],
+) -> _SetBackend:
+	"""
+	Create the specified backend with the supplied path-specs for
+	:class:`~pathspec.specset.PathSpecSet`.
+
+	*name* (:class:`str`) is the name of the backend.
+
+	*specs* (:class:`Sequence` of :class:`tuple`) contains the compiled patterns
+	of each path-spec (:class:`Sequence` of :class:`.Pattern`), and whether the
+	path-spec is a :class:`~pathspec.gitignore.GitIgnoreSpec` (:class:`bool`).
+
+	Returns the backend (:class:`._SetBackend`).
+	"""
+	if name == 'best':
+		name = _BEST_BACKEND
+
+	if name == 'hyperscan':
+		return HyperscanSetBackend(specs)
+	elif name == 're2':
+		return Re2SetBackend(specs)
+	elif name == 'simple':
+		return SimpleSetBackend(specs)
+	else:
+		raise ValueError(f"Backend {name=!r} is invalid.")
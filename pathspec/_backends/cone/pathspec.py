@@ -0,0 +1,223 @@
+"""
+This module provides the cone-mode backend for :class:`~pathspec.pathspec.PathSpec`.
+
+WARNING: The *pathspec._backends.cone* package is not part of the public API.
+Its contents and structure are likely to change.
+"""
+
+from collections.abc import (
+	Sequence)
+from typing import (
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
+
+from pathspec.backend import (
+	_Backend,
+	_MatchFileHint)
+from pathspec.pattern import (
+	Pattern)
+from pathspec.patterns.gitignore.cone import (
+	SparseConePattern)
+from pathspec._typing import (
+	override)  # Added in 3.12.
+
+from .._utils import (
+	DirResultMemo,
+	DirResultStack,
+	get_dir_key)
+
+
+def is_cone_patterns(patterns: Sequence[Pattern]) -> bool:
+	"""
+	Get whether the patterns can be matched by :class:`ConePsBackend`.
+
+	*patterns* (:class:`Sequence` of :class:`.Pattern`) contains the compiled
+	patterns.
+
+	Returns whether every pattern is a null-operation or a
+	:class:`.SparseConePattern` in the cone-mode format (:class:`bool`).
+	"""
+	has_cone = False
+	for pattern in patterns:
+		if pattern.include is None:
+			continue
+		elif isinstance(pattern, SparseConePattern) and pattern._get_cone() is not None:
+			has_cone = True
+		else:
+			return False
+
+	return has_cone
+
+
+class ConePsBackend(_Backend):
+	"""
+	The :class:`ConePsBackend` class is the cone-mode implementation used by
+	:class:`~pathspec.pathspec.PathSpec` for matching files. Each pattern matches
+	the paths underneath a directory (or its subdirectories), so a path is
+	matched by looking up each of its parent directories in a hash table.
+	"""
+
+	def __init__(self, patterns: Sequence[Pattern]) -> None:
+		"""
+		Initialize the :class:`ConePsBackend` instance.
+
+		*patterns* (:class:`Sequence` of :class:`.Pattern`) contains the compiled
+		patterns. They must be in the cone-mode format (see
+		:func:`is_cone_patterns`).
+		"""
+		children: dict[str, tuple[bool, int]] = {}
+		recursive: dict[str, tuple[bool, int]] = {}
+		children_bits: dict[str, int] = {}
+		recursive_bits: dict[str, int] = {}
+		for index, pattern in enumerate(patterns):
+			if pattern.include is None:
+				continue
+
+			cone = None
+			if isinstance(pattern, SparseConePattern):
+				cone = pattern._get_cone()
+
+			if cone is None:
+				raise ValueError(f"{pattern=!r} is not in the cone-mode format.")
+
+			# Only the last pattern for a directory can be the last match.
+			kind, dir_key = cone
+			if kind == 'children':
+				children[dir_key] = (pattern.include, index)
+				children_bits[dir_key] = children_bits.get(dir_key, 0) | 1 << index
+			else:
+				recursive[dir_key] = (pattern.include, index)
+				recursive_bits[dir_key] = recursive_bits.get(dir_key, 0) | 1 << index
+
+		self._children_bits: dict[str, int] = children_bits
+		"""
+		*_children_bits* (:class:`dict`) maps the directory key (:class:`str`) of
+		the children patterns to the bitset of their indices (:class:`int`). This is
+		used to find every matched pattern.
+		"""
+
+		self._children: dict[str, tuple[bool, int]] = children
+		"""
+		*_children* (:class:`dict`) maps the directory key (:class:`str`) of each
+		pattern matching the paths in its subdirectories to the pattern include
+		(:class:`bool`) and index (:class:`int`).
+		"""
+
+		self._recursive: dict[str, tuple[bool, int]] = recursive
+		"""
+		*_recursive* (:class:`dict`) maps the directory key (:class:`str`) of each
+		pattern matching the paths underneath it to the pattern include
+		(:class:`bool`) and index (:class:`int`).
+		"""
+
+		self._recursive_bits: dict[str, int] = recursive_bits
+		"""
+		*_recursive_bits* (:class:`dict`) maps the directory key (:class:`str`) of
+		the recursive patterns to the bitset of their indices (:class:`int`).
+		"""
+
+	@override
+	def make_batch_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchFileHint:
+		"""
+		Create the function used to check a batch of files against the patterns.
+		The result only depends on the parent directories of a file, so it is
+		memoized per directory.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous file are kept.
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		memo: Union[DirResultMemo, DirResultStack]
+		if presorted:
+			memo = DirResultStack(self.match_file)
+		else:
+			memo = DirResultMemo(self.match_file)
+
+		get_dir_result = memo.get
+
+		def match_file(file: str) -> tuple[Optional[bool], Optional[int]]:
+			return get_dir_result(get_dir_key(file))
+
+		return match_file
+
+	@override
+	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the file against the patterns.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), and the index of the last matched pattern (:class:`int` or
+		:data:`None`).
+		"""
+		children = self._children
+		recursive = self._recursive
+
+		# Look up each parent directory starting with the root. A recursive pattern
+		# matches the paths underneath its directory. A children pattern also
+		# requires a non-empty path segment followed by a slash.
+		out: Optional[tuple[bool, int]] = None
+		dir_key = ''
+		pos = 0
+		while True:
+			match = recursive.get(dir_key)
+			if match is not None and (out is None or match[1] > out[1]):
+				out = match
+
+			end = file.find('/', pos)
+			if end == -1:
+				break
+
+			if end > pos:
+				match = children.get(dir_key)
+				if match is not None and (out is None or match[1] > out[1]):
+					out = match
+
+			pos = end + 1
+			dir_key = file[:pos]
+
+		if out is None:
+			return (None, None)
+
+		return out
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		children_bits = self._children_bits
+		recursive_bits = self._recursive_bits
+
+		# Look up each parent directory the same as `match_file()`.
+		matches = 0
+		dir_key = ''
+		pos = 0
+		while True:
+			matches |= recursive_bits.get(dir_key, 0)
+
+			end = file.find('/', pos)
+			if end == -1:
+				break
+
+			if end > pos:
+				matches |= children_bits.get(dir_key, 0)
+
+			pos = end + 1
+			dir_key = file[:pos]
+
+		include, index = self.match_file(file)
+		return (include, index, matches)
@@ -29,6 +29,19 @@ The hyperscan flags to use:
 -	HS_FLAG_UTF8 is required to support unicode paths.
 """
 
+HS_LITERAL_FLAGS = 0
+"""
+The hyperscan flags to use for the literal database. The literal API does not
+support HS_FLAG_UTF8, and HS_FLAG_SINGLEMATCH cannot be used because each
+occurrence of a literal must be checked.
+"""
+
+LITERAL_SENTINEL = b'/'
+"""
+The sentinel added to both ends of a path scanned by the literal database. This
+lets a literal match the start and end of a path the same as a path segment.
+"""
+
 
 @dataclass(frozen=True)
 class HyperscanExprDat(object):
@@ -76,3 +89,47 @@ class HyperscanExprDebug(HyperscanExprDat):
 	"""
 	*regex* (:class:`str` or :class:`bytes`) is the regular expression.
 	"""
+
+
+@dataclass(frozen=True)
+class HyperscanSetExprDat(HyperscanExprDat):
+	"""
+	The :class:`HyperscanSetExprDat` class stores the path-spec of an
+	expression compiled for several path-specs.
+	"""
+
+	# The slots argument is not supported until Python 3.10.
+	__slots__ = ['spec_index']
+
+	spec_index: int
+	"""
+	*spec_index* (:class:`int`) is the index of the path-spec.
+	"""
+
+
+@dataclass(frozen=True)
+class HyperscanLiteralDat(HyperscanExprDat):
+	"""
+	The :class:`HyperscanLiteralDat` class stores the data related to a literal
+	compiled into the literal database. The literal is scanned for in the path
+	surrounded by slashes ('/') (see :data:`LITERAL_SENTINEL`).
+	"""
+
+	# The slots argument is not supported until Python 3.10.
+	__slots__ = [
+		'dir_only',
+		'end',
+	]
+
+	dir_only: bool
+	"""
+	*dir_only* (:class:`bool`) is whether the trailing slash ('/') of the literal
+	cannot be matched by the trailing sentinel.
+	"""
+
+	end: int
+	"""
+	*end* (:class:`int`) is the end offset the literal must be matched at for a
+	literal anchored to the start of the path. This is ``-1`` when the literal
+	can be matched anywhere.
+	"""
@@ -21,11 +21,8 @@ except ModuleNotFoundError:
 
 from pathspec.pattern import (
 	RegexPattern)
-from pathspec.patterns.gitignore.spec import (
-	GitIgnoreSpecPattern,
-	_BYTES_ENCODING,
-	_DIR_MARK_CG,
-	_DIR_MARK_OPT)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 
@@ -44,6 +41,15 @@ class HyperscanGiBackend(HyperscanPsBackend):
 	Hyperscan database uses block mode for matching files.
 	"""
 
+	# The priority of a match depends on the order the matches are produced in
+	# when an include pattern matches by a directory pattern. Removing a pattern
+	# can change which match is reported, so do not minimize the patterns.
+	_minimize = False
+
+	# The literal database does not distinguish the directory and file variants of
+	# a pattern, so compile every pattern as a regular expression.
+	_literals = False
+
 	# Change type hint.
 	_out: tuple[Optional[bool], int, int]  # type: ignore[assignment]
 
@@ -51,6 +57,7 @@ class HyperscanGiBackend(HyperscanPsBackend):
 		self,
 		patterns: Sequence[RegexPattern],
 		*,
+		shards: Optional[int] = None,
 		_debug_exprs: Optional[bool] = None,
 		_test_sort: Optional[Callable[[list], None]] = None,
 	) -> None:
@@ -59,8 +66,16 @@ class HyperscanGiBackend(HyperscanPsBackend):
 
 		*patterns* (:class:`Sequence` of :class:`.RegexPattern`) contains the
 		compiled patterns.
+
+		*shards* (:class:`int` or :data:`None`) is the number of databases to split
+		the regular expressions into. See :class:`.HyperscanPsBackend`.
 		"""
-		super().__init__(patterns, _debug_exprs=_debug_exprs, _test_sort=_test_sort)
+		super().__init__(
+			patterns,
+			shards=shards,
+			_debug_exprs=_debug_exprs,
+			_test_sort=_test_sort,
+		)
 
 		self._out = (None, -1, 0)
 		"""
@@ -108,35 +123,18 @@ class HyperscanGiBackend(HyperscanPsBackend):
 		exprs: list[bytes] = []
 		for pattern_index, pattern in patterns:
 			assert pattern.include is not None, (pattern_index, pattern)
-			assert pattern.regex is not None, (pattern_index, pattern)
+			assert pattern.raw_regex is not None, (pattern_index, pattern)
 
 			# Encode regex.
 			assert isinstance(pattern, RegexPattern), pattern
-			regex = pattern.regex.pattern
+			regex = pattern.raw_regex
 
 			use_regexes: list[tuple[Union[str, bytes], bool]] = []
-			if isinstance(pattern, GitIgnoreSpecPattern):
+			if isinstance(pattern, _GitIgnoreBasePattern):
 				# GitIgnoreSpecPattern uses capture groups for its directory marker but
-				# Hyperscan does not support capture groups. Handle this scenario.
-				regex_str: str
-				if isinstance(regex, str):
-					regex_str = regex
-				else:
-					assert isinstance(regex, bytes), regex
-					regex_str = regex.decode(_BYTES_ENCODING)
-
-				if _DIR_MARK_CG in regex_str:
-					# Found directory marker.
-					if regex_str.endswith(_DIR_MARK_OPT):
-						# Regex has optional directory marker. Split regex into directory
-						# and file variants.
-						base_regex = regex_str[:-len(_DIR_MARK_OPT)]
-						use_regexes.append((f'{base_regex}/', True))
-						use_regexes.append((f'{base_regex}$', False))
-					else:
-						# Remove capture group.
-						base_regex = regex_str.replace(_DIR_MARK_CG, '/')
-						use_regexes.append((base_regex, True))
+				# Hyperscan does not support capture groups. Lower the pattern into its
+				# directory and file variants instead.
+				use_regexes.extend(pattern._get_regex_variants('hyperscan'))
 
 			if not use_regexes:
 				# No special case for regex.
@@ -181,11 +179,12 @@ class HyperscanGiBackend(HyperscanPsBackend):
 		return expr_data
 
 	@override
-	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
+	def match_bytes_file(self, file: bytes) -> tuple[Optional[bool], Optional[int]]:
 		"""
-		Check the file against the patterns.
+		Check the :class:`bytes` file against the patterns. The file is scanned
+		directly without decoding it.
 
-		*file* (:class:`str`) is the normalized file path to check.
+		*file* (:class:`bytes`) is the normalized file path to check.
 
 		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
 		or :data:`None`), and the index of the last matched pattern (:class:`int` or
@@ -193,14 +192,17 @@ class HyperscanGiBackend(HyperscanPsBackend):
 		"""
 		# NOTICE: According to benchmarking, a method callback is 13% faster than
 		# using a closure here.
-		db = self._db
-		if db is None:
+		dbs = self._dbs
+		if not dbs:
 			# Database was not initialized because there were no patterns. Return no
 			# match.
 			return (None, None)
 
+		# The matches of every shard are folded together the same as the matches of
+		# a single database.
 		self._out = (None, -1, 0)
-		db.scan(file.encode('utf8'), match_event_handler=self.__on_match)
+		for _max_index, db, expr_data in dbs:
+			db.scan(file, match_event_handler=self.__on_match, context=expr_data)
 
 		out_index: Optional[int]
 		out_include, out_index = self._out[:2]
@@ -209,6 +211,32 @@ class HyperscanGiBackend(HyperscanPsBackend):
 
 		return (out_include, out_index)
 
+	@override
+	def match_bytes_file_all(
+		self,
+		file: bytes,
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the :class:`bytes` file against every pattern. Hyperscan reports every
+		matched expression, so the matches are collected from the same scans.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		self._matches = 0
+		self._out = (None, -1, 0)
+		for _max_index, db, expr_data in self._dbs:
+			db.scan(file, match_event_handler=self.__on_match_all, context=expr_data)
+
+		out_include, out_index = self._out[:2]
+		if out_index == -1:
+			return (None, None, self._matches)
+
+		return (out_include, out_index, self._matches)
+
 	@override
 	def __on_match(
 		self,
@@ -216,15 +244,18 @@ class HyperscanGiBackend(HyperscanPsBackend):
 		_from: int,
 		_to: int,
 		_flags: int,
-		_context: Any,
+		expr_data: Any,
 	) -> Optional[bool]:
 		"""
 		Called on each match.
 
 		*expr_id* (:class:`int`) is the expression id (index) of the matched
 		pattern.
+
+		*expr_data* (:class:`list` of :class:`HyperscanExprDat`) is the expression
+		data of the scanned shard, passed as the scan context.
 		"""
-		expr_dat = self._expr_data[expr_id]
+		expr_dat = expr_data[expr_id]
 
 		is_dir_pattern = expr_dat.is_dir_pattern
 		if is_dir_pattern:
@@ -235,16 +266,36 @@ class HyperscanGiBackend(HyperscanPsBackend):
 			priority = 2
 
 		# WARNING: Hyperscan does not guarantee matches will be produced in order!
-		include = expr_dat.include
+		# The fold does not depend on the order, so the matches of every shard are
+		# folded together.
+		# - NOTICE: This is `fold_gitignore_match()` inlined to avoid the function
+		#   call.
 		index = expr_dat.index
-		prev_index = self._out[1]
 		prev_priority = self._out[2]
-		if (
-			(include and is_dir_pattern and index > prev_index)
-			or (priority == prev_priority and index > prev_index)
-			or priority > prev_priority
+		if priority > prev_priority or (
+			priority == prev_priority and index > self._out[1]
 		):
-			out_tup = (include, expr_dat.index, priority)
+			out_tup = (expr_dat.include, index, priority)
 			self._out = out_tup  # type: ignore
 
 		return None
+
+	def __on_match_all(
+		self,
+		expr_id: int,
+		from_: int,
+		to: int,
+		flags: int,
+		expr_data: Any,
+	) -> Optional[bool]:
+		"""
+		Called on each match while collecting every match.
+
+		*expr_id* (:class:`int`) is the expression id (index) of the matched
+		pattern.
+
+		*expr_data* (:class:`list` of :class:`HyperscanExprDat`) is the expression
+		data of the scanned shard, passed as the scan context.
+		"""
+		self._matches |= 1 << expr_data[expr_id].index
+		return self.__on_match(expr_id, from_, to, flags, expr_data)
@@ -6,12 +6,16 @@ API. Its contents and structure are likely to change.
 """
 from __future__ import annotations
 
+import os
 from collections.abc import (
 	Sequence)
+from concurrent.futures import (
+	ThreadPoolExecutor)
 from typing import (
 	Any,
 	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
-	Optional)  # Replaced by `X | None` in 3.10.
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
 
 try:
 	import hyperscan
@@ -19,21 +23,35 @@ except ModuleNotFoundError:
 	hyperscan = None  # type: ignore[assignment]
 
 from pathspec.backend import (
-	_Backend)
+	_Backend,
+	_MatchBytesFileHint)
 from pathspec.pattern import (
 	RegexPattern)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 
 from .._utils import (
-	enumerate_patterns)
+	enumerate_patterns,
+	match_pattern_bits,
+	minimize_patterns)
 
 from .base import (
 	hyperscan_error)
 from ._base import (
 	HS_FLAGS,
+	HS_LITERAL_FLAGS,
+	LITERAL_SENTINEL,
 	HyperscanExprDat,
-	HyperscanExprDebug)
+	HyperscanExprDebug,
+	HyperscanLiteralDat)
+
+SHARD_PATTERN_COUNT = 2500
+"""
+The minimum number of patterns compiled into each shard (database) when the
+shard count is chosen automatically.
+"""
 
 
 class HyperscanPsBackend(_Backend):
@@ -43,10 +61,23 @@ class HyperscanPsBackend(_Backend):
 	files. The Hyperscan database uses block mode for matching files.
 	"""
 
+	_literals: bool = True
+	"""
+	*_literals* (:class:`bool`) is whether to compile the literal-equivalent
+	gitignore patterns into a separate literal database.
+	"""
+
+	_minimize: bool = True
+	"""
+	*_minimize* (:class:`bool`) is whether to remove the patterns which cannot
+	affect the result of a match (see :func:`minimize_patterns`).
+	"""
+
 	def __init__(
 		self,
 		patterns: Sequence[RegexPattern],
 		*,
+		shards: Optional[int] = None,
 		_debug_exprs: Optional[bool] = None,
 		_test_sort: Optional[Callable[[list], None]] = None,
 	) -> None:
@@ -55,6 +86,11 @@ class HyperscanPsBackend(_Backend):
 
 		*patterns* (:class:`Sequence` of :class:`.RegexPattern`) contains the
 		compiled patterns.
+
+		*shards* (:class:`int` or :data:`None`) is the number of databases to split
+		the regular expressions into. The databases are compiled concurrently.
+		Default is :data:`None` to use one database per :data:`SHARD_PATTERN_COUNT`
+		patterns, up to the number of CPUs.
 		"""
 		if hyperscan is None:
 			assert hyperscan_error is not None, (hyperscan, hyperscan_error)
@@ -63,28 +99,49 @@ class HyperscanPsBackend(_Backend):
 		if patterns and not isinstance(patterns[0], RegexPattern):
 			raise TypeError(f"{patterns[0]=!r} must be a RegexPattern.")
 
-		use_patterns = enumerate_patterns(
-			patterns, filter=True, reverse=False,
-		)
+		use_patterns = enumerate_patterns(patterns, filter=True, reverse=False)
+		removed_patterns: list[tuple[int, RegexPattern]] = []
+		if self._minimize:
+			use_patterns, removed_patterns = minimize_patterns(use_patterns)
+
+		regex_patterns = use_patterns
+		literals: list[tuple[int, RegexPattern, bytes, bool, bool]] = []
+		if self._literals:
+			regex_patterns, literals = self._split_literals(use_patterns)
 
 		debug_exprs = bool(_debug_exprs)
-		if use_patterns:
-			db = self._make_db()
-			expr_data = self._init_db(
-				db=db,
+		dbs: list[tuple[int, hyperscan.Database, list[HyperscanExprDat]]] = []  # type: ignore
+		expr_data: list[HyperscanExprDat] = []
+		if regex_patterns:
+			# WARNING: The hyperscan database cannot be initialized with zero
+			# patterns.
+			dbs = self._init_shards(
 				debug=debug_exprs,
-				patterns=use_patterns,
+				patterns=regex_patterns,
+				shards=shards,
+				sort_ids=_test_sort,
+			)
+			for _max_index, _db, shard_data in dbs:
+				expr_data.extend(shard_data)
+
+		if literals:
+			lit_db = self._make_db()
+			lit_data = self._init_literal_db(
+				db=lit_db,
+				literals=literals,
 				sort_ids=_test_sort,
 			)
 		else:
-			# WARNING: The hyperscan database cannot be initialized with zero
-			# patterns.
-			db = None
-			expr_data = []
+			lit_db = None
+			lit_data = []
 
-		self._db: Optional[hyperscan.Database] = db  # type: ignore
+		self._dbs: list[tuple[int, hyperscan.Database, list[HyperscanExprDat]]] = dbs  # type: ignore
 		"""
-		*_db* (:class:`hyperscan.Database`) is the Hyperscan database.
+		*_dbs* (:class:`list` of :class:`tuple`) contains each Hyperscan database
+		(shard) in pattern order. Each shard contains the highest pattern index
+		compiled into it (:class:`int`), the database (:class:`hyperscan.Database`),
+		and a :class:`list` mapping expression id (:class:`int`) to expression data
+		(:class:`HyperscanExprDat`).
 		"""
 
 		self._debug_exprs = debug_exprs
@@ -95,8 +152,32 @@ class HyperscanPsBackend(_Backend):
 
 		self._expr_data: list[HyperscanExprDat] = expr_data
 		"""
-		*_expr_data* (:class:`list`) maps expression index (:class:`int`) to
-		expression data (:class:`:class:`HyperscanExprDat`).
+		*_expr_data* (:class:`list`) contains the expression data
+		(:class:`HyperscanExprDat`) of every shard.
+		"""
+
+		self._lit_data: list[HyperscanLiteralDat] = lit_data
+		"""
+		*_lit_data* (:class:`list`) maps literal index (:class:`int`) to literal
+		data (:class:`HyperscanLiteralDat`).
+		"""
+
+		self._lit_db: Optional[hyperscan.Database] = lit_db  # type: ignore
+		"""
+		*_lit_db* (:class:`hyperscan.Database` or :data:`None`) is the Hyperscan
+		literal database.
+		"""
+
+		self._lit_len: int = 0
+		"""
+		*_lit_len* (:class:`int`) is the length of the path currently scanned by the
+		literal database.
+		"""
+
+		self._matches: int = 0
+		"""
+		*_matches* (:class:`int`) is the bitset of every pattern matched by the
+		current scan for :meth:`.match_bytes_file_all`.
 		"""
 
 		self._out: tuple[Optional[bool], int] = (None, -1)
@@ -114,6 +195,13 @@ class HyperscanPsBackend(_Backend):
 		(:class:`RegexPattern`).
 		"""
 
+		self._removed_patterns: list[tuple[int, RegexPattern]] = removed_patterns
+		"""
+		*_removed_patterns* (:class:`list` of :class:`tuple`) contains the removed
+		enumerated patterns. They are only checked for every match (see
+		:meth:`.match_bytes_file_all`).
+		"""
+
 	@staticmethod
 	def _init_db(
 		db: hyperscan.Database,  # type: ignore
@@ -148,11 +236,16 @@ class HyperscanPsBackend(_Backend):
 		exprs: list[bytes] = []
 		for pattern_index, pattern in patterns:
 			assert pattern.include is not None, (pattern_index, pattern)
-			assert pattern.regex is not None, (pattern_index, pattern)
+			assert pattern.raw_regex is not None, (pattern_index, pattern)
 
 			# Encode regex.
 			assert isinstance(pattern, RegexPattern), pattern
-			regex = pattern.regex.pattern
+			regex: Union[str, bytes, None] = pattern.raw_regex
+
+			if isinstance(pattern, _GitIgnoreBasePattern):
+				# Lower the gitignore pattern into a regular expression optimized for
+				# the engine.
+				regex = pattern._get_match_regex('hyperscan')
 
 			if isinstance(regex, bytes):
 				regex_bytes = regex
@@ -192,12 +285,153 @@ class HyperscanPsBackend(_Backend):
 
 		return expr_data
 
+	@classmethod
+	def _init_shards(
+		cls,
+		debug: bool,
+		patterns: list[tuple[int, RegexPattern]],
+		shards: Optional[int],
+		sort_ids: Optional[Callable[[list[int]], None]],
+	) -> list[tuple[int, hyperscan.Database, list[HyperscanExprDat]]]:  # type: ignore
+		"""
+		Initialize the Hyperscan databases (shards) from the given patterns. Each
+		shard contains a contiguous range of the patterns.
+
+		*debug* (:class:`bool`) is whether to include additional debugging
+		information for the expressions.
+
+		*patterns* (:class:`list` of :class:`tuple`) contains the enumerated
+		patterns.
+
+		*shards* (:class:`int` or :data:`None`) is the number of shards.
+
+		*sort_ids* (:class:`callable` or :data:`None`) is a function used to sort
+		the compiled expression ids.
+
+		Returns the shards (:class:`list` of :class:`tuple`). See
+		:attr:`._dbs <HyperscanPsBackend._dbs>`.
+		"""
+		assert patterns, patterns
+
+		if shards is None:
+			shards = min(os.cpu_count() or 1, len(patterns) // SHARD_PATTERN_COUNT)
+
+		shard_size = -(-len(patterns) // max(shards, 1))
+		shard_patterns = [
+			patterns[__start:__start + shard_size]
+			for __start in range(0, len(patterns), shard_size)
+		]
+
+		def init_shard(
+			patterns: list[tuple[int, RegexPattern]],
+		) -> tuple[int, hyperscan.Database, list[HyperscanExprDat]]:  # type: ignore
+			db = cls._make_db()
+			expr_data = cls._init_db(
+				db=db,
+				debug=debug,
+				patterns=patterns,
+				sort_ids=sort_ids,
+			)
+			return (patterns[-1][0], db, expr_data)
+
+		if len(shard_patterns) == 1:
+			return [init_shard(shard_patterns[0])]
+
+		# Hyperscan releases the GIL while compiling a database so the shards are
+		# compiled concurrently.
+		with ThreadPoolExecutor(max_workers=len(shard_patterns)) as executor:
+			return list(executor.map(init_shard, shard_patterns))
+
+	@staticmethod
+	def _init_literal_db(
+		db: hyperscan.Database,  # type: ignore
+		literals: list[tuple[int, RegexPattern, bytes, bool, bool]],
+		sort_ids: Optional[Callable[[list[int]], None]],
+	) -> list[HyperscanLiteralDat]:
+		"""
+		Initialize the Hyperscan literal database from the given literals.
+
+		*db* (:class:`hyperscan.Hyperscan`) is the Hyperscan database.
+
+		*literals* (:class:`list` of :class:`tuple`) contains the literals (see
+		:meth:`._split_literals`).
+
+		*sort_ids* (:class:`callable` or :data:`None`) is a function used to sort
+		the compiled literal ids. This is used during testing to ensure the order of
+		literals is not accidentally relied on.
+
+		Returns a :class:`list` indexed by literal id (:class:`int`) to its data
+		(:class:`HyperscanLiteralDat`).
+		"""
+		# WARNING: Hyperscan raises a `hyperscan.error` exception when compiled with
+		# zero elements.
+		assert literals, literals
+
+		lit_data: list[HyperscanLiteralDat] = []
+		exprs: list[bytes] = []
+		for pattern_index, pattern, literal, root, dir_only in literals:
+			assert pattern.include is not None, (pattern_index, pattern)
+			lit_data.append(HyperscanLiteralDat(
+				include=pattern.include,
+				index=pattern_index,
+				is_dir_pattern=False,
+				dir_only=dir_only,
+				end=len(literal) if root else -1,
+			))
+			exprs.append(literal)
+
+		# Sort literals.
+		ids = list(range(len(exprs)))
+		if sort_ids is not None:
+			sort_ids(ids)
+			exprs = [exprs[__id] for __id in ids]
+
+		# Compile literals.
+		db.compile(
+			expressions=exprs,
+			ids=ids,
+			elements=len(exprs),
+			flags=HS_LITERAL_FLAGS,
+			literal=True,
+		)
+
+		return lit_data
+
 	@override
-	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
+	def get_removed_indices(self) -> list[int]:
 		"""
-		Check the file against the patterns.
+		Get the patterns removed because they cannot affect the result of a match
+		(see :func:`minimize_patterns`).
 
-		*file* (:class:`str`) is the normalized file path to check.
+		Returns the indices of the removed patterns (:class:`list` of :class:`int`)
+		in order.
+		"""
+		return [__index for __index, _ in self._removed_patterns]
+
+	@override
+	def make_bytes_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchBytesFileHint:
+		"""
+		Create the function used to check a batch of :class:`bytes` files against
+		the patterns. The files are scanned directly.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory).
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		return self.match_bytes_file
+
+	@override
+	def match_bytes_file(self, file: bytes) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the :class:`bytes` file against the patterns. The file is scanned
+		directly without decoding it.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
 
 		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
 		or :data:`None`), and the index of the last matched pattern (:class:`int` or
@@ -205,14 +439,20 @@ class HyperscanPsBackend(_Backend):
 		"""
 		# NOTICE: According to benchmarking, a method callback is 20% faster than
 		# using a closure here.
-		db = self._db
-		if db is None:
-			# Database was not initialized because there were no patterns. Return no
-			# match.
-			return (None, None)
-
 		self._out = (None, -1)
-		db.scan(file.encode('utf8'), match_event_handler=self.__on_match)
+
+		lit_db = self._lit_db
+		if lit_db is not None:
+			lit_file = LITERAL_SENTINEL + file + LITERAL_SENTINEL
+			self._lit_len = len(lit_file)
+			lit_db.scan(lit_file, match_event_handler=self.__on_literal)
+
+		for max_index, db, expr_data in reversed(self._dbs):
+			if self._out[1] > max_index:
+				# The earlier shards only contain earlier patterns than the match.
+				break
+
+			db.scan(file, match_event_handler=self.__on_match, context=expr_data)
 
 		out_index: Optional[int]
 		out_include, out_index = self._out
@@ -221,6 +461,69 @@ class HyperscanPsBackend(_Backend):
 
 		return (out_include, out_index)
 
+	@override
+	def match_bytes_file_all(
+		self,
+		file: bytes,
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the :class:`bytes` file against every pattern. Hyperscan reports every
+		matched expression, so the matches are collected from the same scans.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		self._matches = 0
+
+		lit_db = self._lit_db
+		if lit_db is not None:
+			lit_file = LITERAL_SENTINEL + file + LITERAL_SENTINEL
+			self._lit_len = len(lit_file)
+			lit_db.scan(lit_file, match_event_handler=self.__on_literal_all)
+
+		# Every shard must be scanned to find every match.
+		for _max_index, db, expr_data in self._dbs:
+			db.scan(file, match_event_handler=self.__on_match_all, context=expr_data)
+
+		matches = self._matches
+		if not matches:
+			return (None, None, match_pattern_bits(self._removed_patterns, file))
+
+		# A removed pattern is never the last match because a later pattern matches
+		# every path it matches.
+		index = matches.bit_length() - 1
+		matches |= match_pattern_bits(self._removed_patterns, file)
+		return (self._patterns[index].include, index, matches)
+
+	@override
+	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the file against the patterns.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), and the index of the last matched pattern (:class:`int` or
+		:data:`None`).
+		"""
+		return self.match_bytes_file(file.encode('utf8'))
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		return self.match_bytes_file_all(file.encode('utf8'))
+
 	@staticmethod
 	def _make_db() -> hyperscan.Database:  # type: ignore
 		"""
@@ -231,27 +534,155 @@ class HyperscanPsBackend(_Backend):
 		assert hyperscan is not None, (hyperscan, hyperscan_error)
 		return hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
 
+	@staticmethod
+	def _split_literals(
+		patterns: list[tuple[int, RegexPattern]],
+	) -> tuple[
+		list[tuple[int, RegexPattern]],
+		list[tuple[int, RegexPattern, bytes, bool, bool]],
+	]:
+		"""
+		Split the literal-equivalent gitignore patterns from the patterns which need
+		a regular expression.
+
+		*patterns* (:class:`list` of :class:`tuple`) contains the enumerated
+		patterns.
+
+		Returns a :class:`tuple` containing the patterns which need a regular
+		expression (:class:`list` of :class:`tuple`), and the literals
+		(:class:`list` of :class:`tuple`). Each literal contains the pattern index
+		(:class:`int`), the pattern (:class:`.RegexPattern`), the literal to scan
+		for (:class:`bytes`), whether the literal must begin at the start of the
+		path (:class:`bool`), and whether the pattern can only match a file by one
+		of its parent directories (:class:`bool`).
+		"""
+		regex_patterns: list[tuple[int, RegexPattern]] = []
+		literals: list[tuple[int, RegexPattern, bytes, bool, bool]] = []
+		for pattern_index, pattern in patterns:
+			ir = None
+			lit_tup = None
+			if isinstance(pattern, _GitIgnoreBasePattern) and (ir := pattern._get_ir()) is not None:
+				lit_tup = ir.to_literal()
+
+			if ir is None or lit_tup is None:
+				regex_patterns.append((pattern_index, pattern))
+				continue
+
+			# The path is scanned with a leading and trailing sentinel slash. A literal
+			# beginning a path segment starts with a slash, and a literal matching a
+			# path ends with a slash.
+			literal, start = lit_tup
+			lit_parts = []
+			if start != 'any':
+				lit_parts.append(LITERAL_SENTINEL)
+
+			lit_parts.append(literal.encode('utf8'))
+			dir_only = ir.is_dir_only
+			if not dir_only:
+				lit_parts.append(LITERAL_SENTINEL)
+
+			literals.append((
+				pattern_index, pattern, b''.join(lit_parts), start == 'root', dir_only,
+			))
+
+		return (regex_patterns, literals)
+
+	def __on_literal(
+		self,
+		lit_id: int,
+		_from: int,
+		to: int,
+		_flags: int,
+		_context: Any,
+	) -> Optional[bool]:
+		"""
+		Called on each occurrence of a literal.
+
+		*lit_id* (:class:`int`) is the literal id (index) of the matched literal.
+
+		*to* (:class:`int`) is the end offset of the occurrence.
+		"""
+		lit_dat = self._lit_data[lit_id]
+		index = lit_dat.index
+		if (
+			index > self._out[1]
+			and (lit_dat.end == -1 or lit_dat.end == to)
+			and (not lit_dat.dir_only or to < self._lit_len)
+		):
+			# The occurrence is at the required position, and its trailing slash is not
+			# the trailing sentinel.
+			self._out = (lit_dat.include, index)
+
+		return None
+
+	def __on_literal_all(
+		self,
+		lit_id: int,
+		_from: int,
+		to: int,
+		_flags: int,
+		_context: Any,
+	) -> Optional[bool]:
+		"""
+		Called on each occurrence of a literal while collecting every match.
+
+		*lit_id* (:class:`int`) is the literal id (index) of the matched literal.
+
+		*to* (:class:`int`) is the end offset of the occurrence.
+		"""
+		lit_dat = self._lit_data[lit_id]
+		if (
+			(lit_dat.end == -1 or lit_dat.end == to)
+			and (not lit_dat.dir_only or to < self._lit_len)
+		):
+			self._matches |= 1 << lit_dat.index
+
+		return None
+
 	def __on_match(
 		self,
 		expr_id: int,
 		_from: int,
 		_to: int,
 		_flags: int,
-		_context: Any,
+		expr_data: Any,
 	) -> Optional[bool]:
 		"""
 		Called on each match.
 
 		*expr_id* (:class:`int`) is the expression id (index) of the matched
 		pattern.
+
+		*expr_data* (:class:`list` of :class:`HyperscanExprDat`) is the expression
+		data of the scanned shard, passed as the scan context.
 		"""
 		# Store match.
 		# - WARNING: Hyperscan does not guarantee matches will be produced in order!
 		#   Later expressions have higher priority.
-		expr_dat = self._expr_data[expr_id]
+		expr_dat = expr_data[expr_id]
 		index = expr_dat.index
 		prev_index = self._out[1]
 		if index > prev_index:
 			self._out = (expr_dat.include, index)
 
 		return None
+
+	def __on_match_all(
+		self,
+		expr_id: int,
+		_from: int,
+		_to: int,
+		_flags: int,
+		expr_data: Any,
+	) -> Optional[bool]:
+		"""
+		Called on each match while collecting every match.
+
+		*expr_id* (:class:`int`) is the expression id (index) of the matched
+		pattern.
+
+		*expr_data* (:class:`list` of :class:`HyperscanExprDat`) is the expression
+		data of the scanned shard, passed as the scan context.
+		"""
+		self._matches |= 1 << expr_data[expr_id].index
+		return None
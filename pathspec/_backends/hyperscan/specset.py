@@ -0,0 +1,176 @@
+"""
+This module provides the :module:`hyperscan` backend for :class:`~pathspec.specset.PathSpecSet`.
+
+WARNING: The *pathspec._backends.hyperscan* package is not part of the public
+API. Its contents and structure are likely to change.
+"""
+from __future__ import annotations
+
+from collections.abc import (
+	Sequence)
+from typing import (
+	Any,
+	Optional)  # Replaced by `X | None` in 3.10.
+
+try:
+	import hyperscan
+except ModuleNotFoundError:
+	hyperscan = None  # type: ignore[assignment]
+
+from pathspec.backend import (
+	_SetBackend)
+from pathspec.pattern import (
+	Pattern,
+	RegexPattern)
+from pathspec._typing import (
+	override)  # Added in 3.12.
+
+from .._utils import (
+	enumerate_patterns,
+	fold_gitignore_match,
+	lower_set_regexes,
+	minimize_patterns)
+
+from .base import (
+	hyperscan_error)
+from ._base import (
+	HS_FLAGS,
+	HyperscanSetExprDat)
+
+
+class HyperscanSetBackend(_SetBackend):
+	"""
+	The :class:`HyperscanSetBackend` class is the :module:`hyperscan`
+	implementation used by :class:`~pathspec.specset.PathSpecSet` for matching
+	files. The patterns of every path-spec are compiled into a single Hyperscan
+	database which uses block mode for matching files.
+	"""
+
+	def __init__(self, specs: Sequence[tuple[Sequence[Pattern], bool]]) -> None:
+		"""
+		Initialize the :class:`HyperscanSetBackend` instance.
+
+		*specs* (:class:`Sequence` of :class:`tuple`) contains the compiled
+		patterns of each path-spec (:class:`Sequence` of :class:`.RegexPattern`),
+		and whether the path-spec is a :class:`~pathspec.gitignore.GitIgnoreSpec`
+		(:class:`bool`).
+		"""
+		if hyperscan is None:
+			assert hyperscan_error is not None, (hyperscan, hyperscan_error)
+			raise hyperscan_error
+
+		expr_data: list[HyperscanSetExprDat] = []
+		exprs: list[bytes] = []
+		for spec_index, (patterns, gitignore) in enumerate(specs):
+			if patterns and not isinstance(patterns[0], RegexPattern):
+				raise TypeError(f"{patterns[0]=!r} must be a RegexPattern.")
+
+			use_patterns = enumerate_patterns(patterns, filter=True, reverse=False)
+			if not gitignore:
+				# See `HyperscanGiBackend._minimize`.
+				use_patterns, _removed = minimize_patterns(use_patterns)
+
+			for pattern_index, pattern in use_patterns:
+				assert isinstance(pattern, RegexPattern), pattern
+				assert pattern.include is not None, pattern
+				for regex, is_dir_pattern in lower_set_regexes(pattern, gitignore, 'hyperscan'):
+					if isinstance(regex, bytes):
+						regex_bytes = regex
+					else:
+						assert isinstance(regex, str), regex
+						regex_bytes = regex.encode('utf8')
+
+					expr_data.append(HyperscanSetExprDat(
+						include=pattern.include,
+						index=pattern_index,
+						is_dir_pattern=is_dir_pattern,
+						spec_index=spec_index,
+					))
+					exprs.append(regex_bytes)
+
+		db: Optional[hyperscan.Database]  # type: ignore
+		if exprs:
+			new_db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+			new_db.compile(
+				expressions=exprs,
+				ids=list(range(len(exprs))),
+				elements=len(exprs),
+				flags=HS_FLAGS,
+			)
+			db = new_db
+		else:
+			# WARNING: The hyperscan database cannot be initialized with zero
+			# patterns.
+			db = None
+
+		self._db: Optional[hyperscan.Database] = db  # type: ignore
+		"""
+		*_db* (:class:`hyperscan.Database`) is the Hyperscan database.
+		"""
+
+		self._expr_data: list[HyperscanSetExprDat] = expr_data
+		"""
+		*_expr_data* (:class:`list`) maps expression index (:class:`int`) to
+		expression data (:class:`HyperscanSetExprDat`).
+		"""
+
+		self._outs: dict[int, tuple[Optional[bool], int, int]] = {}
+		"""
+		*_outs* (:class:`dict`) maps path-spec index (:class:`int`) to its current
+		match (:class:`tuple`). See :func:`fold_gitignore_match`.
+		"""
+
+	@override
+	def match_file(self, file: str) -> dict[int, tuple[bool, int]]:
+		"""
+		Check the file against the patterns of each path-spec.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`dict` mapping the index of each path-spec with a matched
+		pattern (:class:`int`) to a :class:`tuple` containing whether to include
+		*file* (:class:`bool`), and the index of the last matched pattern
+		(:class:`int`).
+		"""
+		db = self._db
+		if db is None:
+			# Database was not initialized because there were no patterns. Return no
+			# match.
+			return {}
+
+		outs = self._outs = {}
+		db.scan(file.encode('utf8'), match_event_handler=self.__on_match)
+
+		return {
+			__spec_index: (__out[0], __out[1])  # type: ignore[misc]
+			for __spec_index, __out in outs.items()
+		}
+
+	def __on_match(
+		self,
+		expr_id: int,
+		_from: int,
+		_to: int,
+		_flags: int,
+		_context: Any,
+	) -> Optional[bool]:
+		"""
+		Called on each match.
+
+		*expr_id* (:class:`int`) is the expression id (index) of the matched
+		pattern.
+		"""
+		# Fold the match into the match of its path-spec. The expressions for a
+		# `PathSpec` never match by a directory pattern, so its last match takes
+		# precedence.
+		# - WARNING: Hyperscan does not guarantee matches will be produced in order!
+		expr_dat = self._expr_data[expr_id]
+		spec_index = expr_dat.spec_index
+		outs = self._outs
+		outs[spec_index] = fold_gitignore_match(
+			outs.get(spec_index, (None, -1, 0)),
+			expr_dat.include,
+			expr_dat.index,
+			expr_dat.is_dir_pattern,
+		)
+		return None
@@ -0,0 +1,326 @@
+"""
+This module provides the layered backend used by a combined
+:class:`~pathspec.pathspec.PathSpec` to reuse the backends of its parts.
+
+WARNING: The *pathspec._backends* package is not part of the public API. Its
+contents and structure are likely to change.
+"""
+
+from collections.abc import (
+	Sequence)
+from typing import (
+	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
+	Optional)  # Replaced by `X | None` in 3.10.
+
+from pathspec.backend import (
+	_Backend,
+	_MatchBytesFileHint,
+	_MatchFileHint)
+from pathspec._typing import (
+	override)  # Added in 3.12.
+
+MERGE_LAYER_COUNT = 8
+"""
+The maximum number of layers checked separately. A layered backend with more
+layers is merged into a single backend on its first use.
+"""
+
+
+class LayeredPsBackend(_Backend):
+	"""
+	The :class:`LayeredPsBackend` class is the implementation used by a combined
+	:class:`~pathspec.pathspec.PathSpec` for matching files. Each layer is the
+	backend of a part of the combined patterns, and the layers are checked in
+	reverse order. The last matched pattern of the combined patterns is the last
+	matched pattern of the last layer with a match.
+	"""
+
+	def __init__(
+		self,
+		layers: Sequence[tuple[int, _Backend]],
+		merge: Callable[[], _Backend],
+	) -> None:
+		"""
+		Initialize the :class:`LayeredPsBackend` instance.
+
+		*layers* (:class:`Sequence` of :class:`tuple`) contains the index offset of
+		the first pattern of each layer (:class:`int`), and the backend of the layer
+		(:class:`._Backend`) in order.
+
+		*merge* (:class:`~collections.abc.Callable`) is used to create the backend
+		for all of the combined patterns when there are too many layers (see
+		:data:`MERGE_LAYER_COUNT`).
+		"""
+
+		self._layers: list[tuple[int, _Backend]] = list(layers)
+		"""
+		*_layers* (:class:`list` of :class:`tuple`) contains the index offset and
+		backend of each layer.
+		"""
+
+		self._merge: Optional[Callable[[], _Backend]] = (
+			merge if len(self._layers) > MERGE_LAYER_COUNT else None
+		)
+		"""
+		*_merge* (:class:`~collections.abc.Callable` or :data:`None`) is used to
+		merge the layers on first use. This is :data:`None` when the layers do not
+		need to be merged.
+		"""
+
+	@classmethod
+	def combine(
+		cls,
+		first: tuple[_Backend, int],
+		second: tuple[_Backend, int],
+		merge: Callable[[], _Backend],
+	) -> 'LayeredPsBackend':
+		"""
+		Combine the backends of two pattern sequences without recompiling them. The
+		layers of a layered backend are reused directly.
+
+		*first* (:class:`tuple`) contains the backend for the first patterns
+		(:class:`._Backend`), and the number of the first patterns (:class:`int`).
+
+		*second* (:class:`tuple`) contains the backend for the second patterns
+		(:class:`._Backend`), and the number of the second patterns (:class:`int`).
+
+		*merge* (:class:`~collections.abc.Callable`) is used to create the backend
+		for all of the combined patterns.
+
+		Returns the layered backend (:class:`LayeredPsBackend`).
+		"""
+		first_backend, first_count = first
+		second_backend, second_count = second
+		layers: list[tuple[int, _Backend]] = []
+		for offset, backend, count in [
+			(0, first_backend, first_count),
+			(first_count, second_backend, second_count),
+		]:
+			if not count:
+				# Skip the backend without patterns.
+				continue
+			elif isinstance(backend, LayeredPsBackend):
+				layers.extend(
+					(offset + __offset, __backend)
+					for __offset, __backend in backend._layers
+				)
+			else:
+				layers.append((offset, backend))
+
+		return cls(layers, merge)
+
+	@staticmethod
+	def __fold_all(
+		results: list[tuple[int, tuple[Optional[bool], Optional[int], int]]],
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Fold the results of every layer.
+
+		*results* (:class:`list` of :class:`tuple`) contains the index offset of
+		each layer (:class:`int`), and its result (:class:`tuple`) in order.
+
+		Returns the combined result (:class:`tuple`).
+		"""
+		out_include: Optional[bool] = None
+		out_index: Optional[int] = None
+		matches = 0
+		for offset, (include, index, layer_matches) in results:
+			matches |= layer_matches << offset
+			if include is not None:
+				# The last layer with a match contains the last matched pattern.
+				assert index is not None, (include, index)
+				out_include = include
+				out_index = offset + index
+
+		return (out_include, out_index, matches)
+
+	def __merge_layers(self) -> None:
+		"""
+		Merge the layers into a single backend.
+		"""
+		merge = self._merge
+		assert merge is not None, merge
+		self._layers = [(0, merge())]
+		self._merge = None
+
+	@override
+	def get_removed_indices(self) -> list[int]:
+		"""
+		Get the patterns removed by the backend of each layer.
+
+		Returns the indices of the removed patterns (:class:`list` of :class:`int`)
+		in order.
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		return [
+			__offset + __index
+			for __offset, __backend in self._layers
+			for __index in __backend.get_removed_indices()
+		]
+
+	@override
+	def make_batch_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchFileHint:
+		"""
+		Create the function used to check a batch of files against the patterns.
+		The batch matcher of each layer is used.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory).
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		if len(self._layers) == 1:
+			offset, backend = self._layers[0]
+			if not offset:
+				return backend.make_batch_matcher(presorted=presorted)
+
+		layers = [
+			(__offset, __backend.make_batch_matcher(presorted=presorted))
+			for __offset, __backend in reversed(self._layers)
+		]
+
+		def match_file(file: str) -> tuple[Optional[bool], Optional[int]]:
+			for offset, layer_match_file in layers:
+				include, index = layer_match_file(file)
+				if include is not None:
+					assert index is not None, (include, index)
+					return (include, offset + index)
+
+			return (None, None)
+
+		return match_file
+
+	@override
+	def make_bytes_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchBytesFileHint:
+		"""
+		Create the function used to check a batch of :class:`bytes` files against
+		the patterns. The bytes matcher of each layer is used.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory).
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		if len(self._layers) == 1:
+			offset, backend = self._layers[0]
+			if not offset:
+				return backend.make_bytes_matcher(presorted=presorted)
+
+		layers = [
+			(__offset, __backend.make_bytes_matcher(presorted=presorted))
+			for __offset, __backend in reversed(self._layers)
+		]
+
+		def match_bytes_file(file: bytes) -> tuple[Optional[bool], Optional[int]]:
+			for offset, layer_match_file in layers:
+				include, index = layer_match_file(file)
+				if include is not None:
+					assert index is not None, (include, index)
+					return (include, offset + index)
+
+			return (None, None)
+
+		return match_bytes_file
+
+	@override
+	def match_bytes_file(self, file: bytes) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the :class:`bytes` file against the patterns of each layer.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), and the index of the last matched pattern (:class:`int` or
+		:data:`None`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		for offset, backend in reversed(self._layers):
+			include, index = backend.match_bytes_file(file)
+			if include is not None:
+				assert index is not None, (include, index)
+				return (include, offset + index)
+
+		return (None, None)
+
+	@override
+	def match_bytes_file_all(
+		self,
+		file: bytes,
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the :class:`bytes` file against every pattern of each layer.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		return self.__fold_all([
+			(__offset, __backend.match_bytes_file_all(file))
+			for __offset, __backend in self._layers
+		])
+
+	@override
+	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the file against the patterns.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), and the index of the last matched pattern (:class:`int` or
+		:data:`None`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		# Check the later layers first. The first layer with a match contains the
+		# last matched pattern.
+		for offset, backend in reversed(self._layers):
+			include, index = backend.match_file(file)
+			if include is not None:
+				assert index is not None, (include, index)
+				return (include, offset + index)
+
+		return (None, None)
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern of each layer.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		if self._merge is not None:
+			self.__merge_layers()
+
+		return self.__fold_all([
+			(__offset, __backend.match_file_all(file))
+			for __offset, __backend in self._layers
+		])
@@ -93,3 +93,19 @@ class Re2RegexDebug(Re2RegexDat):
 	"""
 	*regex* (:class:`str` or :class:`bytes`) is the regular expression.
 	"""
+
+
+@dataclass(frozen=True)
+class Re2SetRegexDat(Re2RegexDat):
+	"""
+	The :class:`Re2SetRegexDat` class stores the path-spec of a regular
+	expression compiled for several path-specs.
+	"""
+
+	# The slots argument is not supported until Python 3.10.
+	__slots__ = ['spec_index']
+
+	spec_index: int
+	"""
+	*spec_index* (:class:`int`) is the index of the path-spec.
+	"""
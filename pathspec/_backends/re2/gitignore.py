@@ -18,14 +18,13 @@ except ModuleNotFoundError:
 
 from pathspec.pattern import (
 	RegexPattern)
-from pathspec.patterns.gitignore.spec import (
-	GitIgnoreSpecPattern,
-	_BYTES_ENCODING,
-	_DIR_MARK_CG,
-	_DIR_MARK_OPT)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 
+from .._utils import (
+	fold_gitignore_match)
 from ._base import (
 	Re2RegexDat,
 	Re2RegexDebug)
@@ -39,6 +38,11 @@ class Re2GiBackend(Re2PsBackend):
 	:class:`~pathspec.gitignore.GitIgnoreSpec` for matching files.
 	"""
 
+	# The priority of a match depends on the order the matches are produced in
+	# when an include pattern matches by a directory pattern. Removing a pattern
+	# can change which match is reported, so do not minimize the patterns.
+	_minimize = False
+
 	@override
 	@staticmethod
 	def _init_set(
@@ -48,7 +52,7 @@ class Re2GiBackend(Re2PsBackend):
 		sort_indices: Optional[Callable[[list[int]], None]],
 	) -> list[Re2RegexDat]:
 		"""
-		Create the re2 regex set.
+		Add the regular expressions of the given patterns to the re2 regex set.
 
 		*debug* (:class:`bool`) is whether to include additional debugging
 		information for the regular expressions.
@@ -77,40 +81,7 @@ class Re2GiBackend(Re2PsBackend):
 			if pattern.include is None:
 				continue
 
-			assert pattern.regex is not None, pattern
-			assert isinstance(pattern, RegexPattern), pattern
-			regex = pattern.regex.pattern
-
-			use_regexes: list[tuple[Union[str, bytes], bool]] = []
-			if isinstance(pattern, GitIgnoreSpecPattern):
-				# GitIgnoreSpecPattern uses capture groups for its directory marker. Re2
-				# supports capture groups, but they cannot be utilized when using
-				# `re2.Set`. Handle this scenario.
-				regex_str: str
-				if isinstance(regex, str):
-					regex_str = regex
-				else:
-					assert isinstance(regex, bytes), regex
-					regex_str = regex.decode(_BYTES_ENCODING)
-
-				if _DIR_MARK_CG in regex_str:
-					# Found directory marker.
-					if regex_str.endswith(_DIR_MARK_OPT):
-						# Regex has optional directory marker. Split regex into directory
-						# and file variants.
-						base_regex = regex_str[:-len(_DIR_MARK_OPT)]
-						use_regexes.append((f'{base_regex}/', True))
-						use_regexes.append((f'{base_regex}$', False))
-					else:
-						# Remove capture group.
-						base_regex = regex_str.replace(_DIR_MARK_CG, '/')
-						use_regexes.append((base_regex, True))
-
-			if not use_regexes:
-				# No special case for regex.
-				use_regexes.append((regex, False))
-
-			for regex, is_dir_pattern in use_regexes:
+			for regex, is_dir_pattern in Re2GiBackend._get_set_regexes(pattern):
 				if debug:
 					regex_data.append(Re2RegexDebug(
 						include=pattern.include,
@@ -127,10 +98,38 @@ class Re2GiBackend(Re2PsBackend):
 
 				regex_set.Add(regex)  # type: ignore[type-var]
 
-		# Compile patterns.
-		regex_set.Compile()
 		return regex_data
 
+	@override
+	@staticmethod
+	def _get_set_regexes(pattern: RegexPattern) -> list[tuple[Union[str, bytes], bool]]:
+		"""
+		Get the regular expressions of the pattern to add to a re2 regex set.
+
+		*pattern* (:class:`.RegexPattern`) is the pattern.
+
+		Returns a :class:`list` of :class:`tuple` containing each uncompiled regular
+		expression (:class:`str` or :class:`bytes`), and whether it is a directory
+		pattern (:class:`bool`).
+		"""
+		assert isinstance(pattern, RegexPattern), pattern
+		regex = pattern.raw_regex
+		assert regex is not None, pattern
+
+		use_regexes: list[tuple[Union[str, bytes], bool]] = []
+		if isinstance(pattern, _GitIgnoreBasePattern):
+			# GitIgnoreSpecPattern uses capture groups for its directory marker. Re2
+			# supports capture groups, but they cannot be utilized when using
+			# `re2.Set`. Lower the pattern into its directory and file variants
+			# instead.
+			use_regexes.extend(pattern._get_regex_variants('re2'))
+
+		if not use_regexes:
+			# No special case for regex.
+			use_regexes.append((regex, False))
+
+		return use_regexes
+
 	@override
 	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
 		"""
@@ -143,38 +142,73 @@ class Re2GiBackend(Re2PsBackend):
 		:data:`None`).
 		"""
 		# Find best match.
-		match_ids: Optional[list[int]] = self._set.Match(file)  # type: ignore[assignment]
-		if not match_ids:
-			return (None, None)
-
+		# - The matches of every set are folded together the same as the matches of
+		#   a single set. The fold does not depend on the order of the matches.
 		out_include: Optional[bool] = None
 		out_index: int = -1
 		out_priority = -1
 
-		regex_data = self._regex_data
-		for regex_id in match_ids:
-			regex_dat = regex_data[regex_id]
-
-			is_dir_pattern = regex_dat.is_dir_pattern
-			if is_dir_pattern:
-				# Pattern matched by a directory pattern.
-				priority = 1
-			else:
-				# Pattern matched by a file pattern.
-				priority = 2
-
-			# WARNING: According to the documentation on `RE2::Set::Match()`, there is
-			# no guarantee matches will be produced in order!
-			include = regex_dat.include
-			index = regex_dat.index
-			if (
-				(include and is_dir_pattern and index > out_index)
-				or (priority == out_priority and index > out_index)
-				or priority > out_priority
-			):
-				out_include = include
-				out_index = index
-				out_priority = priority
-
-		assert out_index != -1, (out_index, out_include, out_priority)
+		for regex_set, regex_data in self._sets:
+			match_ids: Optional[list[int]] = regex_set.Match(file)  # type: ignore[assignment]
+			if not match_ids:
+				continue
+
+			for regex_id in match_ids:
+				regex_dat = regex_data[regex_id]
+
+				is_dir_pattern = regex_dat.is_dir_pattern
+				if is_dir_pattern:
+					# Pattern matched by a directory pattern.
+					priority = 1
+				else:
+					# Pattern matched by a file pattern.
+					priority = 2
+
+				# WARNING: According to the documentation on `RE2::Set::Match()`, there
+				# is no guarantee matches will be produced in order!
+				# - NOTICE: This is `fold_gitignore_match()` inlined because the
+				#   function call is 25% slower.
+				index = regex_dat.index
+				if priority > out_priority or (
+					priority == out_priority and index > out_index
+				):
+					out_include = regex_dat.include
+					out_index = index
+					out_priority = priority
+
+		if out_index == -1:
+			return (None, None)
+
 		return (out_include, out_index)
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		matches = 0
+		out: tuple[Optional[bool], int, int] = (None, -1, 0)
+		for regex_set, regex_data in self._sets:
+			match_ids: Optional[list[int]] = regex_set.Match(file)  # type: ignore[assignment]
+			if not match_ids:
+				continue
+
+			for regex_id in match_ids:
+				regex_dat = regex_data[regex_id]
+				index = regex_dat.index
+				matches |= 1 << index
+				out = fold_gitignore_match(
+					out, regex_dat.include, index, regex_dat.is_dir_pattern,
+				)
+
+		out_include, out_index, _priority = out
+		if out_index == -1:
+			return (None, None, matches)
+
+		return (out_include, out_index, matches)
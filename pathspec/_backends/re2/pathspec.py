@@ -10,7 +10,8 @@ from collections.abc import (
 	Sequence)
 from typing import (
 	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
-	Optional)  # Replaced by `X | None` in 3.10.
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
 
 try:
 	import re2
@@ -18,14 +19,19 @@ except ModuleNotFoundError:
 	re2 = None  # type: ignore[assignment]
 
 from pathspec.backend import (
-	_Backend)
+	_Backend,
+	_MatchBytesFileHint)
 from pathspec.pattern import (
 	RegexPattern)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 
 from .._utils import (
-	enumerate_patterns)
+	enumerate_patterns,
+	match_pattern_bits,
+	minimize_patterns)
 
 from .base import (
 	re2_error)
@@ -34,6 +40,20 @@ from ._base import (
 	Re2RegexDat,
 	Re2RegexDebug)
 
+RE2_MAX_MEM = 8 << 20
+"""
+The default memory budget (in bytes) of each re2 regex set. This is the default
+budget of re2.
+"""
+
+SET_MEM_PER_REGEX_BYTE = 1024
+"""
+The estimated memory (in bytes) used by a re2 regex set for each byte of its
+regular expressions. re2 reserves a third of the memory budget for the compiled
+program, and the remainder for the DFA cache which must hold enough states for
+each instruction of the program. When the cache runs out of memory, the set
+fails to match instead of falling back to a slower engine.
+"""
 
 class Re2PsBackend(_Backend):
 	"""
@@ -41,10 +61,17 @@ class Re2PsBackend(_Backend):
 	:class:`~pathspec.pathspec.PathSpec` for matching files.
 	"""
 
+	_minimize: bool = True
+	"""
+	*_minimize* (:class:`bool`) is whether to remove the patterns which cannot
+	affect the result of a match (see :func:`minimize_patterns`).
+	"""
+
 	def __init__(
 		self,
 		patterns: Sequence[RegexPattern],
 		*,
+		max_mem: Optional[int] = None,
 		_debug_regex: Optional[bool] = None,
 		_test_sort: Optional[Callable[[list], None]] = None,
 	) -> None:
@@ -53,6 +80,11 @@ class Re2PsBackend(_Backend):
 
 		*patterns* (:class:`Sequence` of :class:`.RegexPattern`) contains the
 		compiled patterns.
+
+		*max_mem* (:class:`int` or :data:`None`) is the memory budget (in bytes) of
+		each re2 regex set. The patterns are partitioned into several sets when they
+		would exceed the budget of one set. Default is :data:`None` to use
+		:data:`RE2_MAX_MEM`.
 		"""
 		if re2_error is not None:
 			raise re2_error
@@ -60,10 +92,15 @@ class Re2PsBackend(_Backend):
 		if patterns and not isinstance(patterns[0], RegexPattern):
 			raise TypeError(f"{patterns[0]=!r} must be a RegexPattern.")
 
-		use_patterns = dict(enumerate_patterns(
-			patterns, filter=True, reverse=False,
-		))
-		regex_set = self._make_set()
+		enum_patterns = enumerate_patterns(patterns, filter=True, reverse=False)
+		removed_patterns: list[tuple[int, RegexPattern]] = []
+		if self._minimize:
+			enum_patterns, removed_patterns = minimize_patterns(enum_patterns)
+
+		if max_mem is None:
+			max_mem = RE2_MAX_MEM
+
+		use_patterns = dict(enum_patterns)
 
 		self._debug_regex = bool(_debug_regex)
 		"""
@@ -77,20 +114,43 @@ class Re2PsBackend(_Backend):
 		(:class:`RegexPattern`).
 		"""
 
-		self._regex_data: list[Re2RegexDat] = self._init_set(
-			debug=self._debug_regex,
-			patterns=use_patterns,
-			regex_set=regex_set,
-			sort_indices=_test_sort,
-		)
+		self._removed_patterns: list[tuple[int, RegexPattern]] = removed_patterns
 		"""
-		*_regex_data* (:class:`list`) maps regex index (:class:`int`) to regex data
-		(:class:`Re2RegexDat`).
+		*_removed_patterns* (:class:`list` of :class:`tuple`) contains the removed
+		enumerated patterns. They are only checked for every match (see
+		:meth:`.match_file_all`).
+		"""
+
+		sets: list[tuple[re2.Set, list[Re2RegexDat]]] = []  # type: ignore
+		regex_data: list[Re2RegexDat] = []
+		if use_patterns:
+			sets = self._init_sets(
+				debug=self._debug_regex,
+				max_mem=max_mem,
+				patterns=enum_patterns,
+				sort_indices=_test_sort,
+			)
+			for _set, set_data in sets:
+				regex_data.extend(set_data)
+
+		self._max_mem: int = max_mem
+		"""
+		*_max_mem* (:class:`int`) is the memory budget (in bytes) of each re2 regex
+		set.
 		"""
 
-		self._set: re2.Set = regex_set  # type: ignore
+		self._regex_data: list[Re2RegexDat] = regex_data
 		"""
-		*_set* (:class:`re2.Set`) is the re2 regex set.
+		*_regex_data* (:class:`list`) contains the regex data (:class:`Re2RegexDat`)
+		of every set.
+		"""
+
+		self._sets: list[tuple[re2.Set, list[Re2RegexDat]]] = sets  # type: ignore
+		"""
+		*_sets* (:class:`list` of :class:`tuple`) contains each re2 regex set
+		(partition) in pattern order. Each set contains the set (:class:`re2.Set`),
+		and a :class:`list` mapping regex id (:class:`int`) to regex data
+		(:class:`Re2RegexDat`).
 		"""
 
 	@staticmethod
@@ -101,7 +161,7 @@ class Re2PsBackend(_Backend):
 		sort_indices: Optional[Callable[[list[int]], None]],
 	) -> list[Re2RegexDat]:
 		"""
-		Create the re2 regex set.
+		Add the regular expressions of the given patterns to the re2 regex set.
 
 		*debug* (:class:`bool`) is whether to include additional debugging
 		information for the regular expressions.
@@ -130,10 +190,7 @@ class Re2PsBackend(_Backend):
 			if pattern.include is None:
 				continue
 
-			assert pattern.regex is not None, pattern
-			assert isinstance(pattern, RegexPattern), pattern
-			regex = pattern.regex.pattern
-
+			((regex, _is_dir_pattern),) = Re2PsBackend._get_set_regexes(pattern)
 			if debug:
 				regex_data.append(Re2RegexDebug(
 					include=pattern.include,
@@ -148,21 +205,196 @@ class Re2PsBackend(_Backend):
 					is_dir_pattern=False,
 				))
 
-			regex_set.Add(regex)
+			# Narrow the regular expression for the type of `re2.Set.Add()`.
+			if isinstance(regex, bytes):
+				regex_set.Add(regex)
+			else:
+				regex_set.Add(regex)
 
-		# Compile patterns.
-		regex_set.Compile()
 		return regex_data
 
 	@staticmethod
-	def _make_set() -> re2.Set:  # type: ignore
+	def _get_set_regexes(pattern: RegexPattern) -> list[tuple[Union[str, bytes], bool]]:
+		"""
+		Get the regular expressions of the pattern to add to a re2 regex set.
+
+		*pattern* (:class:`.RegexPattern`) is the pattern.
+
+		Returns a :class:`list` of :class:`tuple` containing each uncompiled regular
+		expression (:class:`str` or :class:`bytes`), and whether it is a directory
+		pattern (:class:`bool`).
+		"""
+		assert isinstance(pattern, RegexPattern), pattern
+		regex: Union[str, bytes, None]
+		if isinstance(pattern, _GitIgnoreBasePattern):
+			# Lower the gitignore pattern into a regular expression optimized for the
+			# engine.
+			regex = pattern._get_match_regex('re2')
+		else:
+			regex = pattern.raw_regex
+
+		assert regex is not None, pattern
+		return [(regex, False)]
+
+	@classmethod
+	def _init_sets(
+		cls,
+		debug: bool,
+		max_mem: int,
+		patterns: list[tuple[int, RegexPattern]],
+		sort_indices: Optional[Callable[[list[int]], None]],
+	) -> list[tuple[re2.Set, list[Re2RegexDat]]]:  # type: ignore
+		"""
+		Create the re2 regex sets (partitions) from the given patterns. Each set
+		contains a contiguous range of the patterns whose estimated memory fits
+		within the budget (see :data:`SET_MEM_PER_REGEX_BYTE`). A set which still
+		fails to compile is split in half.
+
+		*debug* (:class:`bool`) is whether to include additional debugging
+		information for the regular expressions.
+
+		*max_mem* (:class:`int`) is the memory budget (in bytes) of each set.
+
+		*patterns* (:class:`list` of :class:`tuple`) contains the enumerated
+		patterns.
+
+		*sort_indices* (:class:`callable` or :data:`None`) is a function used to
+		sort the patterns by index.
+
+		Returns the sets (:class:`list` of :class:`tuple`). See
+		:attr:`._sets <Re2PsBackend._sets>`.
+		"""
+		assert patterns, patterns
+		assert re2 is not None, (re2, re2_error)
+
+		# Partition patterns.
+		max_size = max(max_mem // SET_MEM_PER_REGEX_BYTE, 1)
+		partitions: list[list[tuple[int, RegexPattern]]] = [[]]
+		size = 0
+		for pattern_index, pattern in patterns:
+			# Estimate from the regular expressions added to the set.
+			regex_len = sum(len(__regex) for __regex, _ in cls._get_set_regexes(pattern))
+			if partitions[-1] and size + regex_len > max_size:
+				partitions.append([])
+				size = 0
+
+			partitions[-1].append((pattern_index, pattern))
+			size += regex_len
+
+		# Compile partitions.
+		sets: list[tuple[re2.Set, list[Re2RegexDat]]] = []  # type: ignore
+		partitions.reverse()
+		while partitions:
+			partition = partitions.pop()
+			regex_set = cls._make_set(max_mem)
+			regex_data = cls._init_set(
+				debug=debug,
+				patterns=dict(partition),
+				regex_set=regex_set,
+				sort_indices=sort_indices,
+			)
+			try:
+				regex_set.Compile()
+			except re2.error as e:
+				if len(partition) == 1:
+					pattern_index, pattern = partition[0]
+					raise ValueError((
+						f"Pattern {pattern_index} {pattern.pattern!r} does not fit within "
+						f"{max_mem=!r}."
+					)) from e
+
+				# The set exceeded the budget. Compile each half instead.
+				half = len(partition) // 2
+				partitions.append(partition[half:])
+				partitions.append(partition[:half])
+				continue
+
+			sets.append((regex_set, regex_data))
+
+		return sets
+
+	@staticmethod
+	def _make_set(max_mem: int) -> re2.Set:  # type: ignore
 		"""
 		Create the re2 regex set.
 
+		*max_mem* (:class:`int`) is the memory budget (in bytes) of the set.
+
 		Returns the set (:class:`re2.Set`).
 		"""
 		assert re2 is not None, (re2, re2_error)
-		return re2.Set.SearchSet(RE2_OPTIONS)
+		base_options = RE2_OPTIONS
+		assert base_options is not None, (base_options, re2_error)
+		if max_mem == RE2_MAX_MEM:
+			options = base_options
+		else:
+			options = re2.Options()
+			options.log_errors = base_options.log_errors
+			options.max_mem = max_mem
+			options.never_capture = base_options.never_capture
+
+		return re2.Set.SearchSet(options)
+
+	@override
+	def get_removed_indices(self) -> list[int]:
+		"""
+		Get the patterns removed because they cannot affect the result of a match
+		(see :func:`minimize_patterns`).
+
+		Returns the indices of the removed patterns (:class:`list` of :class:`int`)
+		in order.
+		"""
+		return [__index for __index, _ in self._removed_patterns]
+
+	@override
+	def make_bytes_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchBytesFileHint:
+		"""
+		Create the function used to check a batch of :class:`bytes` files against
+		the patterns. The files are matched directly.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory).
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		return self.match_bytes_file
+
+	@override
+	def match_bytes_file(self, file: bytes) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the :class:`bytes` file against the patterns. The file is matched
+		directly without decoding it.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), and the index of the last matched pattern (:class:`int` or
+		:data:`None`).
+		"""
+		# NOTICE: `re2.Set.Match()` only encodes a `str` to UTF-8, and matches
+		# `bytes` as is.
+		return self.match_file(file)  # type: ignore[arg-type]
+
+	@override
+	def match_bytes_file_all(
+		self,
+		file: bytes,
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the :class:`bytes` file against every pattern. The file is matched
+		directly without decoding it.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		return self.match_file_all(file)  # type: ignore[arg-type]
 
 	@override
 	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
@@ -179,11 +411,41 @@ class Re2PsBackend(_Backend):
 		# - WARNING: According to the documentation on `RE2::Set::Match()`, there is
 		#   no guarantee matches will be produced in order! Later expressions have
 		#   higher priority.
-		match_ids: Optional[list[int]] = self._set.Match(file)  # type: ignore[assignment]
-		if not match_ids:
-			return (None, None)
+		for regex_set, regex_data in reversed(self._sets):
+			match_ids: Optional[list[int]] = regex_set.Match(file)  # type: ignore[assignment]
+			if match_ids:
+				# The earlier sets only contain earlier patterns than the match.
+				pattern_index = max(regex_data[__id].index for __id in match_ids)
+				pattern = self._patterns[pattern_index]
+				return (pattern.include, pattern_index)
+
+		return (None, None)
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern. Every set reports all of its matched
+		regular expressions, so the matches are collected from the same scans.
+
+		*file* (:class:`str`) is the normalized file path to check.
 
-		regex_data = self._regex_data
-		pattern_index = max(regex_data[__id].index for __id in match_ids)
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		matches = 0
+		for regex_set, regex_data in self._sets:
+			match_ids: Optional[list[int]] = regex_set.Match(file)  # type: ignore[assignment]
+			if match_ids:
+				for regex_id in match_ids:
+					matches |= 1 << regex_data[regex_id].index
+
+		if not matches:
+			return (None, None, match_pattern_bits(self._removed_patterns, file))
+
+		# A removed pattern is never the last match because a later pattern matches
+		# every path it matches.
+		pattern_index = matches.bit_length() - 1
 		pattern = self._patterns[pattern_index]
-		return (pattern.include, pattern_index)
+		matches |= match_pattern_bits(self._removed_patterns, file)
+		return (pattern.include, pattern_index, matches)
@@ -0,0 +1,133 @@
+"""
+This module provides the :module:`re2` backend for :class:`~pathspec.specset.PathSpecSet`.
+
+WARNING: The *pathspec._backends.re2* package is not part of the public API. Its
+contents and structure are likely to change.
+"""
+from __future__ import annotations
+
+from collections.abc import (
+	Sequence)
+from typing import (
+	Optional)  # Replaced by `X | None` in 3.10.
+
+try:
+	import re2
+except ModuleNotFoundError:
+	re2 = None  # type: ignore[assignment]
+
+from pathspec.backend import (
+	_SetBackend)
+from pathspec.pattern import (
+	Pattern,
+	RegexPattern)
+from pathspec._typing import (
+	override)  # Added in 3.12.
+
+from .._utils import (
+	enumerate_patterns,
+	fold_gitignore_match,
+	lower_set_regexes,
+	minimize_patterns)
+
+from .base import (
+	re2_error)
+from ._base import (
+	RE2_OPTIONS,
+	Re2SetRegexDat)
+
+
+class Re2SetBackend(_SetBackend):
+	"""
+	The :class:`Re2SetBackend` class is the :module:`re2` implementation used by
+	:class:`~pathspec.specset.PathSpecSet` for matching files. The patterns of
+	every path-spec are compiled into a single regex set.
+	"""
+
+	def __init__(self, specs: Sequence[tuple[Sequence[Pattern], bool]]) -> None:
+		"""
+		Initialize the :class:`Re2SetBackend` instance.
+
+		*specs* (:class:`Sequence` of :class:`tuple`) contains the compiled
+		patterns of each path-spec (:class:`Sequence` of :class:`.RegexPattern`),
+		and whether the path-spec is a :class:`~pathspec.gitignore.GitIgnoreSpec`
+		(:class:`bool`).
+		"""
+		if re2_error is not None:
+			raise re2_error
+
+		assert re2 is not None, (re2, re2_error)
+		regex_set = re2.Set.SearchSet(RE2_OPTIONS)
+		regex_data: list[Re2SetRegexDat] = []
+		for spec_index, (patterns, gitignore) in enumerate(specs):
+			if patterns and not isinstance(patterns[0], RegexPattern):
+				raise TypeError(f"{patterns[0]=!r} must be a RegexPattern.")
+
+			use_patterns = enumerate_patterns(patterns, filter=True, reverse=False)
+			if not gitignore:
+				# See `Re2GiBackend._minimize`.
+				use_patterns, _removed = minimize_patterns(use_patterns)
+
+			for pattern_index, pattern in use_patterns:
+				assert isinstance(pattern, RegexPattern), pattern
+				assert pattern.include is not None, pattern
+				for regex, is_dir_pattern in lower_set_regexes(pattern, gitignore, 're2'):
+					regex_data.append(Re2SetRegexDat(
+						include=pattern.include,
+						index=pattern_index,
+						is_dir_pattern=is_dir_pattern,
+						spec_index=spec_index,
+					))
+					regex_set.Add(regex)  # type: ignore[type-var]
+
+		regex_set.Compile()
+
+		self._regex_data: list[Re2SetRegexDat] = regex_data
+		"""
+		*_regex_data* (:class:`list`) maps regex index (:class:`int`) to regex data
+		(:class:`Re2SetRegexDat`).
+		"""
+
+		self._set: re2.Set = regex_set  # type: ignore
+		"""
+		*_set* (:class:`re2.Set`) is the re2 regex set.
+		"""
+
+	@override
+	def match_file(self, file: str) -> dict[int, tuple[bool, int]]:
+		"""
+		Check the file against the patterns of each path-spec.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`dict` mapping the index of each path-spec with a matched
+		pattern (:class:`int`) to a :class:`tuple` containing whether to include
+		*file* (:class:`bool`), and the index of the last matched pattern
+		(:class:`int`).
+		"""
+		match_ids: Optional[list[int]] = self._set.Match(file)  # type: ignore[assignment]
+		if not match_ids:
+			return {}
+
+		# Fold the matches of each path-spec. The regular expressions for a
+		# `PathSpec` never match by a directory pattern, so its last match takes
+		# precedence.
+		# - WARNING: According to the documentation on `RE2::Set::Match()`, there is
+		#   no guarantee matches will be produced in order!
+		outs: dict[int, tuple[Optional[bool], int, int]] = {}
+		no_match = (None, -1, 0)
+		regex_data = self._regex_data
+		for regex_id in match_ids:
+			regex_dat = regex_data[regex_id]
+			spec_index = regex_dat.spec_index
+			outs[spec_index] = fold_gitignore_match(
+				outs.get(spec_index, no_match),
+				regex_dat.include,
+				regex_dat.index,
+				regex_dat.is_dir_pattern,
+			)
+
+		return {
+			__spec_index: (__out[0], __out[1])  # type: ignore[misc]
+			for __spec_index, __out in outs.items()
+		}
@@ -8,15 +8,22 @@ Its contents and structure are likely to change.
 from collections.abc import (
 	Sequence)
 from typing import (
-	Optional)  # Replaced by `X | None` in 3.10.
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
 
+from pathspec.backend import (
+	_MatchFileHint)
 from pathspec.pattern import (
 	RegexPattern)
-from pathspec.patterns.gitignore.spec import (
-	_DIR_MARK)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 
+from .._utils import (
+	DirResultMemo,
+	DirResultStack,
+	fold_gitignore_match,
+	get_dir_key,
+	match_pattern_bits)
 from .pathspec import (
 	SimplePsBackend)
 
@@ -28,6 +35,8 @@ class SimpleGiBackend(SimplePsBackend):
 	"""
 
 	# Change type hint.
+	_dir_patterns: list[tuple[int, RegexPattern]]  # type: ignore[assignment]
+	_file_patterns: list[tuple[int, RegexPattern]]  # type: ignore[assignment]
 	_patterns: list[tuple[int, RegexPattern]]  # type: ignore[assignment]
 
 	def __init__(
@@ -51,6 +60,114 @@ class SimpleGiBackend(SimplePsBackend):
 		"""
 		super().__init__(patterns, no_filter=no_filter, no_reverse=no_reverse)
 
+	@override
+	def make_batch_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchFileHint:
+		"""
+		Create the function used to check a batch of files against the patterns.
+		The results of the directory patterns are memoized per directory so only
+		the remaining patterns are checked for each file.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous file are kept.
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		if not self._is_reversed or not self._dir_patterns:
+			# The memo relies on checking the patterns in reverse order.
+			return self.match_file
+
+		dir_patterns = self._dir_patterns
+		file_patterns = self._file_patterns
+
+		def match_dir(dir_key: str) -> tuple[
+			Optional[tuple[bool, int]], Optional[tuple[bool, int]]
+		]:
+			return self._match_dir_priorities(dir_patterns, dir_key)
+
+		memo: Union[DirResultMemo, DirResultStack]
+		if presorted:
+			memo = DirResultStack(match_dir)
+		else:
+			memo = DirResultMemo(match_dir)
+
+		get_dir_result = memo.get
+
+		def match_file(file: str) -> tuple[Optional[bool], Optional[int]]:
+			dir_result = get_dir_result(get_dir_key(file))
+
+			# A file matched by a file pattern (priority 2) takes precedence over a
+			# directory pattern (priority 1). This allows files to be included from
+			# an excluded directory. Only a file pattern after the matched directory
+			# patterns can take precedence.
+			dir_file_match, dir_dir_match = dir_result
+			dir_index = dir_file_match[1] if dir_file_match is not None else -1
+
+			out_dir_match = dir_dir_match
+			for index, pattern in file_patterns:
+				if index < dir_index:
+					break
+				elif (
+					(include := pattern.include) is not None
+					and (priority := pattern.match_file_priority(file))
+				):
+					if priority == 2:
+						# Pattern matched by a file pattern.
+						return (include, index)
+					elif out_dir_match is None or index > out_dir_match[1]:
+						# Pattern matched by a directory pattern.
+						out_dir_match = (include, index)
+
+			if dir_file_match is not None:
+				return dir_file_match
+			elif out_dir_match is not None:
+				return out_dir_match
+			else:
+				return (None, None)
+
+		return match_file
+
+	@staticmethod
+	def _match_dir_priorities(
+		patterns: list[tuple[int, RegexPattern]],
+		dir_key: str,
+	) -> tuple[Optional[tuple[bool, int]], Optional[tuple[bool, int]]]:
+		"""
+		Check the directory against the directory patterns.
+
+		*patterns* (:class:`list` of :class:`tuple`) contains the enumerated
+		directory patterns in reverse order.
+
+		*dir_key* (:class:`str`) is the directory path including its trailing
+		slash.
+
+		Returns a :class:`tuple` containing the last match by a file pattern
+		(priority 2), and the last match by a directory pattern (priority 1). Each
+		match is either a :class:`tuple` containing the include (:class:`bool`) and
+		the pattern index (:class:`int`), or :data:`None`.
+		"""
+		out_file_match: Optional[tuple[bool, int]] = None
+		out_dir_match: Optional[tuple[bool, int]] = None
+		for index, pattern in patterns:
+			if (
+				(include := pattern.include) is not None
+				and (priority := pattern.match_file_priority(dir_key))
+			):
+				if priority == 2:
+					# Pattern matched by a file pattern. Patterns are in reverse order so
+					# this is the last match.
+					out_file_match = (include, index)
+					break
+				elif out_dir_match is None:
+					# Pattern matched by a directory pattern.
+					out_dir_match = (include, index)
+
+		return (out_file_match, out_dir_match)
+
 	@override
 	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
 		"""
@@ -70,20 +187,10 @@ class SimpleGiBackend(SimplePsBackend):
 		for index, pattern in self._patterns:
 			if (
 				(include := pattern.include) is not None
-				and (match := pattern.match_file(file)) is not None
+				and (priority := pattern.match_file_priority(file))
 			):
-				# Pattern matched.
-
-				# Check for directory marker.
-				dir_mark = match.match.groupdict().get(_DIR_MARK)
-
-				if dir_mark:
-					# Pattern matched by a directory pattern.
-					priority = 1
-				else:
-					# Pattern matched by a file pattern.
-					priority = 2
-
+				# Pattern matched with priority 1 by a directory pattern, or priority 2
+				# by a file pattern.
 				if is_reversed:
 					if priority > out_priority:
 						out_include = include
@@ -91,7 +198,7 @@ class SimpleGiBackend(SimplePsBackend):
 						out_priority = priority
 				else:
 					# Forward.
-					if (include and dir_mark) or priority >= out_priority:
+					if (include and priority == 1) or priority >= out_priority:
 						out_include = include
 						out_index = index
 						out_priority = priority
@@ -102,3 +209,30 @@ class SimpleGiBackend(SimplePsBackend):
 					break
 
 		return (out_include, out_index)
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		matches = match_pattern_bits(self._removed_patterns, file)
+		out: tuple[Optional[bool], int, int] = (None, -1, 0)
+		for index, pattern in self._patterns:
+			if (
+				(include := pattern.include) is not None
+				and (priority := pattern.match_file_priority(file))
+			):
+				matches |= 1 << index
+				out = fold_gitignore_match(out, include, index, priority == 1)
+
+		out_include, out_index, _priority = out
+		if out_index == -1:
+			return (None, None, matches)
+
+		return (out_include, out_index, matches)
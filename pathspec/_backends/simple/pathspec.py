@@ -8,19 +8,28 @@ Its contents and structure are likely to change.
 from collections.abc import (
 	Sequence)
 from typing import (
-	Optional)  # Replaced by `X | None` in 3.10.
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
 
 from pathspec.backend import (
-	_Backend)
+	_Backend,
+	_MatchFileHint)
 from pathspec.pattern import (
-	Pattern)
+	Pattern,
+	RegexPattern)
 from pathspec._typing import (
 	override)  # Added in 3.12.
 from pathspec.util import (
 	check_match_file)
 
 from .._utils import (
-	enumerate_patterns)
+	DirResultMemo,
+	DirResultStack,
+	enumerate_patterns,
+	get_dir_key,
+	match_pattern_bits,
+	minimize_patterns,
+	split_dir_patterns)
 
 
 class SimplePsBackend(_Backend):
@@ -54,14 +63,113 @@ class SimplePsBackend(_Backend):
 		*_is_reversed* (:class:`bool`) is whether to the pattern order was reversed.
 		"""
 
-		self._patterns: list[tuple[int, Pattern]] = enumerate_patterns(
-			patterns, filter=not no_filter, reverse=not no_reverse,
-		)
+		use_patterns = enumerate_patterns(patterns, filter=not no_filter, reverse=False)
+		removed_patterns: list[tuple[int, Pattern]] = []
+		if not no_filter:
+			use_patterns, removed_patterns = minimize_patterns(use_patterns)
+
+		if not no_reverse:
+			use_patterns.reverse()
+
+		self._patterns: list[tuple[int, Pattern]] = use_patterns
 		"""
 		*_patterns* (:class:`list` of :class:`tuple`) contains the enumerated
 		patterns.
 		"""
 
+		self._removed_patterns: list[tuple[int, Pattern]] = removed_patterns
+		"""
+		*_removed_patterns* (:class:`list` of :class:`tuple`) contains the removed
+		enumerated patterns. They are only checked for every match (see
+		:meth:`.match_file_all`).
+		"""
+
+		# This backend uses the compiled regular expressions. Compile them now
+		# instead of on the first match so invalid regular expressions are reported
+		# when the backend is created.
+		for _index, pattern in self._patterns:
+			if isinstance(pattern, RegexPattern):
+				_regex = pattern.regex
+
+		dir_patterns, file_patterns = split_dir_patterns(self._patterns)
+
+		self._dir_patterns: list[tuple[int, Pattern]] = dir_patterns
+		"""
+		*_dir_patterns* (:class:`list` of :class:`tuple`) contains the enumerated
+		patterns which only depend on the directory components of a path.
+		"""
+
+		self._file_patterns: list[tuple[int, Pattern]] = file_patterns
+		"""
+		*_file_patterns* (:class:`list` of :class:`tuple`) contains the remaining
+		enumerated patterns which depend on the file name.
+		"""
+
+	@override
+	def get_removed_indices(self) -> list[int]:
+		"""
+		Get the patterns removed because they cannot affect the result of a match
+		(see :func:`minimize_patterns`).
+
+		Returns the indices of the removed patterns (:class:`list` of :class:`int`)
+		in order.
+		"""
+		return [__index for __index, _ in self._removed_patterns]
+
+	@override
+	def make_batch_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchFileHint:
+		"""
+		Create the function used to check a batch of files against the patterns.
+		The results of the directory patterns are memoized per directory so only
+		the remaining patterns are checked for each file.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous file are kept.
+
+		Returns the function (:class:`~collections.abc.Callable`).
+		"""
+		if not self._is_reversed or not self._dir_patterns:
+			# The memo relies on checking the patterns in reverse order.
+			return self.match_file
+
+		dir_patterns = self._dir_patterns
+		file_patterns = self._file_patterns
+
+		def match_dir(dir_key: str) -> tuple[Optional[bool], Optional[int]]:
+			return check_match_file(dir_patterns, dir_key, True)
+
+		memo: Union[DirResultMemo, DirResultStack]
+		if presorted:
+			memo = DirResultStack(match_dir)
+		else:
+			memo = DirResultMemo(match_dir)
+
+		get_dir_result = memo.get
+
+		def match_file(file: str) -> tuple[Optional[bool], Optional[int]]:
+			dir_result = get_dir_result(get_dir_key(file))
+
+			# Only a file pattern after the matched directory pattern can take
+			# precedence.
+			dir_index = dir_result[1]
+			if dir_index is None:
+				dir_index = -1
+
+			for index, pattern in file_patterns:
+				if index < dir_index:
+					break
+				elif pattern.include is not None and pattern.matches_file(file):
+					return (pattern.include, index)
+
+			return dir_result
+
+		return match_file
+
 	@override
 	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
 		"""
@@ -74,3 +182,28 @@ class SimplePsBackend(_Backend):
 		:data:`None`).
 		"""
 		return check_match_file(self._patterns, file, self._is_reversed)
+
+	@override
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`).
+		"""
+		# A removed pattern is never the last match because a later pattern matches
+		# every path it matches.
+		matches = match_pattern_bits(self._removed_patterns, file)
+		out_include: Optional[bool] = None
+		out_index: Optional[int] = None
+		for index, pattern in self._patterns:
+			if (include := pattern.include) is not None and pattern.matches_file(file):
+				matches |= 1 << index
+				if out_index is None or index > out_index:
+					out_include = include
+					out_index = index
+
+		return (out_include, out_index, matches)
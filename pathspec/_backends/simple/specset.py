@@ -0,0 +1,77 @@
+"""
+This module provides the simple backend for :class:`~pathspec.specset.PathSpecSet`.
+
+WARNING: The *pathspec._backends.simple* package is not part of the public API.
+Its contents and structure are likely to change.
+"""
+
+from collections.abc import (
+	Sequence)
+from typing import (
+	cast)
+
+from pathspec.backend import (
+	_Backend,
+	_SetBackend)
+from pathspec.pattern import (
+	Pattern,
+	RegexPattern)
+from pathspec._typing import (
+	override)  # Added in 3.12.
+
+from .gitignore import (
+	SimpleGiBackend)
+from .pathspec import (
+	SimplePsBackend)
+
+
+class SimpleSetBackend(_SetBackend):
+	"""
+	The :class:`SimpleSetBackend` class is the default (or simple) implementation
+	used by :class:`~pathspec.specset.PathSpecSet` for matching files. The
+	patterns of each path-spec are checked separately.
+	"""
+
+	def __init__(self, specs: Sequence[tuple[Sequence[Pattern], bool]]) -> None:
+		"""
+		Initialize the :class:`SimpleSetBackend` instance.
+
+		*specs* (:class:`Sequence` of :class:`tuple`) contains the compiled
+		patterns of each path-spec (:class:`Sequence` of :class:`.Pattern`), and
+		whether the path-spec is a :class:`~pathspec.gitignore.GitIgnoreSpec`
+		(:class:`bool`).
+		"""
+
+		backends: list[_Backend] = []
+		for patterns, gitignore in specs:
+			if gitignore:
+				backends.append(SimpleGiBackend(cast(Sequence[RegexPattern], patterns)))
+			else:
+				backends.append(SimplePsBackend(patterns))
+
+		self._backends: list[_Backend] = backends
+		"""
+		*_backends* (:class:`list` of :class:`._Backend`) contains the backend for
+		each path-spec.
+		"""
+
+	@override
+	def match_file(self, file: str) -> dict[int, tuple[bool, int]]:
+		"""
+		Check the file against the patterns of each path-spec.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`dict` mapping the index of each path-spec with a matched
+		pattern (:class:`int`) to a :class:`tuple` containing whether to include
+		*file* (:class:`bool`), and the index of the last matched pattern
+		(:class:`int`).
+		"""
+		out: dict[int, tuple[bool, int]] = {}
+		for spec_index, backend in enumerate(self._backends):
+			include, index = backend.match_file(file)
+			if include is not None:
+				assert index is not None, (include, index)
+				out[spec_index] = (include, index)
+
+		return out
@@ -0,0 +1,214 @@
+"""
+This module provides the vectorized matching of NumPy arrays of file paths used
+by :meth:`.PathSpec.match_array`.
+
+WARNING: The *pathspec._numpy* module is not part of the public API. Its
+contents and structure are likely to change.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import (
+	Collection,
+	Sequence)
+from typing import (
+	Any,
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union)  # Replaced by `X | Y` in 3.10.
+
+try:
+	import numpy
+	numpy_error = None
+except ModuleNotFoundError as e:
+	numpy = None  # type: ignore[assignment]
+	numpy_error = e.with_traceback(None)
+
+from pathspec.backend import (
+	_Backend,
+	_MatchBytesFileHint,
+	_MatchFileHint)
+from pathspec.pattern import (
+	Pattern)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
+from pathspec._backends._utils import (
+	enumerate_patterns)
+from pathspec.util import (
+	normalize_file_batch)
+
+numpy_error: Optional[ModuleNotFoundError]  # type: ignore[no-redef]
+"""
+*numpy_error* (:class:`ModuleNotFoundError` or :data:`None`) is the numpy
+import error.
+"""
+
+LITERAL_SENTINEL = '/'
+"""
+The sentinel (:class:`str`) wrapped around each path when searching for
+literals. This mirrors the Hyperscan literal database (see
+:data:`pathspec._backends.hyperscan._base.LITERAL_SENTINEL`).
+"""
+
+
+def match_array(
+	backend: _Backend,
+	literals: list[tuple[int, bool, str, bool, bool]],
+	complete: bool,
+	files: Any,
+) -> tuple[Any, Any]:
+	"""
+	Match the normalized files against the patterns. The trailing literals are
+	evaluated on the whole array at once, and only the files which none of them
+	matched are checked with the backend.
+
+	*backend* (:class:`._Backend`) is the backend of the path-spec.
+
+	*literals* (:class:`list` of :class:`tuple`) contains the trailing literals
+	(see :func:`split_trailing_literals`).
+
+	*complete* (:class:`bool`) is whether the literals are all of the patterns.
+	When they are, the backend is not used.
+
+	*files* (:class:`numpy.ndarray`) is the one-dimensional array of normalized
+	file paths. Its type must be :class:`str` (``"U"``) or :class:`bytes`
+	(``"S"``).
+
+	Returns a :class:`tuple` containing whether each file is included
+	(:class:`numpy.ndarray` of :class:`bool`), and the index of the last matched
+	pattern of each file (:class:`numpy.ndarray` of :class:`numpy.int32`). The
+	index is ``-1`` if no pattern matched.
+	"""
+	if numpy is None:
+		assert numpy_error is not None, (numpy, numpy_error)
+		raise numpy_error
+
+	kind = files.dtype.kind
+	match_file: Union[_MatchFileHint, _MatchBytesFileHint]
+	if kind == 'U':
+		sentinel: Any = LITERAL_SENTINEL
+		encode: Any = str
+		match_file = backend.make_batch_matcher()
+	elif kind == 'S':
+		sentinel = os.fsencode(LITERAL_SENTINEL)
+		encode = os.fsencode
+		match_file = backend.make_bytes_matcher()
+	else:
+		raise TypeError(f"files.dtype:{files.dtype!r} must be a str or bytes type.")
+
+	if files.ndim != 1:
+		raise ValueError(f"files.shape:{files.shape!r} must be one-dimensional.")
+
+	file_count = len(files)
+	includes = numpy.full(file_count, -1, dtype=numpy.int8)
+	indices = numpy.full(file_count, -1, dtype=numpy.int32)
+
+	if literals and file_count:
+		# The paths are searched with a leading and trailing sentinel slash. A
+		# directory literal must be followed by a slash from the path, and not the
+		# trailing sentinel.
+		lead_files = numpy.char.add(sentinel, files)
+		wrapped_files = numpy.char.add(lead_files, sentinel)
+		for index, include, literal, root, dir_only in literals:
+			search_files = lead_files if dir_only else wrapped_files
+			if root:
+				hits = numpy.char.startswith(search_files, encode(literal))
+			else:
+				hits = numpy.char.find(search_files, encode(literal)) >= 0
+
+			# The literals are in pattern order, so the last match wins.
+			includes[hits] = include
+			indices[hits] = index
+
+	if not complete:
+		# Check the files which the literals did not match with the backend.
+		undecided = numpy.flatnonzero(indices == -1)
+		for i, file in zip(undecided.tolist(), files[undecided].tolist()):
+			file_include, file_index = match_file(file)
+			if file_index is not None:
+				assert file_include is not None, (file, file_include, file_index)
+				includes[i] = file_include
+				indices[i] = file_index
+
+	return (includes == 1, indices)
+
+
+def normalize_array(
+	files: Any,
+	separators: Optional[Collection[str]],
+) -> Any:
+	"""
+	Normalize the file paths (see :func:`.normalize_file_batch`).
+
+	*files* (:class:`numpy.ndarray`) is the one-dimensional array of file paths.
+	Its type can be :class:`str` (``"U"``), :class:`bytes` (``"S"``), or
+	:class:`object` (``"O"``) containing :class:`str` or :class:`bytes`.
+
+	*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+	:data:`None`) optionally contains the path separators to normalize.
+
+	Returns the normalized file paths (:class:`numpy.ndarray`).
+	"""
+	if numpy is None:
+		assert numpy_error is not None, (numpy, numpy_error)
+		raise numpy_error
+
+	norm_files = normalize_file_batch(files.tolist(), separators)
+	if files.dtype.kind in 'SU':
+		# Normalizing never lengthens a path, so the paths fit the original type.
+		return numpy.array(norm_files, dtype=files.dtype)
+	elif norm_files:
+		return numpy.array(norm_files)
+	else:
+		return numpy.array(norm_files, dtype=str)
+
+
+def split_trailing_literals(
+	patterns: Sequence[Pattern],
+) -> tuple[list[tuple[int, bool, str, bool, bool]], bool]:
+	"""
+	Split the literal-equivalent gitignore patterns after the last pattern which
+	needs a regular expression. A file matched by one of these literals cannot be
+	matched by a later pattern.
+
+	*patterns* (:class:`~collections.abc.Sequence` of :class:`.Pattern`)
+	contains the patterns.
+
+	Returns a :class:`tuple` containing the literals (:class:`list` of
+	:class:`tuple`), and whether the literals are all of the patterns
+	(:class:`bool`). Each literal contains the pattern index (:class:`int`),
+	whether the pattern includes the file (:class:`bool`), the literal to search
+	for (:class:`str`), whether the literal must begin at the start of the path
+	(:class:`bool`), and whether the pattern can only match a file by one of its
+	parent directories (:class:`bool`).
+	"""
+	literals: list[tuple[int, bool, str, bool, bool]] = []
+	complete = True
+	for index, pattern in enumerate_patterns(patterns, filter=True, reverse=True):
+		ir = None
+		lit_tup = None
+		if isinstance(pattern, _GitIgnoreBasePattern) and (ir := pattern._get_ir()) is not None:
+			lit_tup = ir.to_literal()
+
+		if ir is None or lit_tup is None:
+			complete = False
+			break
+
+		# A literal beginning a path segment starts with a slash, and a literal
+		# matching a path ends with a slash.
+		literal, start = lit_tup
+		lit_parts = []
+		if start != 'any':
+			lit_parts.append(LITERAL_SENTINEL)
+
+		lit_parts.append(literal)
+		dir_only = ir.is_dir_only
+		if not dir_only:
+			lit_parts.append(LITERAL_SENTINEL)
+
+		assert pattern.include is not None, pattern
+		literals.append((
+			index, pattern.include, ''.join(lit_parts), start == 'root', dir_only,
+		))
+
+	literals.reverse()
+	return (literals, complete)
@@ -5,6 +5,7 @@ matching backends. The exact structure of the backends is not solidified and is
 subject to change.
 """
 
+import os
 from collections.abc import (
 	Sequence)
 from typing import (
@@ -20,6 +21,16 @@ BackendNamesHint = Literal['best', 'hyperscan', 're2', 'simple']
 The supported backend values.
 """
 
+_MatchFileHint = Callable[[str], tuple[Optional[bool], Optional[int]]]
+"""
+Type hint for the function returned by :meth:`._Backend.make_batch_matcher`.
+"""
+
+_MatchBytesFileHint = Callable[[bytes], tuple[Optional[bool], Optional[int]]]
+"""
+Type hint for the function returned by :meth:`._Backend.make_bytes_matcher`.
+"""
+
 _TestBackendFactoryHint = Optional[Callable[[Sequence[Pattern]], '_Backend']]
 """
 Type hint for the test backend factory argument.
@@ -35,6 +46,91 @@ class _Backend(object):
 	files against patterns.
 	"""
 
+	def get_removed_indices(self) -> list[int]:
+		"""
+		Get the patterns removed because they cannot affect the result of a match
+		(e.g., a pattern shadowed by a later pattern). They are not compiled into
+		the backend, and are only checked by :meth:`._Backend.match_file_all`.
+
+		Returns the indices of the removed patterns (:class:`list` of :class:`int`)
+		in order. The default implementation returns an empty :class:`list`.
+		"""
+		return []
+
+	def make_batch_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchFileHint:
+		"""
+		Create the function used to check a batch of files against the patterns.
+		The function may keep state between calls (e.g., memoized results), so it
+		should only be used for the files of a single batch.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory) so neighboring files share their leading
+		directories. This is only a hint to optimize for. Default is :data:`None`
+		for :data:`False`.
+
+		Returns the function (:class:`~collections.abc.Callable`). It accepts the
+		normalized file path (:class:`str`), and returns the same result as
+		:meth:`._Backend.match_file`. The default implementation simply returns
+		:meth:`._Backend.match_file`.
+		"""
+		return self.match_file
+
+	def make_bytes_matcher(
+		self,
+		*,
+		presorted: Optional[bool] = None,
+	) -> _MatchBytesFileHint:
+		"""
+		Create the function used to check a batch of :class:`bytes` files against
+		the patterns. See :meth:`._Backend.make_batch_matcher`.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory).
+
+		Returns the function (:class:`~collections.abc.Callable`). It accepts the
+		normalized file path (:class:`bytes`), and returns the same result as
+		:meth:`._Backend.match_file`. The default implementation decodes each file
+		with :func:`os.fsdecode` for the function returned by
+		:meth:`._Backend.make_batch_matcher`.
+		"""
+		match_file = self.make_batch_matcher(presorted=presorted)
+		fsdecode = os.fsdecode
+
+		def match_bytes_file(file: bytes) -> tuple[Optional[bool], Optional[int]]:
+			return match_file(fsdecode(file))
+
+		return match_bytes_file
+
+	def match_bytes_file(self, file: bytes) -> tuple[Optional[bool], Optional[int]]:
+		"""
+		Check the :class:`bytes` file against the patterns.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns the same result as :meth:`._Backend.match_file`. The default
+		implementation decodes *file* with :func:`os.fsdecode` so undecodable bytes
+		are kept as surrogate escapes.
+		"""
+		return self.match_file(os.fsdecode(file))
+
+	def match_bytes_file_all(
+		self,
+		file: bytes,
+	) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the :class:`bytes` file against every pattern.
+
+		*file* (:class:`bytes`) is the normalized file path to check.
+
+		Returns the same result as :meth:`._Backend.match_file_all`. The default
+		implementation decodes *file* with :func:`os.fsdecode`.
+		"""
+		return self.match_file_all(os.fsdecode(file))
+
 	def match_file(self, file: str) -> tuple[Optional[bool], Optional[int]]:
 		"""
 		Check the file against the patterns.
@@ -49,3 +145,45 @@ class _Backend(object):
 			f"{self.__class__.__module__}.{self.__class__.__qualname__}.match_file() "
 			f"must be implemented."
 		))  # NotImplementedError
+
+	def match_file_all(self, file: str) -> tuple[Optional[bool], Optional[int], int]:
+		"""
+		Check the file against every pattern.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`tuple` containing whether to include *file* (:class:`bool`
+		or :data:`None`), the index of the last matched pattern (:class:`int` or
+		:data:`None`), and the bitset of every matched pattern (:class:`int`). Bit
+		*i* is set when the pattern at index *i* matched.
+		"""
+		raise NotImplementedError((
+			f"{self.__class__.__module__}.{self.__class__.__qualname__}.match_file_all() "
+			f"must be implemented."
+		))  # NotImplementedError
+
+
+class _SetBackend(object):
+	"""
+	.. warning:: This class is not part of the public API. It is subject to
+		change.
+
+	The :class:`_SetBackend` class is the abstract base class defining how to
+	match files against the patterns of several path-specs at once.
+	"""
+
+	def match_file(self, file: str) -> dict[int, tuple[bool, int]]:
+		"""
+		Check the file against the patterns of each path-spec.
+
+		*file* (:class:`str`) is the normalized file path to check.
+
+		Returns a :class:`dict` mapping the index of each path-spec with a matched
+		pattern (:class:`int`) to a :class:`tuple` containing whether to include
+		*file* (:class:`bool`), and the index of the last matched pattern
+		(:class:`int`).
+		"""
+		raise NotImplementedError((
+			f"{self.__class__.__module__}.{self.__class__.__qualname__}.match_file() "
+			f"must be implemented."
+		))  # NotImplementedError
@@ -7,8 +7,12 @@ replicate Git's handling.
 """
 from __future__ import annotations
 
+from bisect import (
+	bisect_right)
 from collections.abc import (
+	Collection,
 	Iterable,
+	Iterator,
 	Sequence)
 from typing import (
 	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
@@ -36,6 +40,9 @@ from pathspec._typing import (
 	AnyStr,  # Removed in 3.18.
 	override)  # Added in 3.12.
 from pathspec.util import (
+	CheckResult,
+	SourceCheckResult,
+	TAnyPath,
 	_is_iterable,
 	lookup_pattern)
 
@@ -53,6 +60,14 @@ class GitIgnoreSpec(PathSpec[GitIgnoreSpecPattern]):
 	replicate Git's handling.
 	"""
 
+	# A match by a file pattern takes precedence over a match by a directory
+	# pattern in an earlier layer.
+	_layer_backends = False
+
+	# A directory pattern can lose to an earlier file pattern, so the last matched
+	# literal is not the result.
+	_vectorize_literals = False
+
 	def __eq__(self, other: object) -> bool:
 		"""
 		Tests the equality of this gitignore-spec with *other* (:class:`.GitIgnoreSpec`)
@@ -170,3 +185,268 @@ class GitIgnoreSpec(PathSpec[GitIgnoreSpecPattern]):
 		Returns the backend (:class:`._Backend`).
 		"""
 		return make_gitignore_backend(name, patterns)
+
+
+class LayeredGitIgnoreSpec(GitIgnoreSpec):
+	"""
+	The :class:`LayeredGitIgnoreSpec` class extends :class:`.GitIgnoreSpec` to
+	combine the patterns from several named sources (e.g., "core.excludesFile",
+	".git/info/exclude", and ".gitignore") into a single backend. Each file is
+	checked once, and the check results contain the source and line of the
+	pattern that matched the file similar to ``git check-ignore -v``.
+	"""
+
+	def __init__(
+		self,
+		patterns: Union[Sequence[GitIgnoreSpecPattern], Iterable[GitIgnoreSpecPattern]],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+		_test_backend_factory: _TestBackendFactoryHint = None,
+	) -> None:
+		"""
+		Initializes the :class:`.LayeredGitIgnoreSpec` instance. The patterns do not
+		have a named source. Use :meth:`.LayeredGitIgnoreSpec.from_sources` to
+		compile the patterns from named sources.
+
+		*patterns* (:class:`~collections.abc.Sequence` or :class:`~collections.abc.Iterable`)
+		contains each compiled pattern (:class:`.GitIgnoreSpecPattern`).
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (regular expression)
+		matching backend to use. Default is :data:`None` for "best" to use the best
+		available backend.
+		"""
+		super().__init__(patterns, backend=backend, _test_backend_factory=_test_backend_factory)
+
+		self._sources: list[tuple[int, Optional[str], list[int]]] = [
+			(0, None, list(range(1, len(self.patterns) + 1))),
+		]
+		"""
+		*_sources* (:class:`list` of :class:`tuple`) contains each source in order
+		by the index of its first pattern. Each source contains:
+
+		-	*0* (:class:`int`) is the index of the first pattern.
+
+		-	*1* (:class:`str` or :data:`None`) is the name of the source.
+
+		-	*2* (:class:`list` of :class:`int`) contains the line number of each
+			pattern.
+		"""
+
+		self._source_starts: list[int] = [0]
+		"""
+		*_source_starts* (:class:`list` of :class:`int`) contains the index of the
+		first pattern of each source in :attr:`self._sources <.LayeredGitIgnoreSpec._sources>`.
+		This is used to look up the source of a pattern.
+		"""
+
+	@override
+	def __add__(self: Self, other: PathSpec) -> Self:
+		"""
+		Combines the :attr:`self.patterns <.PathSpec.patterns>` patterns from two
+		:class:`PathSpec` instances. The sources of both are kept.
+		"""
+		out_spec = super().__add__(other)
+		if out_spec is not NotImplemented:
+			out_spec._set_sources(_get_sources(self) + _get_sources(other, len(self.patterns)))  # type: ignore[attr-defined]
+
+		return out_spec
+
+	@override
+	def __iadd__(self: Self, other: PathSpec) -> Self:  # type: ignore[misc]
+		"""
+		Adds the :attr:`self.patterns <.PathSpec.patterns>` from *other*
+		(:class:`PathSpec`) to this instance. The sources of both are kept.
+		"""
+		sources = _get_sources(self) + _get_sources(other, len(self.patterns))
+		out_spec = super().__iadd__(other)
+		if out_spec is not NotImplemented:
+			out_spec._set_sources(sources)  # type: ignore[attr-defined]
+
+		return out_spec
+
+	@override
+	def check_file(
+		self,
+		file: TAnyPath,
+		separators: Optional[Collection[str]] = None,
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+	) -> SourceCheckResult[TAnyPath]:
+		"""
+		Check the files against this gitignore-spec.
+
+		*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+		path to be matched against :attr:`self.patterns <.PathSpec.patterns>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the file is
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the file is
+		matched as is. Default is :data:`None` for :data:`False`.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to also find every
+		matched pattern. See :meth:`.PathSpec.check_file`.
+
+		Returns the file check result (:class:`.SourceCheckResult`).
+		"""
+		return self._add_source(super().check_file(
+			file,
+			separators,
+			all_matches=all_matches,
+			assume_normalized=assume_normalized,
+		))
+
+	@override
+	def check_files(
+		self,
+		files: Iterable[TAnyPath],
+		separators: Optional[Collection[str]] = None,
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+		presorted: Optional[bool] = None,
+	) -> Iterator[SourceCheckResult[TAnyPath]]:
+		"""
+		Check the files against this gitignore-spec.
+
+		*files* (:class:`~collections.abc.Iterable` of :class:`str`, :class:`bytes`
+		or :class:`os.PathLike`) contains the file paths to be checked against
+		:attr:`self.patterns <.PathSpec.patterns>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). See :meth:`.PathSpec.check_files`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the files are
+		matched as is. Default is :data:`None` for :data:`False`.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to also find every
+		matched pattern of each file. See :meth:`.PathSpec.check_file`.
+
+		Returns an :class:`~collections.abc.Iterator` yielding each file check
+		result (:class:`.SourceCheckResult`).
+		"""
+		add_source = self._add_source
+		for result in super().check_files(
+			files,
+			separators,
+			all_matches=all_matches,
+			assume_normalized=assume_normalized,
+			presorted=presorted,
+		):
+			yield add_source(result)
+
+	@classmethod
+	def from_sources(
+		cls: type[Self],
+		sources: Iterable[tuple[str, Iterable[AnyStr]]],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+		_test_backend_factory: _TestBackendFactoryHint = None,
+	) -> Self:
+		"""
+		Compiles the pattern lines of each source into a single gitignore-spec.
+
+		*sources* (:class:`~collections.abc.Iterable` of :class:`tuple`) yields each
+		source in order of increasing precedence (e.g., "core.excludesFile",
+		".git/info/exclude", and then ".gitignore"). Each source contains its name
+		(:class:`str`), and its pattern lines (:class:`~collections.abc.Iterable`
+		of :class:`str`). A pattern in a later source takes precedence over a
+		pattern in an earlier source the same as a later line in the same source.
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (regular expression)
+		matching backend to use. Default is :data:`None` for "best" to use the best
+		available backend.
+
+		Returns the :class:`LayeredGitIgnoreSpec` instance.
+		"""
+		if not _is_iterable(sources):
+			raise TypeError(f"sources:{sources!r} is not an iterable.")
+
+		# Collect the lines of every source to compile them together.
+		source_lines: list[AnyStr] = []
+		spec_sources: list[tuple[int, Optional[str], list[int]]] = []
+		for name, lines in sources:
+			if not _is_iterable(lines):
+				raise TypeError(f"lines:{lines!r} for source {name!r} is not an iterable.")
+
+			line_nums: list[int] = []
+			spec_sources.append((len(source_lines), name, line_nums))
+			for line_num, line in enumerate(lines, 1):
+				if line:
+					source_lines.append(line)
+					line_nums.append(line_num)
+
+		# Every line is compiled into a pattern because empty lines were skipped.
+		patterns = GitIgnoreSpecPattern.compile_lines(source_lines)
+		self = cls(patterns, backend=backend, _test_backend_factory=_test_backend_factory)
+		self._set_sources(spec_sources)  # type: ignore[attr-defined]
+		return self
+
+	def _add_source(self, result: CheckResult[TAnyPath]) -> SourceCheckResult[TAnyPath]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Add the source of the matched pattern to the check result.
+
+		*result* (:class:`.CheckResult`) is the file check result.
+
+		Returns the file check result (:class:`.SourceCheckResult`).
+		"""
+		file, include, index, matches = (
+			result.file, result.include, result.index, result.matches,
+		)
+		if index is None:
+			return SourceCheckResult(file, include, index, None, None, matches)
+
+		start, name, line_nums = self._sources[
+			bisect_right(self._source_starts, index) - 1
+		]
+		return SourceCheckResult(
+			file, include, index, name, line_nums[index - start], matches,
+		)
+
+	def _set_sources(self, sources: list[tuple[int, Optional[str], list[int]]]) -> None:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Set the sources of the patterns.
+
+		*sources* (:class:`list` of :class:`tuple`) contains each source. See
+		:attr:`self._sources <.LayeredGitIgnoreSpec._sources>`.
+		"""
+		assert sum(len(__s[2]) for __s in sources) == len(self.patterns), (sources, self.patterns)
+		self._sources = sources
+		self._source_starts = [__s[0] for __s in sources]
+
+
+def _get_sources(
+	spec: PathSpec,
+	offset: int = 0,
+) -> list[tuple[int, Optional[str], list[int]]]:
+	"""
+	Get the sources of the patterns of the path-spec.
+
+	*spec* (:class:`.PathSpec`) is the path-spec.
+
+	*offset* (:class:`int`) is the index of the first pattern of the path-spec in
+	the combined patterns.
+
+	Returns the sources (:class:`list` of :class:`tuple`). See
+	:attr:`.LayeredGitIgnoreSpec._sources`.
+	"""
+	if isinstance(spec, LayeredGitIgnoreSpec):
+		return [(offset + __start, __name, __lines) for __start, __name, __lines in spec._sources]
+	else:
+		return [(offset, None, list(range(1, len(spec.patterns) + 1)))]
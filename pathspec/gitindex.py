@@ -0,0 +1,426 @@
+"""
+This module provides a reader for the Git index file (e.g., *.git/index*) to
+list the tracked files of a repository without walking the file-system.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import stat
+import struct
+from collections.abc import (
+	Iterator)
+from typing import (
+	Literal,
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union,  # Replaced by `X | Y` in 3.10.
+	overload)
+
+from .util import (
+	BytesPath,
+	StrPath)
+
+GitObjectFormatHint = Literal['sha1', 'sha256']
+"""
+The type hint for the object format (hash algorithm) of a Git repository.
+"""
+
+_HASH_SIZES: dict[str, int] = {'sha1': 20, 'sha256': 32}
+"""
+Maps the object format (:class:`str`) to the size of its object ids in bytes
+(:class:`int`).
+"""
+
+_HEADER = struct.Struct('>4sLL')
+"""
+The header of the index file: the signature, version, and number of entries.
+"""
+
+_INDEX_SIGNATURE = b'DIRC'
+"""
+The signature at the start of the index file.
+"""
+
+_INDEX_VERSIONS = (2, 3, 4)
+"""
+The supported versions of the index file.
+"""
+
+_FLAG_EXTENDED = 0x4000
+"""
+The entry flag indicating the entry has additional flags (version 3 or later).
+"""
+
+_FLAG_STAGE_MASK = 0x3000
+"""
+The mask of the entry flags containing the merge stage.
+"""
+
+_MODE_GITLINK = 0o160000
+"""
+The mode of a gitlink (submodule) entry.
+"""
+
+
+class GitIndexError(ValueError):
+	"""
+	The :class:`GitIndexError` class indicates an invalid or unsupported Git
+	index file.
+	"""
+	pass
+
+
+class GitIndexEntry(object):
+	"""
+	The :class:`GitIndexEntry` class contains information about an entry in a Git
+	index file. It can be used in place of a :class:`.TreeEntry` with
+	:meth:`.PathSpec.match_entries`.
+	"""
+
+	# Make the class dict-less.
+	__slots__ = ('mode', 'mtime_ns', 'name', 'path', 'size', 'stage')
+
+	def __init__(
+		self,
+		path: Union[str, bytes],
+		mode: int,
+		size: int,
+		mtime_ns: int,
+		stage: int,
+	) -> None:
+		"""
+		Initialize the :class:`GitIndexEntry` instance.
+
+		*path* (:class:`str` or :class:`bytes`) is the path of the entry relative to
+		the root of the repository.
+
+		*mode* (:class:`int`) is the file mode of the entry.
+
+		*size* (:class:`int`) is the file size truncated to 32 bits.
+
+		*mtime_ns* (:class:`int`) is the modification time in nanoseconds.
+
+		*stage* (:class:`int`) is the merge stage of the entry.
+		"""
+
+		self.mode: int = mode
+		"""
+		*mode* (:class:`int`) is the file mode of the entry (e.g., ``0o100644``).
+		"""
+
+		self.mtime_ns: int = mtime_ns
+		"""
+		*mtime_ns* (:class:`int`) is the modification time of the file in
+		nanoseconds when it was last staged.
+		"""
+
+		name: Union[str, bytes]
+		if isinstance(path, bytes):
+			name = path[path.rfind(b'/') + 1:]
+		else:
+			name = path[path.rfind('/') + 1:]
+
+		self.name: Union[str, bytes] = name
+		"""
+		*name* (:class:`str` or :class:`bytes`) is the base name of the entry.
+		"""
+
+		self.path: Union[str, bytes] = path
+		"""
+		*path* (:class:`str` or :class:`bytes`) is the path of the entry relative to
+		the root of the repository. This is :class:`bytes` when the index was read
+		with a :class:`bytes` path.
+		"""
+
+		self.size: int = size
+		"""
+		*size* (:class:`int`) is the size of the file truncated to 32 bits when it
+		was last staged.
+		"""
+
+		self.stage: int = stage
+		"""
+		*stage* (:class:`int`) is the merge stage of the entry. This is ``0`` for a
+		normal entry, and ``1`` to ``3`` for the versions of a conflicted file.
+		"""
+
+	def __repr__(self) -> str:
+		"""
+		Returns the string representation (:class:`str`).
+		"""
+		return (
+			f"{self.__class__.__name__}(path={self.path!r}, mode={self.mode:#o}, "
+			f"size={self.size!r}, mtime_ns={self.mtime_ns!r}, stage={self.stage!r})"
+		)
+
+	def is_dir(self, follow_links: Optional[bool] = None) -> bool:
+		"""
+		Get whether the entry is a directory. This is a sparse directory of a sparse
+		index, or a submodule.
+
+		*follow_links* (:class:`bool` or :data:`None`) is ignored. It is only
+		accepted for compatibility with :meth:`.TreeEntry.is_dir`.
+
+		Returns whether the entry is a directory (:class:`bool`).
+		"""
+		return stat.S_ISDIR(self.mode) or self.mode == _MODE_GITLINK
+
+	def is_file(self, follow_links: Optional[bool] = None) -> bool:
+		"""
+		Get whether the entry is a regular file.
+
+		*follow_links* (:class:`bool` or :data:`None`) is ignored. It is only
+		accepted for compatibility with :meth:`.TreeEntry.is_file`.
+
+		Returns whether the entry is a regular file (:class:`bool`).
+		"""
+		return stat.S_ISREG(self.mode)
+
+	def is_symlink(self) -> bool:
+		"""
+		Returns whether the entry is a symbolic link (:class:`bool`).
+		"""
+		return stat.S_ISLNK(self.mode)
+
+	@property
+	def mtime(self) -> float:
+		"""
+		*mtime* (:class:`float`) is the modification time of the file in seconds.
+		"""
+		return self.mtime_ns / 1e9
+
+
+@overload
+def iter_index_entries(
+	index_file: StrPath,
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[GitIndexEntry]:
+	...
+
+
+@overload
+def iter_index_entries(
+	index_file: BytesPath,
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[GitIndexEntry]:
+	...
+
+
+def iter_index_entries(
+	index_file: Union[StrPath, BytesPath],
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[GitIndexEntry]:
+	"""
+	Read the entries of the Git index file. The file is memory-mapped, and the
+	entries are parsed as they are iterated. Versions 2 to 4 are supported,
+	including the path prefix compression of version 4. The extensions and
+	checksum at the end of the file are not read.
+
+	*index_file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+	path to the index file (e.g., *.git/index*). If this is :class:`bytes`, the
+	entry paths are :class:`bytes`. Otherwise, they are decoded with
+	:func:`os.fsdecode`.
+
+	*object_format* (:class:`str` or :data:`None`) is the object format of the
+	repository: "sha1" or "sha256". Default is :data:`None` for "sha1".
+
+	Raises :exc:`.GitIndexError` if the index file is invalid or unsupported.
+
+	Returns an :class:`~collections.abc.Iterator` yielding each entry
+	(:class:`.GitIndexEntry`) in index order (sorted by path, then stage).
+	"""
+	if object_format is None:
+		object_format = 'sha1'
+
+	hash_size = _HASH_SIZES.get(object_format)
+	if hash_size is None:
+		raise ValueError(f"{object_format=!r} is not supported.")
+
+	decode_path = None if isinstance(os.fspath(index_file), bytes) else os.fsdecode
+	with open(index_file, 'rb') as fh:
+		try:
+			buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError as e:
+			# An empty file cannot be memory-mapped.
+			raise GitIndexError(f"Index file {index_file!r} is empty.") from e
+
+	with buf:
+		for path, mode, size, mtime_ns, stage in _iter_index_buffer(buf, hash_size):
+			yield GitIndexEntry(
+				decode_path(path) if decode_path is not None else path,
+				mode,
+				size,
+				mtime_ns,
+				stage,
+			)
+
+
+@overload
+def iter_index_files(
+	index_file: StrPath,
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[str]:
+	...
+
+
+@overload
+def iter_index_files(
+	index_file: BytesPath,
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[bytes]:
+	...
+
+
+@overload
+def iter_index_files(
+	index_file: Union[StrPath, BytesPath],
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[Union[str, bytes]]:
+	...
+
+
+def iter_index_files(
+	index_file: Union[StrPath, BytesPath],
+	object_format: Optional[GitObjectFormatHint] = None,
+) -> Iterator[Union[str, bytes]]:
+	"""
+	Read the tracked files of the Git index file. A conflicted file is only
+	yielded once. The sparse directories of a sparse index are skipped.
+
+	*index_file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+	path to the index file. See :func:`.iter_index_entries`.
+
+	*object_format* (:class:`str` or :data:`None`) is the object format of the
+	repository. See :func:`.iter_index_entries`.
+
+	Raises :exc:`.GitIndexError` if the index file is invalid or unsupported.
+
+	Returns an :class:`~collections.abc.Iterator` yielding the path of each file
+	(:class:`str` or :class:`bytes`) relative to the root of the repository. The
+	paths are normalized and sorted.
+	"""
+	prev_path: Optional[Union[str, bytes]] = None
+	for entry in iter_index_entries(index_file, object_format):
+		path = entry.path
+		if path == prev_path or stat.S_ISDIR(entry.mode):
+			# Skip the other stages of a conflicted file, and sparse directories.
+			continue
+
+		prev_path = path
+		yield path
+
+
+def _iter_index_buffer(
+	buf: mmap.mmap,
+	hash_size: int,
+) -> Iterator[tuple[bytes, int, int, int, int]]:
+	"""
+	Parse the entries of the Git index file.
+
+	*buf* (:class:`mmap.mmap`) is the memory-mapped index file.
+
+	*hash_size* (:class:`int`) is the size of the object ids in bytes.
+
+	Returns an :class:`~collections.abc.Iterator` yielding a :class:`tuple` for
+	each entry containing the path (:class:`bytes`), mode (:class:`int`), size
+	(:class:`int`), modification time in nanoseconds (:class:`int`), and merge
+	stage (:class:`int`).
+	"""
+	try:
+		signature, version, count = _HEADER.unpack_from(buf, 0)
+	except struct.error as e:
+		raise GitIndexError("Index file is truncated.") from e
+
+	if signature != _INDEX_SIGNATURE:
+		raise GitIndexError(f"Index file has invalid {signature=!r}.")
+	elif version not in _INDEX_VERSIONS:
+		raise GitIndexError(f"Index file {version=!r} is not supported.")
+
+	# The entry contains the ctime and mtime (seconds and nanoseconds), dev, ino,
+	# mode, uid, gid, size, object id, and flags.
+	entry_struct = struct.Struct(f'>4L8xL8xL{hash_size}xH')
+	unpack_entry = entry_struct.unpack_from
+	entry_size = entry_struct.size
+	buf_find = buf.find
+	buf_len = len(buf)
+	is_v4 = version == 4
+
+	pos = _HEADER.size
+	prev_path = b''
+	for _ in range(count):
+		start = pos
+		try:
+			_ctime_s, _ctime_ns, mtime_s, mtime_ns, mode, size, flags = unpack_entry(buf, pos)
+		except struct.error as e:
+			raise GitIndexError(f"Index entry at {start} is truncated.") from e
+
+		pos += entry_size
+		if flags & _FLAG_EXTENDED:
+			if version < 3:
+				raise GitIndexError(f"Index entry at {start} has extended flags in {version=!r}.")
+
+			pos += 2
+
+		if is_v4:
+			# The path is the previous path with some bytes removed from its end,
+			# followed by the NUL-terminated suffix.
+			strip_len, pos = _read_offset(buf, pos, buf_len)
+			if strip_len > len(prev_path):
+				raise GitIndexError(f"Index entry at {start} has invalid {strip_len=!r}.")
+
+			end = buf_find(b'\0', pos)
+			if end == -1:
+				raise GitIndexError(f"Index entry at {start} is truncated.")
+
+			path = prev_path[:len(prev_path) - strip_len] + buf[pos:end]
+			pos = end + 1
+
+		else:
+			# The path is NUL-terminated, and padded with 1 to 8 NULs so the entry
+			# length is a multiple of 8.
+			end = buf_find(b'\0', pos)
+			if end == -1:
+				raise GitIndexError(f"Index entry at {start} is truncated.")
+
+			path = buf[pos:end]
+			pos = start + ((end - start + 8) & ~7)
+
+		prev_path = path
+		yield (
+			path,
+			mode,
+			size,
+			mtime_s * 1_000_000_000 + mtime_ns,
+			(flags & _FLAG_STAGE_MASK) >> 12,
+		)
+
+
+def _read_offset(buf: mmap.mmap, pos: int, buf_len: int) -> tuple[int, int]:
+	"""
+	Read the variable-length integer used by Git for offsets.
+
+	*buf* (:class:`mmap.mmap`) is the memory-mapped index file.
+
+	*pos* (:class:`int`) is the position of the integer.
+
+	*buf_len* (:class:`int`) is the length of *buf*.
+
+	Returns a :class:`tuple` containing the integer (:class:`int`), and the
+	position after it (:class:`int`).
+	"""
+	if pos >= buf_len:
+		raise GitIndexError(f"Index offset at {pos} is truncated.")
+
+	byte = buf[pos]
+	pos += 1
+	value = byte & 0x7F
+	while byte & 0x80:
+		if pos >= buf_len:
+			raise GitIndexError(f"Index offset at {pos} is truncated.")
+
+		# Each continuation adds one so that every value has a single encoding.
+		byte = buf[pos]
+		pos += 1
+		value = ((value + 1) << 7) | (byte & 0x7F)
+
+	return (value, pos)
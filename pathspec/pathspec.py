@@ -4,6 +4,10 @@ for pattern matching of files.
 """
 from __future__ import annotations
 
+import hashlib
+import os
+from array import (
+	array)
 from collections.abc import (
 	Collection,
 	Iterable,
@@ -12,6 +16,7 @@ from collections.abc import (
 from itertools import (
 	zip_longest)
 from typing import (
+	Any,
 	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
 	Generic,
 	Literal,
@@ -27,27 +32,48 @@ Self = TypeVar("Self", bound='PathSpec')
 recommendation.
 """
 
-from pathspec import util
+_INCLUDE_CODES: dict[Optional[bool], int] = {None: -1, False: 0, True: 1}
+"""
+Maps a check result include (:class:`bool` or :data:`None`) to its code
+(:class:`int`) in the include array of :meth:`.PathSpec.check_files_columnar`.
+"""
+
+from pathspec import (
+	_numpy,
+	gitindex,
+	util)
 from pathspec.backend import (
 	BackendNamesHint,
 	_Backend,
+	_MatchBytesFileHint,
 	_TestBackendFactoryHint)
 from pathspec._backends.agg import (
 	make_pathspec_backend)
+from pathspec._backends.layered import (
+	LayeredPsBackend)
 from pathspec.pattern import (
-	Pattern)
+	Pattern,
+	RegexPattern)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
 from pathspec.patterns.gitignore.basic import (
 	GitIgnoreBasicPattern)
+from pathspec.gitindex import (
+	GitIndexEntry,
+	GitObjectFormatHint)
 from pathspec._typing import (
 	AnyStr,  # Removed in 3.18.
 	deprecated)  # Added in 3.13.
 from pathspec.util import (
+	BytesPath,
 	CheckResult,
+	MatchDetail,
 	StrPath,
+	TAnyPath,
 	TPattern,
 	TPattern_co,
-	TStrPath,
 	TreeEntry,
+	_TREE_FILES_NORMALIZED,
 	_is_iterable,
 	normalize_file)
 
@@ -58,6 +84,20 @@ class PathSpec(Generic[TPattern_co]):
 	:class:`.Pattern` instances.
 	"""
 
+	_layer_backends: bool = True
+	"""
+	*_layer_backends* (:class:`bool`) is whether combined path-specs reuse the
+	backends of their parts as layers (see :meth:`._make_combined_backend`). The
+	last matched pattern must not depend on the patterns in other layers.
+	"""
+
+	_vectorize_literals: bool = True
+	"""
+	*_vectorize_literals* (:class:`bool`) is whether :meth:`.match_array` matches
+	the trailing literal patterns with vectorized string operations. The last
+	matched pattern must be the result.
+	"""
+
 	def __init__(
 		self,
 		patterns: Union[Sequence[TPattern_co], Iterable[TPattern_co]],
@@ -120,7 +160,13 @@ class PathSpec(Generic[TPattern_co]):
 		:class:`PathSpec` instances.
 		"""
 		if isinstance(other, PathSpec):
-			return self.__class__([*self.patterns, *other.patterns], backend=self._backend_name)
+			patterns = [*self.patterns, *other.patterns]
+			backend = self._make_combined_backend(other, patterns)
+			return self.__class__(
+				patterns,
+				backend=self._backend_name,
+				_test_backend_factory=lambda _patterns: backend,
+			)
 		else:
 			return NotImplemented
 
@@ -130,6 +176,14 @@ class PathSpec(Generic[TPattern_co]):
 		comparing their :attr:`self.patterns <.PathSpec.patterns>` attributes.
 		"""
 		if isinstance(other, PathSpec):
+			if len(self.patterns) != len(other.patterns):
+				return False
+
+			self_fingerprint = self._get_fingerprint()
+			other_fingerprint = other._get_fingerprint()
+			if self_fingerprint is not None and other_fingerprint is not None:
+				return self_fingerprint == other_fingerprint
+
 			paired_patterns = zip_longest(self.patterns, other.patterns)
 			return all(a == b for a, b in paired_patterns)
 		else:
@@ -141,8 +195,9 @@ class PathSpec(Generic[TPattern_co]):
 		(:class:`PathSpec`) to this instance.
 		"""
 		if isinstance(other, PathSpec):
-			self.patterns = [*self.patterns, *other.patterns]
-			self._backend = self._make_backend(self._backend_name, self.patterns)
+			patterns = [*self.patterns, *other.patterns]
+			self._backend = self._make_combined_backend(other, patterns)
+			self.patterns = patterns
 			return self
 		else:
 			return NotImplemented
@@ -154,66 +209,428 @@ class PathSpec(Generic[TPattern_co]):
 		"""
 		return len(self.patterns)
 
+	def _make_combined_backend(
+		self,
+		other: PathSpec,
+		patterns: Sequence[Pattern],
+	) -> _Backend:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Create the backend for the patterns of this path-spec combined with the
+		patterns of *other*. The compiled backends are reused as layers when
+		possible. The backend of *other* is only recompiled when it uses a
+		different backend. The layers are merged into a single backend when there
+		are too many of them.
+
+		*other* (:class:`PathSpec`) is the path-spec being added.
+
+		*patterns* (:class:`~collections.abc.Sequence` of :class:`.Pattern`)
+		contains the combined patterns.
+
+		Returns the backend (:class:`._Backend`).
+		"""
+		make_backend = self._make_backend
+		name = self._backend_name
+		if not self._layer_backends or other.__class__ is not self.__class__:
+			# The combined patterns must be matched together.
+			return make_backend(name, patterns)
+
+		other_backend = other._backend
+		if other._backend_name != name:
+			# Only compile the added patterns.
+			other_backend = make_backend(name, other.patterns)
+
+		return LayeredPsBackend.combine(
+			(self._backend, len(self.patterns)),
+			(other_backend, len(other.patterns)),
+			lambda: make_backend(name, patterns),
+		)
+
+	def _get_fingerprint(self) -> Optional[bytes]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the fingerprint of the contents of :attr:`self.patterns <.PathSpec.patterns>`.
+		The fingerprint is not cached because the patterns can be changed in place.
+
+		Returns the fingerprint (:class:`bytes`), or :data:`None` if a pattern's
+		contents are unknown (e.g., it is not a :class:`.RegexPattern`).
+		"""
+		fingerprint: Optional[bytes]
+		hasher = hashlib.blake2b(digest_size=16)
+		for pattern in self.patterns:
+			regex_key = None
+			if isinstance(pattern, RegexPattern):
+				# Hash the same attributes compared by `RegexPattern.__eq__()`.
+				regex_key = pattern._get_regex_key()
+
+			if regex_key is None:
+				fingerprint = None
+				break
+
+			raw_regex, flags = regex_key
+			if raw_regex is None:
+				hasher.update(f'{pattern.include!r}:-:-:'.encode('utf8'))
+			else:
+				if isinstance(raw_regex, str):
+					regex_bytes = raw_regex.encode('utf8', 'surrogatepass')
+				else:
+					regex_bytes = raw_regex
+
+				hasher.update((
+					f'{pattern.include!r}:{type(raw_regex).__name__}:{flags}:'
+					f'{len(regex_bytes)}:'
+				).encode('utf8'))
+				hasher.update(regex_bytes)
+
+		else:
+			fingerprint = hasher.digest()
+
+		return fingerprint
+
 	def check_file(
 		self,
-		file: TStrPath,
+		file: TAnyPath,
 		separators: Optional[Collection[str]] = None,
-	) -> CheckResult[TStrPath]:
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+	) -> CheckResult[TAnyPath]:
 		"""
 		Check the files against this path-spec.
 
-		*file* (:class:`str` or :class:`os.PathLike`) is the file path to be matched
-		against :attr:`self.patterns <.PathSpec.patterns>`.
+		*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+		path to be matched against :attr:`self.patterns <.PathSpec.patterns>`.
 
 		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
 		:data:`None`) optionally contains the path separators to normalize. See
 		:func:`.normalize_file` for more information.
 
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the file is
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the file is
+		matched as is. Default is :data:`None` for :data:`False`.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to also find every
+		matched pattern, and store their indices in :attr:`.CheckResult.matches`
+		as a bitset. Default is :data:`None` for :data:`False`.
+
 		Returns the file check result (:class:`.CheckResult`).
 		"""
-		norm_file = normalize_file(file, separators)
-		include, index = self._backend.match_file(norm_file)
-		return CheckResult(file, include, index)
+		norm_file: Union[str, bytes]
+		if assume_normalized:
+			norm_file = file  # type: ignore[assignment]
+		else:
+			norm_file = normalize_file(file, separators)
+
+		matches: Optional[int] = None
+		if all_matches:
+			if isinstance(norm_file, str):
+				include, index, matches = self._backend.match_file_all(norm_file)
+			else:
+				include, index, matches = self._backend.match_bytes_file_all(norm_file)
+
+		elif isinstance(norm_file, str):
+			include, index = self._backend.match_file(norm_file)
+		else:
+			include, index = self._backend.match_bytes_file(norm_file)
+
+		return CheckResult(file, include, index, matches)
 
 	def check_files(
 		self,
-		files: Iterable[TStrPath],
+		files: Iterable[TAnyPath],
 		separators: Optional[Collection[str]] = None,
-	) -> Iterator[CheckResult[TStrPath]]:
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+		presorted: Optional[bool] = None,
+	) -> Iterator[CheckResult[TAnyPath]]:
 		"""
 		Check the files against this path-spec.
 
-		*files* (:class:`~collections.abc.Iterable` of :class:`str` or
-		:class:`os.PathLike`) contains the file paths to be checked against
-		:attr:`self.patterns <.PathSpec.patterns>`.
+		*files* (:class:`~collections.abc.Iterable` of :class:`str`, :class:`bytes`
+		or :class:`os.PathLike`) contains the file paths to be checked against
+		:attr:`self.patterns <.PathSpec.patterns>`. The :class:`bytes` paths are
+		matched without decoding them when the backend supports it.
 
 		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
 		:data:`None`) optionally contains the path separators to normalize. See
 		:func:`.normalize_file` for more information.
 
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous file are memoized which bounds memory use.
+		Default is :data:`None` for :data:`False`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the files are
+		matched as is. Default is :data:`None` for :data:`False`.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to also find every
+		matched pattern of each file. See :meth:`.PathSpec.check_file`.
+
 		Returns an :class:`~collections.abc.Iterator` yielding each file check
 		result (:class:`.CheckResult`).
 		"""
 		if not _is_iterable(files):
 			raise TypeError(f"files:{files!r} is not an iterable.")
 
+		backend = self._backend
+		norm_file: Union[str, bytes]
+		if all_matches:
+			# The batch matchers only find the last matched pattern.
+			match_file_all = backend.match_file_all
+			match_bytes_file_all = backend.match_bytes_file_all
+			for orig_file in files:
+				if assume_normalized:
+					norm_file = orig_file  # type: ignore[assignment]
+				else:
+					norm_file = normalize_file(orig_file, separators)
+
+				if isinstance(norm_file, str):
+					include, index, matches = match_file_all(norm_file)
+				else:
+					include, index, matches = match_bytes_file_all(norm_file)
+
+				yield CheckResult(orig_file, include, index, matches)
+
+			return
+
+		match_file = backend.make_batch_matcher(presorted=presorted)
+		match_bytes_file: Optional[_MatchBytesFileHint] = None
 		for orig_file in files:
-			norm_file = normalize_file(orig_file, separators)
-			include, index = self._backend.match_file(norm_file)
+			if assume_normalized:
+				norm_file = orig_file  # type: ignore[assignment]
+			else:
+				norm_file = normalize_file(orig_file, separators)
+
+			if isinstance(norm_file, str):
+				include, index = match_file(norm_file)
+			else:
+				if match_bytes_file is None:
+					match_bytes_file = backend.make_bytes_matcher(presorted=presorted)
+
+				include, index = match_bytes_file(norm_file)
+
 			yield CheckResult(orig_file, include, index)
 
+	def check_files_columnar(
+		self,
+		files: Collection[Union[StrPath, BytesPath]],
+		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
+		out: Optional[tuple[array, array]] = None,
+		presorted: Optional[bool] = None,
+	) -> tuple[array, array]:
+		"""
+		Check the files against this path-spec, and store the results in arrays
+		instead of creating a check result for each file.
+
+		*files* (:class:`~collections.abc.Collection` of :class:`str`,
+		:class:`bytes` or :class:`os.PathLike`) contains the file paths to be
+		checked against :attr:`self.patterns <.PathSpec.patterns>`. The results are
+		stored in the iteration order of *files*.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized. See :meth:`.PathSpec.check_files`.
+
+		*out* (:class:`tuple` or :data:`None`) optionally contains the include and
+		index arrays (:class:`array.array`) to store the results in. They are
+		resized to the number of files. Default is :data:`None` to create new
+		arrays.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). See :meth:`.PathSpec.check_files`.
+
+		Returns a :class:`tuple` containing:
+
+		-	The include of each file (:class:`array.array` of type ``"b"``). This is
+			``1`` if the file is included, ``0`` if excluded, and ``-1`` if no pattern
+			matched.
+
+		-	The index of the last matched pattern of each file (:class:`array.array`
+			of type ``"i"``). This is ``-1`` if no pattern matched.
+		"""
+		if not _is_iterable(files):
+			raise TypeError(f"files:{files!r} is not an iterable.")
+
+		file_count = len(files)
+		if out is None:
+			includes = array('b', [-1]) * file_count
+			indices = array('i', [-1]) * file_count
+		else:
+			includes, indices = out
+			if includes.typecode != 'b' or indices.typecode != 'i':
+				raise TypeError((
+					f"out:{out!r} must contain an array of type 'b' and an array of type "
+					f"'i'."
+				))
+
+			# Resize the arrays to the number of files.
+			for out_array in (includes, indices):
+				out_count = len(out_array)
+				if out_count > file_count:
+					del out_array[file_count:]
+				elif out_count < file_count:
+					out_array.extend(array(out_array.typecode, [-1]) * (file_count - out_count))
+
+		backend = self._backend
+		include_codes = _INCLUDE_CODES
+		match_file = backend.make_batch_matcher(presorted=presorted)
+		match_bytes_file: Optional[_MatchBytesFileHint] = None
+		norm_file: Union[str, bytes]
+		for i, orig_file in enumerate(files):
+			if assume_normalized:
+				norm_file = orig_file  # type: ignore[assignment]
+			else:
+				norm_file = normalize_file(orig_file, separators)
+
+			if isinstance(norm_file, str):
+				include, index = match_file(norm_file)
+			else:
+				if match_bytes_file is None:
+					match_bytes_file = backend.make_bytes_matcher(presorted=presorted)
+
+				include, index = match_bytes_file(norm_file)
+
+			includes[i] = include_codes[include]
+			indices[i] = -1 if index is None else index
+
+		return (includes, indices)
+
+	@overload
+	def check_index_files(
+		self,
+		index_file: StrPath,
+		object_format: Optional[GitObjectFormatHint] = None,
+	) -> Iterator[CheckResult[str]]:
+		...
+
+	@overload
+	def check_index_files(
+		self,
+		index_file: BytesPath,
+		object_format: Optional[GitObjectFormatHint] = None,
+	) -> Iterator[CheckResult[bytes]]:
+		...
+
+	def check_index_files(
+		self,
+		index_file: Union[StrPath, BytesPath],
+		object_format: Optional[GitObjectFormatHint] = None,
+	) -> Iterator[Union[CheckResult[str], CheckResult[bytes]]]:
+		"""
+		Reads the tracked files from the Git index file and checks them against
+		this path-spec. The file-system is not walked.
+
+		*index_file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+		path to the index file (e.g., *.git/index*). If *index_file* is
+		:class:`bytes`, the file paths are :class:`bytes` (see
+		:func:`.iter_index_files`).
+
+		*object_format* (:class:`str` or :data:`None`) is the object format of the
+		repository: "sha1" or "sha256". Default is :data:`None` for "sha1".
+
+		Raises :exc:`.GitIndexError` if the index file is invalid or unsupported.
+
+		Returns an :class:`~collections.abc.Iterator` yielding each file check
+		result (:class:`.CheckResult`).
+		"""
+		# Read str and bytes paths separately so each result has a single path type.
+		index_path = os.fspath(index_file)
+		if isinstance(index_path, bytes):
+			bytes_files = gitindex.iter_index_files(index_path, object_format)
+			yield from self.check_files(bytes_files, assume_normalized=True, presorted=True)
+		else:
+			str_files = gitindex.iter_index_files(index_path, object_format)
+			yield from self.check_files(str_files, assume_normalized=True, presorted=True)
+
+	def check_path_list(
+		self,
+		path_list: Union[StrPath, BytesPath],
+		delimiter: Optional[bytes] = None,
+		separators: Optional[Collection[str]] = None,
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+	) -> Iterator[CheckResult[bytes]]:
+		"""
+		Reads the paths from a file containing a list of delimited paths (e.g., the
+		output of ``git ls-files -z``), and checks them against this path-spec. The
+		file is memory-mapped and read a chunk at a time (see
+		:func:`.iter_path_list`).
+
+		*path_list* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+		path to the file.
+
+		*delimiter* (:class:`bytes` or :data:`None`) is the single byte separating
+		the paths. Default is :data:`None` for ``b"\\0"``.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to find every
+		matched pattern (see :meth:`.PathSpec.check_file`). Default is :data:`None`
+		for :data:`False`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the paths are
+		already normalized (see :func:`.normalize_file`). Default is :data:`None`
+		for :data:`False`.
+
+		Returns an :class:`~collections.abc.Iterator` yielding each file check
+		result (:class:`.CheckResult`). The files are :class:`bytes`.
+		"""
+		files = (__file for _offset, __file in util.iter_path_list(path_list, delimiter))
+		yield from self.check_files(
+			files,
+			separators,
+			all_matches=all_matches,
+			assume_normalized=assume_normalized,
+			presorted=True,
+		)
+
+	@overload
 	def check_tree_files(
 		self,
 		root: StrPath,
 		on_error: Optional[Callable[[OSError], None]] = None,
 		follow_links: Optional[bool] = None,
 	) -> Iterator[CheckResult[str]]:
+		...
+
+	@overload
+	def check_tree_files(
+		self,
+		root: BytesPath,
+		on_error: Optional[Callable[[OSError], None]] = None,
+		follow_links: Optional[bool] = None,
+	) -> Iterator[CheckResult[bytes]]:
+		...
+
+	def check_tree_files(
+		self,
+		root: Union[StrPath, BytesPath],
+		on_error: Optional[Callable[[OSError], None]] = None,
+		follow_links: Optional[bool] = None,
+	) -> Iterator[Union[CheckResult[str], CheckResult[bytes]]]:
 		"""
 		Walks the specified root path for all files and checks them against this
 		path-spec.
 
-		*root* (:class:`str` or :class:`os.PathLike`) is the root directory to
-		search for files.
+		*root* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the root
+		directory to search for files. If *root* is :class:`bytes`, the file paths
+		are :class:`bytes` (see :func:`.iter_tree_files`).
 
 		*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally
 		is the error handler for file-system exceptions. It will be called with the
@@ -232,8 +649,96 @@ class PathSpec(Generic[TPattern_co]):
 		Returns an :class:`~collections.abc.Iterator` yielding each file check
 		result (:class:`.CheckResult`).
 		"""
-		files = util.iter_tree_files(root, on_error=on_error, follow_links=follow_links)
-		yield from self.check_files(files)
+		# Walk str and bytes roots separately so each result has a single path type.
+		root_path = os.fspath(root)
+		if isinstance(root_path, bytes):
+			bytes_files = util.iter_tree_files(
+				root_path, on_error=on_error, follow_links=follow_links,
+			)
+			yield from self.check_files(
+				bytes_files, assume_normalized=_TREE_FILES_NORMALIZED, presorted=True,
+			)
+		else:
+			str_files = util.iter_tree_files(
+				root_path, on_error=on_error, follow_links=follow_links,
+			)
+			yield from self.check_files(
+				str_files, assume_normalized=_TREE_FILES_NORMALIZED, presorted=True,
+			)
+
+	def detailed_match_files(
+		self,
+		files: Iterable[TAnyPath],
+		separators: Optional[Collection[str]] = None,
+		*,
+		all_matches: Optional[bool] = None,
+		assume_normalized: Optional[bool] = None,
+		presorted: Optional[bool] = None,
+	) -> Iterator[tuple[TAnyPath, MatchDetail]]:
+		"""
+		Matches the files to this path-spec, and yields which patterns matched each
+		included file. This replaces :func:`.util.detailed_match_files` using the
+		backend of this path-spec.
+
+		*files* (:class:`~collections.abc.Iterable` of :class:`str`, :class:`bytes`
+		or :class:`os.PathLike`) contains the file paths to be matched against
+		:attr:`self.patterns <.PathSpec.patterns>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*all_matches* (:class:`bool` or :data:`None`) is whether to return every
+		matched include pattern since the last matched exclude pattern
+		(:data:`True`), or only the last matched pattern (:data:`False`). Default
+		is :data:`None` for :data:`False`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized. See :meth:`.PathSpec.check_files`.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). See :meth:`.PathSpec.check_files`.
+
+		Returns an :class:`~collections.abc.Iterator` yielding a :class:`tuple`
+		for each included file containing the file (:class:`str`, :class:`bytes` or
+		:class:`os.PathLike`), and the patterns that matched it in order
+		(:class:`.MatchDetail`). Use :class:`dict` on the iterator for the same
+		result as :func:`.util.detailed_match_files`.
+		"""
+		patterns = self.patterns
+		for result in self.check_files(
+			files,
+			separators,
+			all_matches=all_matches,
+			assume_normalized=assume_normalized,
+			presorted=presorted,
+		):
+			if not result.include:
+				continue
+
+			index = result.index
+			assert index is not None, result
+
+			matches = result.matches
+			if matches is None:
+				yield (result.file, MatchDetail([patterns[index]]))
+				continue
+
+			# Collect the include patterns after the last exclude pattern, up to the
+			# last matched pattern.
+			detail_patterns: list[Pattern] = []
+			matches &= (2 << index) - 1
+			while matches:
+				low_bit = matches & -matches
+				pattern = patterns[low_bit.bit_length() - 1]
+				if pattern.include:
+					detail_patterns.append(pattern)
+				else:
+					detail_patterns.clear()
+
+				matches ^= low_bit
+
+			yield (result.file, MatchDetail(detail_patterns))
 
 	@overload
 	@classmethod
@@ -314,19 +819,42 @@ class PathSpec(Generic[TPattern_co]):
 		"""
 		use_factory: Callable[[AnyStr], Pattern]
 		if isinstance(pattern_factory, str):
-			use_factory = util.lookup_pattern(pattern_factory)  # type: ignore[assignment]
+			use_factory = util.lookup_pattern(pattern_factory)
 		elif callable(pattern_factory):
-			use_factory = pattern_factory  # type: ignore[assignment]
+			# A pattern class is used as a factory accepting the line.
+			use_factory = cast(Callable[[AnyStr], Pattern], pattern_factory)
 		else:
 			raise TypeError(f"pattern_factory:{pattern_factory!r} is not callable.")
 
 		if not _is_iterable(lines):
 			raise TypeError(f"lines:{lines!r} is not an iterable.")
 
-		patterns = [use_factory(__line) for __line in lines if __line]  # type: ignore[arg-type]
+		# Check the class of the factory through another name so the type of
+		# `use_factory` is not narrowed.
+		factory_cls: object = use_factory
+		patterns: Sequence[Pattern]
+		if isinstance(factory_cls, type) and issubclass(factory_cls, _GitIgnoreBasePattern):
+			# Compile gitignore patterns in bulk.
+			patterns = factory_cls.compile_lines(lines)
+		else:
+			patterns = [use_factory(__line) for __line in lines if __line]
+
 		self = cls(patterns, backend=backend, _test_backend_factory=_test_backend_factory)
 		return self
 
+	def get_removed_indices(self) -> list[int]:
+		"""
+		Get the patterns which the backend removed because they cannot affect the
+		result of a match. A pattern is removed when a later pattern with the same
+		include is identical, or matches every file it matches. The removed
+		patterns are still reported by :meth:`.check_file` and :meth:`.check_files`
+		with *all_matches*.
+
+		Returns the indices of the removed patterns in :attr:`self.patterns
+		<.PathSpec.patterns>` (:class:`list` of :class:`int`) in order.
+		"""
+		return self._backend.get_removed_indices()
+
 	@staticmethod
 	def _make_backend(
 		name: BackendNamesHint,
@@ -347,12 +875,61 @@ class PathSpec(Generic[TPattern_co]):
 		"""
 		return make_pathspec_backend(name, patterns)
 
+	def match_array(
+		self,
+		files: Any,
+		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
+	) -> tuple[Any, Any]:
+		"""
+		Matches the NumPy array of files to this path-spec. The literal gitignore
+		patterns (e.g., "\\*.log" or "/build/") after the last pattern which needs a
+		regular expression are evaluated with vectorized string operations on the
+		whole array. Only the files which none of them matched are checked with the
+		backend. This requires the optional dependency `numpy`_.
+
+		.. _`numpy`: https://pypi.org/project/numpy/
+
+		*files* (:class:`numpy.ndarray`) is the one-dimensional array of file paths
+		to be matched against :attr:`self.patterns <.PathSpec.patterns>`. Its type
+		must be :class:`str` (``"U"``) or :class:`bytes` (``"S"``). When the files
+		are normalized, it can also be :class:`object` (``"O"``) containing
+		:class:`str` or :class:`bytes`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized. See :meth:`.PathSpec.check_files`.
+
+		Returns a :class:`tuple` containing:
+
+		-	Whether each file is included (:class:`numpy.ndarray` of :class:`bool`).
+
+		-	The index of the last matched pattern of each file
+			(:class:`numpy.ndarray` of :class:`numpy.int32`). This is ``-1`` if no
+			pattern matched.
+		"""
+		if not assume_normalized:
+			files = _numpy.normalize_array(files, separators)
+
+		if self._vectorize_literals:
+			literals, complete = _numpy.split_trailing_literals(self.patterns)
+		else:
+			literals, complete = [], False
+
+		return _numpy.match_array(self._backend, literals, complete, files)
+
 	def match_entries(
 		self,
 		entries: Iterable[TreeEntry],
 		separators: Optional[Collection[str]] = None,
 		*,
+		assume_normalized: Optional[bool] = None,
 		negate: Optional[bool] = None,
+		presorted: Optional[bool] = None,
 	) -> Iterator[TreeEntry]:
 		"""
 		Matches the entries to this path-spec.
@@ -369,15 +946,39 @@ class PathSpec(Generic[TPattern_co]):
 		exclude the file rather than include it. Default is :data:`None` for
 		:data:`False`.
 
+		*presorted* (:class:`bool` or :data:`None`) is whether the entries are
+		sorted (or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous entry are memoized which bounds memory use.
+		Default is :data:`None` for :data:`False`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the entry
+		paths are already normalized (see :func:`.normalize_file`). If :data:`True`,
+		*separators* is ignored and the paths are matched as is. Default is
+		:data:`None` for :data:`False`.
+
 		Returns the matched entries (:class:`~collections.abc.Iterator` of
 		:class:`.TreeEntry`).
 		"""
 		if not _is_iterable(entries):
 			raise TypeError(f"entries:{entries!r} is not an iterable.")
 
+		backend = self._backend
+		match_file = backend.make_batch_matcher(presorted=presorted)
+		match_bytes_file: Optional[_MatchBytesFileHint] = None
+		norm_file: Union[str, bytes]
 		for entry in entries:
-			norm_file = normalize_file(entry.path, separators)
-			include, _index = self._backend.match_file(norm_file)
+			if assume_normalized:
+				norm_file = entry.path
+			else:
+				norm_file = normalize_file(entry.path, separators)
+
+			if isinstance(norm_file, str):
+				include, _index = match_file(norm_file)
+			else:
+				if match_bytes_file is None:
+					match_bytes_file = backend.make_bytes_matcher(presorted=presorted)
+
+				include, _index = match_bytes_file(norm_file)
 
 			if negate:
 				include = not include
@@ -387,38 +988,57 @@ class PathSpec(Generic[TPattern_co]):
 
 	def match_file(
 		self,
-		file: StrPath,
+		file: Union[StrPath, BytesPath],
 		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
 	) -> bool:
 		"""
 		Matches the file to this path-spec.
 
-		*file* (:class:`str` or :class:`os.PathLike`) is the file path to be matched
-		against :attr:`self.patterns <.PathSpec.patterns>`.
+		*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+		path to be matched against :attr:`self.patterns <.PathSpec.patterns>`.
 
 		*separators* (:class:`~collections.abc.Collection` of :class:`str`)
 		optionally contains the path separators to normalize. See
 		:func:`.normalize_file` for more information.
 
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the file is
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the file is
+		matched as is. Default is :data:`None` for :data:`False`.
+
 		Returns :data:`True` if *file* matched; otherwise, :data:`False`.
 		"""
-		norm_file = normalize_file(file, separators)
-		include, _index = self._backend.match_file(norm_file)
+		norm_file: Union[str, bytes]
+		if assume_normalized:
+			norm_file = file  # type: ignore[assignment]
+		else:
+			norm_file = normalize_file(file, separators)
+
+		if isinstance(norm_file, str):
+			include, _index = self._backend.match_file(norm_file)
+		else:
+			include, _index = self._backend.match_bytes_file(norm_file)
+
 		return bool(include)
 
 	def match_files(
 		self,
-		files: Iterable[TStrPath],
+		files: Iterable[TAnyPath],
 		separators: Optional[Collection[str]] = None,
 		*,
+		assume_normalized: Optional[bool] = None,
 		negate: Optional[bool] = None,
-	) -> Iterator[TStrPath]:
+		presorted: Optional[bool] = None,
+	) -> Iterator[TAnyPath]:
 		"""
 		Matches the files to this path-spec.
 
-		*files* (:class:`~collections.abc.Iterable` of :class:`str` or
-		:class:`os.PathLike`) contains the file paths to be matched against
-		:attr:`self.patterns <.PathSpec.patterns>`.
+		*files* (:class:`~collections.abc.Iterable` of :class:`str`, :class:`bytes`
+		or :class:`os.PathLike`) contains the file paths to be matched against
+		:attr:`self.patterns <.PathSpec.patterns>`. The :class:`bytes` paths are
+		matched without decoding them when the backend supports it.
 
 		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
 		:data:`None`) optionally contains the path separators to normalize. See
@@ -429,15 +1049,39 @@ class PathSpec(Generic[TPattern_co]):
 		exclude the file rather than include it. Default is :data:`None` for
 		:data:`False`.
 
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). If :data:`True`, only the results for the
+		directories of the previous file are memoized which bounds memory use.
+		Default is :data:`None` for :data:`False`.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the files are
+		already normalized (see :func:`.normalize_file`) as :class:`str` or
+		:class:`bytes`. If :data:`True`, *separators* is ignored and the files are
+		matched as is. Default is :data:`None` for :data:`False`.
+
 		Returns the matched files (:class:`~collections.abc.Iterator` of
-		:class:`str` or :class:`os.PathLike`).
+		:class:`str`, :class:`bytes` or :class:`os.PathLike`).
 		"""
 		if not _is_iterable(files):
 			raise TypeError(f"files:{files!r} is not an iterable.")
 
+		backend = self._backend
+		match_file = backend.make_batch_matcher(presorted=presorted)
+		match_bytes_file: Optional[_MatchBytesFileHint] = None
+		norm_file: Union[str, bytes]
 		for orig_file in files:
-			norm_file = normalize_file(orig_file, separators)
-			include, _index = self._backend.match_file(norm_file)
+			if assume_normalized:
+				norm_file = orig_file  # type: ignore[assignment]
+			else:
+				norm_file = normalize_file(orig_file, separators)
+
+			if isinstance(norm_file, str):
+				include, _index = match_file(norm_file)
+			else:
+				if match_bytes_file is None:
+					match_bytes_file = backend.make_bytes_matcher(presorted=presorted)
+
+				include, _index = match_bytes_file(norm_file)
 
 			if negate:
 				include = not include
@@ -445,9 +1089,190 @@ class PathSpec(Generic[TPattern_co]):
 			if include:
 				yield orig_file
 
+	def match_index_entries(
+		self,
+		index_file: Union[StrPath, BytesPath],
+		object_format: Optional[GitObjectFormatHint] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[GitIndexEntry]:
+		"""
+		Reads the entries from the Git index file and matches them to this
+		path-spec. The file-system is not walked.
+
+		*index_file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+		path to the index file (e.g., *.git/index*). If *index_file* is
+		:class:`bytes`, the entry names and paths are :class:`bytes` (see
+		:func:`.iter_index_entries`).
+
+		*object_format* (:class:`str` or :data:`None`) is the object format of the
+		repository: "sha1" or "sha256". Default is :data:`None` for "sha1".
+
+		*negate* (:class:`bool` or :data:`None`) is whether to negate the match
+		results of the patterns. If :data:`True`, a pattern matching a file will
+		exclude the file rather than include it. Default is :data:`None` for
+		:data:`False`.
+
+		Raises :exc:`.GitIndexError` if the index file is invalid or unsupported.
+
+		Returns the matched entries (:class:`~collections.abc.Iterator` of
+		:class:`.GitIndexEntry`).
+		"""
+		# The index entries provide the parts of `TreeEntry` used to match them, and
+		# the same entries are yielded.
+		entries = gitindex.iter_index_entries(index_file, object_format)
+		yield from self.match_entries(  # type: ignore[misc]
+			entries,  # type: ignore[arg-type]
+			assume_normalized=True,
+			negate=negate,
+			presorted=True,
+		)
+
+	@overload
+	def match_index_files(
+		self,
+		index_file: StrPath,
+		object_format: Optional[GitObjectFormatHint] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[str]:
+		...
+
+	@overload
+	def match_index_files(
+		self,
+		index_file: BytesPath,
+		object_format: Optional[GitObjectFormatHint] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[bytes]:
+		...
+
+	def match_index_files(
+		self,
+		index_file: Union[StrPath, BytesPath],
+		object_format: Optional[GitObjectFormatHint] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[Union[str, bytes]]:
+		"""
+		Reads the tracked files from the Git index file and matches them to this
+		path-spec. The file-system is not walked.
+
+		*index_file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+		path to the index file (e.g., *.git/index*). If *index_file* is
+		:class:`bytes`, the file paths are :class:`bytes` (see
+		:func:`.iter_index_files`).
+
+		*object_format* (:class:`str` or :data:`None`) is the object format of the
+		repository: "sha1" or "sha256". Default is :data:`None` for "sha1".
+
+		*negate* (:class:`bool` or :data:`None`) is whether to negate the match
+		results of the patterns. If :data:`True`, a pattern matching a file will
+		exclude the file rather than include it. Default is :data:`None` for
+		:data:`False`.
+
+		Raises :exc:`.GitIndexError` if the index file is invalid or unsupported.
+
+		Returns the matched files (:class:`~collections.abc.Iterator` of
+		:class:`str` or :class:`bytes`).
+		"""
+		files = gitindex.iter_index_files(index_file, object_format)
+		yield from self.match_files(
+			files, assume_normalized=True, negate=negate, presorted=True,
+		)
+
+	@overload
+	def match_path_list(
+		self,
+		path_list: Union[StrPath, BytesPath],
+		delimiter: Optional[bytes] = None,
+		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
+		negate: Optional[bool] = None,
+		offsets: Literal[False, None] = None,
+	) -> Iterator[bytes]:
+		...
+
+	@overload
+	def match_path_list(
+		self,
+		path_list: Union[StrPath, BytesPath],
+		delimiter: Optional[bytes] = None,
+		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
+		negate: Optional[bool] = None,
+		offsets: Literal[True],
+	) -> Iterator[int]:
+		...
+
+	def match_path_list(
+		self,
+		path_list: Union[StrPath, BytesPath],
+		delimiter: Optional[bytes] = None,
+		separators: Optional[Collection[str]] = None,
+		*,
+		assume_normalized: Optional[bool] = None,
+		negate: Optional[bool] = None,
+		offsets: Optional[bool] = None,
+	) -> Iterator[Union[bytes, int]]:
+		"""
+		Reads the paths from a file containing a list of delimited paths (e.g., the
+		output of ``git ls-files -z``), and matches them to this path-spec. The
+		file is memory-mapped and read a chunk at a time (see
+		:func:`.iter_path_list`), so memory use does not depend on the number of
+		paths.
+
+		*path_list* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+		path to the file.
+
+		*delimiter* (:class:`bytes` or :data:`None`) is the single byte separating
+		the paths (e.g., ``b"\\n"``). Default is :data:`None` for ``b"\\0"``.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*assume_normalized* (:class:`bool` or :data:`None`) is whether the paths are
+		already normalized (see :func:`.normalize_file`). If :data:`True`,
+		*separators* is ignored and the paths are matched as is. Default is
+		:data:`None` for :data:`False`.
+
+		*negate* (:class:`bool` or :data:`None`) is whether to negate the match
+		results of the patterns. If :data:`True`, a pattern matching a file will
+		exclude the file rather than include it. Default is :data:`None` for
+		:data:`False`.
+
+		*offsets* (:class:`bool` or :data:`None`) is whether to yield the offset of
+		each matched path in the file instead of the path. Default is :data:`None`
+		for :data:`False`.
+
+		Returns the matched files (:class:`~collections.abc.Iterator` of
+		:class:`bytes`), or their offsets (:class:`~collections.abc.Iterator` of
+		:class:`int`).
+		"""
+		# Only the results of the previous directories are memoized so memory use
+		# stays bounded. This is only a hint, so unsorted paths still match.
+		match_file = self._backend.make_bytes_matcher(presorted=True)
+		norm_file: Union[str, bytes]
+		for offset, file in util.iter_path_list(path_list, delimiter):
+			if assume_normalized:
+				norm_file = file
+			else:
+				norm_file = normalize_file(file, separators)
+
+			include, _index = match_file(norm_file)  # type: ignore[arg-type]
+			if negate:
+				include = not include
+
+			if include:
+				yield offset if offsets else file
+
 	def match_tree_entries(
 		self,
-		root: StrPath,
+		root: Union[StrPath, BytesPath],
 		on_error: Optional[Callable[[OSError], None]] = None,
 		follow_links: Optional[bool] = None,
 		*,
@@ -457,8 +1282,9 @@ class PathSpec(Generic[TPattern_co]):
 		Walks the specified root path for all files and matches them to this
 		path-spec.
 
-		*root* (:class:`str` or :class:`os.PathLike`) is the root directory to
-		search.
+		*root* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the root
+		directory to search. If *root* is :class:`bytes`, the entry names and paths
+		are :class:`bytes` (see :func:`.iter_tree_entries`).
 
 		*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally
 		is the error handler for file-system exceptions. It will be called with the
@@ -478,7 +1304,10 @@ class PathSpec(Generic[TPattern_co]):
 		:class:`.TreeEntry`).
 		"""
 		entries = util.iter_tree_entries(root, on_error=on_error, follow_links=follow_links)
-		yield from self.match_entries(entries, negate=negate)
+		yield from self.match_entries(
+			entries, assume_normalized=_TREE_FILES_NORMALIZED, negate=negate,
+			presorted=True,
+		)
 
 	# NOTICE: The deprecation warning was only added in 1.0.0 (from 2026-01-05).
 	@deprecated((
@@ -492,6 +1321,7 @@ class PathSpec(Generic[TPattern_co]):
 		"""
 		return self.match_tree_files(*args, **kw)
 
+	@overload
 	def match_tree_files(
 		self,
 		root: StrPath,
@@ -500,12 +1330,34 @@ class PathSpec(Generic[TPattern_co]):
 		*,
 		negate: Optional[bool] = None,
 	) -> Iterator[str]:
+		...
+
+	@overload
+	def match_tree_files(
+		self,
+		root: BytesPath,
+		on_error: Optional[Callable[[OSError], None]] = None,
+		follow_links: Optional[bool] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[bytes]:
+		...
+
+	def match_tree_files(
+		self,
+		root: Union[StrPath, BytesPath],
+		on_error: Optional[Callable[[OSError], None]] = None,
+		follow_links: Optional[bool] = None,
+		*,
+		negate: Optional[bool] = None,
+	) -> Iterator[Union[str, bytes]]:
 		"""
 		Walks the specified root path for all files and matches them to this
 		path-spec.
 
-		*root* (:class:`str` or :class:`os.PathLike`) is the root directory to
-		search for files.
+		*root* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the root
+		directory to search for files. If *root* is :class:`bytes`, the file paths
+		are :class:`bytes` (see :func:`.iter_tree_files`).
 
 		*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally
 		is the error handler for file-system exceptions. It will be called with the
@@ -521,7 +1373,11 @@ class PathSpec(Generic[TPattern_co]):
 		exclude the file rather than include it. Default is :data:`None` for
 		:data:`False`.
 
-		Returns the matched files (:class:`~collections.abc.Iterable` of :class:`str`).
+		Returns the matched files (:class:`~collections.abc.Iterable` of :class:`str`
+		or :class:`bytes`).
 		"""
 		files = util.iter_tree_files(root, on_error=on_error, follow_links=follow_links)
-		yield from self.match_files(files, negate=negate)
+		yield from self.match_files(
+			files, assume_normalized=_TREE_FILES_NORMALIZED, negate=negate,
+			presorted=True,
+		)
@@ -86,6 +86,32 @@ class Pattern(object):
 			"{cls.__module__}.{cls.__qualname__} must override match_file()."
 		).format(cls=self.__class__))
 
+	def match_file_priority(self, file: str) -> int:
+		"""
+		Matches this pattern against the specified file, and returns the priority
+		of the match. This is used by the backends to check files without creating
+		match results.
+
+		*file* (:class:`str`) is the normalized file path to match against.
+
+		Returns the priority (:class:`int`) of the match. This is ``2`` if *file*
+		matched, ``1`` if only a parent directory of *file* matched a directory
+		pattern, and ``0`` if it did not match. The default implementation only
+		returns ``2`` or ``0``.
+		"""
+		return 2 if self.matches_file(file) else 0
+
+	def matches_file(self, file: str) -> bool:
+		"""
+		Matches this pattern against the specified file without creating a match
+		result.
+
+		*file* (:class:`str`) is the normalized file path to match against.
+
+		Returns whether *file* matched (:class:`bool`).
+		"""
+		return self.match_file(file) is not None
+
 
 class RegexPattern(Pattern):
 	"""
@@ -95,8 +121,9 @@ class RegexPattern(Pattern):
 
 	# Keep the class dict-less.
 	__slots__ = (
+		'_raw_regex',
+		'_regex',
 		'pattern',
-		'regex',
 	)
 
 	def __init__(
@@ -117,6 +144,7 @@ class RegexPattern(Pattern):
 
 			.. note:: Subclasses do not need to support the *include* parameter.
 		"""
+		raw_regex: Union[str, bytes, None] = None
 		regex: Optional[re.Pattern] = None
 		if isinstance(pattern, (str, bytes)):
 			assert include is None, (
@@ -129,7 +157,8 @@ class RegexPattern(Pattern):
 				assert raw_regex is not None, (
 					f"{raw_regex=!r} must be non-null when {include=!r} is not None."
 				)
-				regex = re.compile(raw_regex)
+			else:
+				raw_regex = None
 
 		elif pattern is not None and hasattr(pattern, 'match'):
 			# Assume pattern is a precompiled regular expression.
@@ -148,16 +177,23 @@ class RegexPattern(Pattern):
 
 		super(RegexPattern, self).__init__(include)
 
-		self.pattern: Union[str, bytes, re.Pattern, None] = pattern
+		self._raw_regex: Union[str, bytes, None] = raw_regex
 		"""
-		*pattern* (:class:`str`, :class:`bytes`, :class:`re.Pattern`, or
-		:data:`None`) is the uncompiled, input pattern. This is for reference.
+		*_raw_regex* (:class:`str`, :class:`bytes`, or :data:`None`) is the
+		uncompiled regular expression to compile on first use. This is
+		:data:`None` when the regular expression was precompiled.
 		"""
 
-		self.regex: Optional[re.Pattern] = regex
+		self._regex: Optional[re.Pattern] = regex
 		"""
-		*regex* (:class:`re.Pattern` or :data:`None`) is the compiled regular
-		expression for the pattern.
+		*_regex* (:class:`re.Pattern` or :data:`None`) is the compiled regular
+		expression, or :data:`None` if it has not been compiled yet.
+		"""
+
+		self.pattern: Union[str, bytes, re.Pattern, None] = pattern
+		"""
+		*pattern* (:class:`str`, :class:`bytes`, :class:`re.Pattern`, or
+		:data:`None`) is the uncompiled, input pattern. This is for reference.
 		"""
 
 	def __repr__(self) -> str:
@@ -181,21 +217,106 @@ class RegexPattern(Pattern):
 
 		Returns the copy (:class:`RegexPattern`).
 		"""
-		other = self.__class__(self.regex, self.include)
+		# Copy the attributes directly so the regular expression is not compiled.
+		cls = self.__class__
+		other = cls.__new__(cls)
+		other.include = self.include
 		other.pattern = self.pattern
+		other._raw_regex = self._raw_regex
+		other._regex = self._regex
 		return other
 
 	def __eq__(self, other: object) -> bool:
 		"""
 		Tests the equality of this regex pattern with *other* (:class:`RegexPattern`)
 		by comparing their :attr:`~Pattern.include` and :attr:`~RegexPattern.regex`
-		attributes.
+		attributes. The regular expressions are only compiled when one of them was
+		precompiled.
 		"""
 		if isinstance(other, RegexPattern):
-			return self.include == other.include and self.regex == other.regex
+			if self.include != other.include:
+				return False
+
+			self_raw = self._raw_regex
+			other_raw = other._raw_regex
+			if self_raw is not None and other_raw is not None:
+				# Both regular expressions are compiled from their source with the same
+				# flags.
+				return self_raw == other_raw
+
+			return self.regex == other.regex
 		else:
 			return NotImplemented
 
+	def _get_regex_key(self) -> Optional[tuple[Union[str, bytes, None], int]]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the key identifying the regular expression consistent with
+		:meth:`.RegexPattern.__eq__`.
+
+		Returns a :class:`tuple` containing the uncompiled regular expression
+		(:class:`str`, :class:`bytes`, or :data:`None`), and its explicit flags
+		(:class:`int`, or ``-1`` for the default flags). Returns :data:`None` if
+		the precompiled regular expression is not a :class:`re.Pattern`.
+		"""
+		raw_regex = self._raw_regex
+		if raw_regex is not None:
+			return (raw_regex, -1)
+
+		regex = self._regex
+		if regex is None:
+			return (None, -1)
+		elif not isinstance(regex, re.Pattern):
+			return None
+
+		if regex.flags == re.compile(regex.pattern).flags:
+			# Compiled with the default flags.
+			return (regex.pattern, -1)
+		else:
+			return (regex.pattern, regex.flags)
+
+	@property
+	def raw_regex(self) -> Union[str, bytes, None]:
+		"""
+		*raw_regex* (:class:`str`, :class:`bytes`, or :data:`None`) is the
+		uncompiled regular expression for the pattern. Reading this does not
+		compile the regular expression.
+		"""
+		raw_regex = self._raw_regex
+		if raw_regex is not None:
+			return raw_regex
+
+		regex = self._regex
+		if regex is not None:
+			return regex.pattern
+
+		return None
+
+	@property
+	def regex(self) -> Optional[re.Pattern]:
+		"""
+		*regex* (:class:`re.Pattern` or :data:`None`) is the compiled regular
+		expression for the pattern. It is compiled on first use.
+		"""
+		regex = self._regex
+		if regex is None and (raw_regex := self._raw_regex) is not None:
+			regex = self._regex = re.compile(raw_regex)
+
+		return regex
+
+	@regex.setter
+	def regex(self, regex: Optional[re.Pattern]) -> None:
+		"""
+		Set the compiled regular expression for the pattern.
+
+		*regex* (:class:`re.Pattern` or :data:`None`) is the compiled regular
+		expression.
+		"""
+		self._raw_regex = None
+		self._regex = regex
+
 	@override
 	def match_file(self, file: AnyStr) -> Optional[RegexMatchResult]:
 		"""
@@ -215,6 +336,26 @@ class RegexPattern(Pattern):
 
 		return None
 
+	@override
+	def matches_file(self, file: str) -> bool:
+		"""
+		Matches this pattern against the specified file without creating a match
+		result.
+
+		*file* (:class:`str`) is the normalized file path to match against.
+
+		Returns whether *file* matched (:class:`bool`).
+		"""
+		if type(self).match_file is not RegexPattern.match_file:
+			# Honor the match of a subclass overriding `match_file()`.
+			return self.match_file(file) is not None
+
+		# Avoid the property when the regular expression is already compiled.
+		if (regex := self._regex) is None and (regex := self.regex) is None:
+			return False
+
+		return regex.search(file) is not None
+
 	@classmethod
 	def pattern_to_regex(
 		cls,
@@ -5,6 +5,7 @@ The *pathspec.patterns* package contains the pattern matching implementations.
 # Load pattern implementations.
 from .gitignore import basic as _0
 from .gitignore import spec as _1
+from .gitignore import cone as _2
 
 # DEPRECATED: Deprecated since 0.11.0 (from 2023-01-24). Expose the
 # GitWildMatchPattern class in this module for backward compatibility with
@@ -0,0 +1,391 @@
+"""
+This module provides the intermediate representation of a compiled gitignore
+pattern. The pattern is parsed once into its segments, and each consumer lowers
+the parsed form into the regular expressions it needs: the canonical regular
+expression of the pattern, the directory and file variants used by the
+backends, and the rewrites optimized for each regular expression engine.
+
+WARNING: The *pathspec.patterns.gitignore._ir* module is not part of the public
+API. Its contents and structure are likely to change.
+"""
+
+import re
+from dataclasses import (
+	dataclass)
+from typing import (
+	Literal,
+	Optional)  # Replaced by `X | None` in 3.10.
+
+_DIR_MARK = 'ps_d'
+"""
+The regex group name for the directory marker. This is only used by
+:class:`GitIgnoreSpec`.
+"""
+
+_DIR_MARK_CG = f'(?P<{_DIR_MARK}>/)'
+"""
+This regular expression matches the directory marker.
+"""
+
+_DIR_MARK_OPT = f'(?:{_DIR_MARK_CG}|$)'
+"""
+This regular expression matches the optional directory marker and sub-path.
+"""
+
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+"""
+This regular expression matches an escaped character in a translated segment.
+"""
+
+_INNER_SEGMENT = '**'
+"""
+The segment representing inner double-asterisks ('**') which match multiple (or
+zero) inner path segments. The regular expression of a translated segment glob
+cannot be two asterisks.
+"""
+
+_LITERAL_RE = re.compile(r'(?:\\[^0-9A-Za-z]|[^\\/.^$*+?{}\[\]()|])+')
+"""
+This regular expression matches the literal characters (escaped by
+:func:`re.escape`) at the beginning of a translated segment.
+"""
+
+_SUFFIX_GLOB = '[^/]*'
+"""
+The translated glob matching the rest of a path segment before a basename
+suffix (e.g., "*.txt").
+"""
+
+LiteralStartHint = Literal['any', 'root', 'segment']
+"""
+The type hint for where the literal of a gitignore pattern must begin:
+
+-	:data:`"any"`: The literal can begin anywhere in the path (e.g., "\\*.txt").
+
+-	:data:`"root"`: The literal must begin at the start of the path.
+
+-	:data:`"segment"`: The literal must begin at the start of a path segment.
+"""
+
+RegexEngineHint = Literal['hyperscan', 're', 're2']
+"""
+The regular expression engines the regular expressions can be optimized for.
+"""
+
+TailHint = Literal['descendants', 'entry', 'path']
+"""
+The type hint for how the end of a gitignore pattern matches:
+
+-	:data:`"descendants"`: The pattern ends with double-asterisks ('**'), or a
+	slash ('/'). It only matches the paths underneath the matched directory.
+
+-	:data:`"entry"`: The pattern ends with an asterisk ('*'). It matches a file or
+	directory without matching descendant paths. This is only used by
+	:class:`.GitIgnoreBasicPattern`.
+
+-	:data:`"path"`: The pattern matches a file, or a directory with the paths
+	underneath it.
+"""
+
+
+@dataclass()
+class GitIgnorePatternIR(object):
+	"""
+	The :class:`GitIgnorePatternIR` class is the intermediate representation of a
+	compiled gitignore pattern.
+
+	A pattern without segments is a special case. With the :data:`"path"` tail it
+	matches every path (e.g., "**"). With the :data:`"descendants"` tail it
+	matches every path not in the root directory (e.g., "*/").
+	"""
+
+	# Keep the class dict-less.
+	__slots__ = (
+		'anchored',
+		'dir_mark',
+		'dir_only',
+		'include',
+		'segments',
+		'tail',
+	)
+
+	anchored: bool
+	"""
+	*anchored* (:class:`bool`) is whether the first segment must match at the
+	root directory (:data:`True`), or at the start of any path segment
+	(:data:`False`).
+	"""
+
+	dir_mark: bool
+	"""
+	*dir_mark* (:class:`bool`) is whether matches by a directory pattern are
+	distinguished from matches by a file pattern. This is only used by
+	:class:`.GitIgnoreSpecPattern`.
+	"""
+
+	dir_only: bool
+	"""
+	*dir_only* (:class:`bool`) is whether the pattern is a directory pattern
+	(i.e., ends with a slash '/').
+	"""
+
+	include: bool
+	"""
+	*include* (:class:`bool`) is whether matched files should be included
+	(:data:`True`), or excluded (:data:`False`) by a negated pattern.
+	"""
+
+	segments: tuple[str, ...]
+	"""
+	*segments* (:class:`tuple` of :class:`str`) contains the regular expression
+	for each path segment. The leading and trailing double-asterisks are
+	represented by :attr:`.anchored` and :attr:`.tail`. Inner double-asterisks
+	are kept as "**".
+	"""
+
+	tail: TailHint
+	"""
+	*tail* (:class:`str`) is how the end of the pattern matches. See
+	:data:`TailHint`.
+	"""
+
+	def covers(self, other: 'GitIgnorePatternIR') -> bool:
+		"""
+		Get whether this pattern matches every path matched by the other pattern
+		with at least the same priority. A directory match has a lower priority
+		than a file match when :attr:`.dir_mark` is :data:`True`. This only
+		compares the structure of the patterns, and it does not compare
+		:attr:`.include`.
+
+		*other* (:class:`GitIgnorePatternIR`) is the other pattern.
+
+		Returns whether this pattern covers the other pattern (:class:`bool`).
+		"""
+		if self.dir_mark != other.dir_mark:
+			return False
+
+		elif not self.segments:
+			if self.tail == 'path':
+				# The pattern matches every path by a file pattern.
+				return True
+			else:
+				# The pattern matches every path not in the root directory.
+				return (
+					other.tail == 'descendants'
+					and self._descendants_priority() >= other._descendants_priority()
+				)
+
+		elif self.segments != other.segments:
+			return False
+
+		elif self.anchored and not other.anchored:
+			# The other pattern matches at any depth.
+			return False
+
+		elif self.tail == other.tail:
+			return (
+				self.tail != 'descendants'
+				or self._descendants_priority() >= other._descendants_priority()
+			)
+
+		elif self.tail == 'path':
+			# The pattern also matches the path itself, and the descendant paths by a
+			# directory pattern.
+			return other.tail == 'entry' or other._descendants_priority() == (
+				1 if self.dir_mark else 2
+			)
+
+		else:
+			return False
+
+	def _descendants_priority(self) -> int:
+		"""
+		Get the priority of a match for a pattern with the :data:`"descendants"`
+		tail.
+
+		Returns the priority (:class:`int`). This is ``1`` for a match by a
+		directory pattern, and ``2`` for a match by a file pattern.
+		"""
+		return 1 if self.dir_mark and self.dir_only else 2
+
+	@property
+	def is_dir_only(self) -> bool:
+		"""
+		*is_dir_only* (:class:`bool`) is whether the pattern can only match a file
+		by one of its parent directories.
+		"""
+		return self.tail == 'descendants'
+
+	def _lower_segments(self, engine: Optional[RegexEngineHint]) -> str:
+		"""
+		Lower the segments into a regular expression without the tail.
+
+		*engine* (:class:`str` or :data:`None`) is the regular expression engine to
+		optimize for: "hyperscan", "re", or "re2". Use :data:`None` to not optimize
+		the regular expression.
+
+		Returns the regular expression (:class:`str`).
+		"""
+		segments = self.segments
+		out_parts = []
+		first = segments[0]
+		if self.anchored:
+			# Anchor to root directory.
+			out_parts.append(f'^{first}')
+
+		elif engine is None:
+			# Match any leading path segments.
+			out_parts.append(f'^(?:.+/)?{first}')
+
+		elif (
+			first.startswith(_SUFFIX_GLOB)
+			and _LITERAL_RE.match(first, len(_SUFFIX_GLOB)) is not None
+		):
+			# Matching a basename suffix (e.g., "*.txt") only needs to find the
+			# literal. This is evaluated with a search.
+			out_parts.append(first[len(_SUFFIX_GLOB):])
+
+		elif (literal_match := _LITERAL_RE.match(first)) is not None:
+			literal = literal_match.group()
+			if engine == 're':
+				# A regular expression beginning with a literal lets `re` skip ahead to
+				# each occurrence of the literal instead of backtracking over the path.
+				# The look-behind checks the literal begins a path segment.
+				out_parts.append(f'{literal}(?<![^/]{literal}){first[len(literal):]}')
+			else:
+				# Re2 and Hyperscan compile a much smaller automaton without the leading
+				# repetition.
+				out_parts.append(f'(?:^|/){first}')
+
+		else:
+			out_parts.append(f'^(?:.+/)?{first}')
+
+		for seg in segments[1:]:
+			if seg == _INNER_SEGMENT:
+				# Match multiple (or zero) inner path segments.
+				out_parts.append('(?:/.+)?')
+			else:
+				out_parts.append(f'/{seg}')
+
+		return ''.join(out_parts)
+
+	def to_literal(self) -> Optional[tuple[str, LiteralStartHint]]:
+		"""
+		Lower the pattern into the literal string it matches. A pattern is
+		literal-equivalent when each of its segments is literal, except for a
+		leading basename suffix glob when the pattern is not anchored (e.g.,
+		"\\*.txt"). The literal ends with a slash ('/') for the
+		:data:`"descendants"` tail. For the :data:`"path"` tail, the literal must be
+		followed by a slash ('/') or the end of the path.
+
+		Returns a :class:`tuple` containing the literal (:class:`str`), and where the
+		literal must begin (:class:`str`; see :data:`LiteralStartHint`). This is
+		:data:`None` if the pattern is not literal-equivalent.
+		"""
+		segments = self.segments
+		if not segments or self.tail == 'entry':
+			return None
+
+		start: LiteralStartHint
+		first = segments[0]
+		if self.anchored:
+			start = 'root'
+		elif first.startswith(_SUFFIX_GLOB) and len(first) > len(_SUFFIX_GLOB):
+			# Matching a basename suffix (e.g., "*.txt") only needs to find the
+			# literal.
+			start = 'any'
+			first = first[len(_SUFFIX_GLOB):]
+		else:
+			start = 'segment'
+
+		out_parts: list[str] = []
+		for seg in (first, *segments[1:]):
+			if _LITERAL_RE.fullmatch(seg) is None:
+				# The segment is not literal.
+				return None
+
+			if out_parts:
+				out_parts.append('/')
+
+			out_parts.append(_ESCAPE_RE.sub(r'\1', seg))
+
+		if self.tail == 'descendants':
+			out_parts.append('/')
+
+		return (''.join(out_parts), start)
+
+	def to_match_regex(self, engine: Optional[RegexEngineHint] = None) -> str:
+		"""
+		Lower the pattern into a regular expression without capture groups which
+		matches the same paths as the pattern.
+
+		*engine* (:class:`str` or :data:`None`) is the regular expression engine to
+		optimize for. Default is :data:`None` to not optimize.
+
+		Returns the regular expression (:class:`str`).
+		"""
+		tail = self.tail
+		if not self.segments:
+			return '/' if tail == 'descendants' else '.'
+
+		base_regex = self._lower_segments(engine)
+		if tail == 'descendants':
+			return f'{base_regex}/'
+		elif tail == 'entry':
+			return f'{base_regex}/?$'
+		else:
+			return f'{base_regex}(?:/|$)'
+
+	def to_regex(self) -> str:
+		"""
+		Lower the pattern into its canonical regular expression. The directory
+		marker is captured when :attr:`.dir_mark` is :data:`True`.
+
+		Returns the regular expression (:class:`str`).
+		"""
+		if not self.dir_mark:
+			return self.to_match_regex()
+
+		tail = self.tail
+		if tail == 'descendants':
+			mark = _DIR_MARK_CG if self.dir_only else '/'
+			if not self.segments:
+				return mark
+
+			return f'{self._lower_segments(None)}{mark}'
+
+		elif not self.segments:
+			return '.'
+
+		else:
+			return f'{self._lower_segments(None)}{_DIR_MARK_OPT}'
+
+	def to_variants(
+		self,
+		engine: Optional[RegexEngineHint] = None,
+	) -> list[tuple[str, bool]]:
+		"""
+		Lower the pattern into regular expressions without capture groups for the
+		directory and file matches.
+
+		*engine* (:class:`str` or :data:`None`) is the regular expression engine to
+		optimize for. Default is :data:`None` to not optimize.
+
+		Returns a :class:`list` containing each regular expression (:class:`str`),
+		and whether it matches by a directory pattern (:class:`bool`).
+		"""
+		if not self.dir_mark:
+			return [(self.to_match_regex(engine), False)]
+
+		tail = self.tail
+		if tail == 'descendants':
+			return [(self.to_match_regex(engine), self.dir_only)]
+
+		elif not self.segments:
+			return [('.', False)]
+
+		else:
+			# Split the optional directory marker into the directory and file
+			# variants.
+			base_regex = self._lower_segments(engine)
+			return [(f'{base_regex}/', True), (f'{base_regex}$', False)]
@@ -2,22 +2,62 @@
 This module provides common classes for the gitignore patterns.
 """
 
+import functools
 import re
-
+from collections.abc import (
+	Iterable)
 from typing import (
-	Literal)
+	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
+	Literal,
+	Optional,  # Replaced by `X | None` in 3.10.
+	TypeVar,
+	Union)  # Replaced by `X | Y` in 3.10.
 
 from pathspec.pattern import (
+	RegexMatchResult,
 	RegexPattern)
 from pathspec._typing import (
 	AnyStr,  # Removed in 3.18.
-	assert_unreachable)
+	assert_unreachable,
+	override)  # Added in 3.12.
+
+from ._ir import (
+	GitIgnorePatternIR,
+	RegexEngineHint,
+	_DIR_MARK)
 
 _BYTES_ENCODING = 'latin1'
 """
 The encoding to use when parsing a byte string pattern.
 """
 
+_SEGMENT_CACHE_SIZE = 4096
+"""
+The maximum number of segment glob translations to memoize. Generated pattern
+files commonly repeat the same directory and file names across many lines.
+"""
+
+_PriorityRegexesHint = tuple[Optional[re.Pattern], Optional[re.Pattern], int]
+"""
+The type hint for the compiled regular expressions used to get the priority of
+a match:
+
+-	*0* (:class:`re.Pattern` or :data:`None`) is the regular expression to
+	match. It does not contain capture groups.
+
+-	*1* (:class:`re.Pattern` or :data:`None`) is the file variant of the regular
+	expression to check when *0* matched. If it matches, the priority is ``2``;
+	otherwise, ``1``.
+
+-	*2* (:class:`int`) is the priority when *0* matched and *1* is :data:`None`.
+"""
+
+Self = TypeVar("Self", bound='_GitIgnoreBasePattern')
+"""
+:class:`_GitIgnoreBasePattern` self type hint to support Python v<3.11 using
+PEP 673 recommendation.
+"""
+
 
 class _GitIgnoreBasePattern(RegexPattern):
 	"""
@@ -29,7 +69,126 @@ class _GitIgnoreBasePattern(RegexPattern):
 	"""
 
 	# Keep the dict-less class hierarchy.
-	__slots__ = ()
+	__slots__ = (
+		'_ir',
+		'_priority_regexes',
+	)
+
+	def __init__(
+		self,
+		pattern: Union[AnyStr, re.Pattern, None],
+		include: Optional[bool] = None,
+	) -> None:
+		"""
+		Initializes the :class:`_GitIgnoreBasePattern` instance.
+
+		*pattern* (:class:`str`, :class:`bytes`, :class:`re.Pattern`, or
+		:data:`None`) is the pattern to compile into a regular expression.
+
+		*include* (:class:`bool` or :data:`None`) must be :data:`None` unless
+		*pattern* is a precompiled regular expression (:class:`re.Pattern`).
+		"""
+		super().__init__(pattern, include)
+
+		self._ir: Optional[GitIgnorePatternIR] = None
+		"""
+		*_ir* (:class:`.GitIgnorePatternIR` or :data:`None`) is the intermediate
+		representation of the pattern. It is parsed on first use.
+		"""
+
+		self._priority_regexes: Optional[_PriorityRegexesHint] = None
+		"""
+		*_priority_regexes* (:class:`tuple` or :data:`None`) contains the compiled
+		regular expressions used by :meth:`.match_file_priority`. They are compiled
+		on first use.
+		"""
+
+	def __copy__(self: Self) -> Self:
+		"""
+		Performa a shallow copy of the pattern.
+
+		Returns the copy (:class:`_GitIgnoreBasePattern`).
+		"""
+		other = super().__copy__()
+		other._ir = self._ir
+		other._priority_regexes = self._priority_regexes
+		return other
+
+	def _compile_priority_regexes(self) -> _PriorityRegexesHint:
+		"""
+		Compile the regular expressions used by :meth:`.match_file_priority`. The
+		regular expressions lowered from the pattern are optimized for :mod:`re`.
+
+		Returns the compiled regular expressions (:class:`tuple`).
+		"""
+		raw_regex = self.raw_regex
+		if raw_regex is None:
+			return (None, None, 0)
+
+		regex = self._regex
+		flags = regex.flags if isinstance(regex, re.Pattern) else 0
+
+		regex_str: str
+		file_regex: Optional[str]
+		if (ir := self._get_ir()) is not None:
+			variants = ir.to_variants('re')
+			if len(variants) == 2:
+				# The pattern matches by a directory or file pattern.
+				regex_str = ir.to_match_regex('re')
+				file_regex, priority = variants[1][0], 1
+			else:
+				regex_str, is_dir_pattern = variants[0]
+				file_regex, priority = None, 1 if is_dir_pattern else 2
+
+		else:
+			# Only split a precompiled regular expression.
+			if isinstance(raw_regex, bytes):
+				regex_str = raw_regex.decode(_BYTES_ENCODING)
+			else:
+				regex_str = raw_regex
+
+			regex_str, file_regex, priority = self._split_priority_regex(regex_str)
+
+		if isinstance(raw_regex, bytes):
+			return (
+				re.compile(regex_str.encode(_BYTES_ENCODING), flags),
+				re.compile(file_regex.encode(_BYTES_ENCODING), flags) if file_regex else None,
+				priority,
+			)
+		else:
+			return (
+				re.compile(regex_str, flags),
+				re.compile(file_regex, flags) if file_regex else None,
+				priority,
+			)
+
+	@classmethod
+	def compile_lines(cls: type[Self], lines: Iterable[AnyStr]) -> list[Self]:
+		"""
+		Compile the pattern lines in bulk. Identical lines are only compiled once and
+		share the same pattern instance. Empty lines are skipped the same as
+		:meth:`.PathSpec.from_lines`.
+
+		*lines* (:class:`~collections.abc.Iterable`) yields each uncompiled pattern
+		(:class:`str` or :class:`bytes`).
+
+		Returns the compiled patterns (:class:`list` of :class:`_GitIgnoreBasePattern`).
+		"""
+		# Call the class through its constructor type so the line keeps its type.
+		factory: Callable[[AnyStr], Self] = cls
+		compiled: dict[AnyStr, Self] = {}
+		patterns: list[Self] = []
+		for line in lines:
+			if not line:
+				continue
+
+			pattern = compiled.get(line)
+			if pattern is None:
+				pattern = compiled[line] = factory(line)
+
+			patterns.append(pattern)
+
+		return patterns
 
 	@staticmethod
 	def escape(s: AnyStr) -> AnyStr:
@@ -59,7 +218,231 @@ class _GitIgnoreBasePattern(RegexPattern):
 		else:
 			return out_string  # type: ignore[return-value]
 
+	def _get_ir(self) -> Optional[GitIgnorePatternIR]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the intermediate representation of the pattern. It is parsed on first
+		use.
+
+		Returns the intermediate representation (:class:`.GitIgnorePatternIR`), or
+		:data:`None` if the pattern is a null-operation, or its regular expression
+		was precompiled.
+		"""
+		ir = self._ir
+		if ir is None and self.include is not None and self._raw_regex is not None:
+			# Narrow the pattern to a single string type for `_pattern_to_ir()`.
+			pattern = self.pattern
+			if isinstance(pattern, str):
+				ir = self._ir = self._pattern_to_ir(pattern)
+			elif isinstance(pattern, bytes):
+				ir = self._ir = self._pattern_to_ir(pattern)
+
+		return ir
+
+	def _get_match_regex(self, engine: RegexEngineHint) -> Optional[str]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the regular expression to match for the regular expression engine. This
+		is used by the backends which do not distinguish directory matches.
+
+		*engine* (:class:`str`) is the regular expression engine: "hyperscan", "re",
+		or "re2".
+
+		Returns the uncompiled regular expression (:class:`str`), or :data:`None`
+		for a null-operation.
+		"""
+		if (ir := self._get_ir()) is not None:
+			return ir.to_match_regex(engine)
+
+		raw_regex = self.raw_regex
+		if isinstance(raw_regex, bytes):
+			return raw_regex.decode(_BYTES_ENCODING)
+		else:
+			return raw_regex
+
+	def _get_regex_variants(self, engine: RegexEngineHint) -> list[tuple[str, bool]]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the regular expressions without capture groups for the directory and
+		file matches for the regular expression engine.
+
+		*engine* (:class:`str`) is the regular expression engine: "hyperscan", "re",
+		or "re2".
+
+		Returns a :class:`list` containing each regular expression (:class:`str`),
+		and whether it matches by a directory pattern (:class:`bool`). This is empty
+		for a null-operation.
+		"""
+		if (ir := self._get_ir()) is not None:
+			return ir.to_variants(engine)
+
+		raw_regex = self.raw_regex
+		if raw_regex is None:
+			return []
+		elif isinstance(raw_regex, bytes):
+			return self._split_regex_variants(raw_regex.decode(_BYTES_ENCODING))
+		else:
+			return self._split_regex_variants(raw_regex)
+
+	@override
+	def match_file_priority(self, file: str) -> int:
+		"""
+		Matches this pattern against the specified file, and returns the priority
+		of the match.
+
+		*file* (:class:`str`) is the normalized file path to match against.
+
+		Returns the priority (:class:`int`) of the match. This is ``2`` if *file*
+		matched, ``1`` if only a parent directory of *file* matched, and ``0`` if it
+		did not match.
+		"""
+		if type(self).match_file is not RegexPattern.match_file:
+			# Honor the match of a subclass overriding `match_file()`, and check its
+			# directory marker.
+			match = self.match_file(file)
+			if match is None:
+				return 0
+			elif (
+				isinstance(match, RegexMatchResult)
+				and match.match.groupdict().get(_DIR_MARK)
+			):
+				return 1
+			else:
+				return 2
+
+		priority_regexes = self._priority_regexes
+		if priority_regexes is None:
+			priority_regexes = self._priority_regexes = self._compile_priority_regexes()
+
+		regex, file_regex, priority = priority_regexes
+		if regex is None or regex.search(file) is None:
+			return 0
+		elif file_regex is None:
+			return priority
+		elif file_regex.search(file) is not None:
+			return 2
+		else:
+			return 1
+
+	@override
+	def matches_file(self, file: str) -> bool:
+		"""
+		Matches this pattern against the specified file without creating a match
+		result.
+
+		*file* (:class:`str`) is the normalized file path to match against.
+
+		Returns whether *file* matched (:class:`bool`).
+		"""
+		if type(self).match_file is not RegexPattern.match_file:
+			# Honor the match of a subclass overriding `match_file()`.
+			return self.match_file(file) is not None
+
+		priority_regexes = self._priority_regexes
+		if priority_regexes is None:
+			priority_regexes = self._priority_regexes = self._compile_priority_regexes()
+
+		regex = priority_regexes[0]
+		return regex is not None and regex.search(file) is not None
+
+	@RegexPattern.regex.setter  # type: ignore[attr-defined]
+	def regex(self, regex: Optional[re.Pattern]) -> None:
+		"""
+		Set the compiled regular expression for the pattern.
+
+		*regex* (:class:`re.Pattern` or :data:`None`) is the compiled regular
+		expression.
+		"""
+		RegexPattern.regex.fset(self, regex)  # type: ignore[attr-defined]
+		self._ir = None
+		self._priority_regexes = None
+
+	@classmethod
+	def _pattern_to_ir(cls, pattern: AnyStr) -> Optional[GitIgnorePatternIR]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Parse the pattern into its intermediate representation. Subclasses must
+		override this.
+
+		*pattern* (:class:`str` or :class:`bytes`) is the pattern to parse.
+
+		Returns the intermediate representation (:class:`.GitIgnorePatternIR`), or
+		:data:`None` if the pattern is a null-operation.
+		"""
+		raise NotImplementedError((
+			"{cls.__module__}.{cls.__qualname__} must override _pattern_to_ir()."
+		).format(cls=cls))
+
+	@override
+	@classmethod
+	def pattern_to_regex(
+		cls,
+		pattern: AnyStr,
+	) -> tuple[Optional[AnyStr], Optional[bool]]:
+		"""
+		Convert the pattern into a regular expression.
+
+		*pattern* (:class:`str` or :class:`bytes`) is the pattern to convert into a
+		regular expression.
+
+		Returns a :class:`tuple` containing:
+
+			-	*pattern* (:class:`str`, :class:`bytes` or :data:`None`) is the
+				uncompiled regular expression.
+
+			-	*include* (:class:`bool` or :data:`None`) is whether matched files
+				should be included (:data:`True`), excluded (:data:`False`), or is a
+				null-operation (:data:`None`).
+		"""
+		ir = cls._pattern_to_ir(pattern)
+		if ir is None:
+			return (None, None)
+
+		# Encode regex if needed.
+		regex = ir.to_regex()
+		if isinstance(pattern, bytes):
+			return (regex.encode(_BYTES_ENCODING), ir.include)  # type: ignore[return-value]
+		else:
+			return (regex, ir.include)  # type: ignore[return-value]
+
+	def _split_priority_regex(self, regex: str) -> tuple[str, Optional[str], int]:
+		"""
+		Split the regular expression into the variants used by
+		:meth:`.match_file_priority`. This is only used for a precompiled regular
+		expression. Subclasses using capture groups must override this.
+
+		*regex* (:class:`str`) is the uncompiled regular expression.
+
+		Returns a :class:`tuple` containing the regular expression to match
+		(:class:`str`), the file variant to check when it matched (:class:`str` or
+		:data:`None`), and the priority when there is no file variant
+		(:class:`int`).
+		"""
+		return (regex, None, 2)
+
+	def _split_regex_variants(self, regex: str) -> list[tuple[str, bool]]:
+		"""
+		Split the regular expression into the directory and file variants used by
+		:meth:`._get_regex_variants`. This is only used for a precompiled regular
+		expression. Subclasses using capture groups must override this.
+
+		*regex* (:class:`str`) is the uncompiled regular expression.
+
+		Returns a :class:`list` containing each regular expression (:class:`str`),
+		and whether it matches by a directory pattern (:class:`bool`).
+		"""
+		return [(regex, False)]
+
 	@staticmethod
+	@functools.lru_cache(maxsize=_SEGMENT_CACHE_SIZE)
 	def _translate_segment_glob(
 		pattern: str,
 		range_error: Literal['literal', 'raise'],
@@ -67,7 +450,7 @@ class _GitIgnoreBasePattern(RegexPattern):
 		"""
 		Translates the glob pattern to a regular expression. This is used in the
 		constructor to translate a path segment glob pattern to its corresponding
-		regular expression.
+		regular expression. The translations are memoized.
 
 		*pattern* (:class:`str`) is the glob pattern.
 
@@ -85,7 +468,7 @@ class _GitIgnoreBasePattern(RegexPattern):
 		# POSIX function `fnmatch()` with the `FNM_PATHNAME` flag set.
 
 		escape = False
-		regex = ''
+		regex_parts: list[str] = []
 		i, end = 0, len(pattern)
 		while i < end:
 			# Get next character.
@@ -95,7 +478,7 @@ class _GitIgnoreBasePattern(RegexPattern):
 			if escape:
 				# Escape the character.
 				escape = False
-				regex += re.escape(char)
+				regex_parts.append(re.escape(char))
 
 			elif char == '\\':
 				# Escape character, escape next character.
@@ -104,12 +487,12 @@ class _GitIgnoreBasePattern(RegexPattern):
 			elif char == '*':
 				# Multi-character wildcard. Match any string (except slashes), including
 				# an empty string.
-				regex += '[^/]*'
+				regex_parts.append('[^/]*')
 
 			elif char == '?':
 				# Single-character wildcard. Match any single character (except a
 				# slash).
-				regex += '[^/]'
+				regex_parts.append('[^/]')
 
 			elif char == '[':
 				# Bracket expression (range notation) wildcard. Except for the beginning
@@ -169,9 +552,13 @@ class _GitIgnoreBasePattern(RegexPattern):
 								f"Invalid range notation={pattern[i:j]!r} found in "
 								f"pattern={pattern!r}."
 							)) from e
+					else:
+						# Validate the bracket expression now because the regular expression
+						# for the whole pattern is compiled lazily.
+						re.compile(expr)
 
 					# Add regex bracket expression to regex result.
-					regex += expr
+					regex_parts.append(expr)
 
 					# Set i to one past the closing bracket.
 					i = j
@@ -181,7 +568,7 @@ class _GitIgnoreBasePattern(RegexPattern):
 					if range_error == 'literal':
 						# Treat opening bracket as a bracket literal instead of as an
 						# expression.
-						regex += '\\['
+						regex_parts.append('\\[')
 					elif range_error == 'raise':
 						# Treat invalid range notation as an error.
 						raise _RangeError((
@@ -193,14 +580,14 @@ class _GitIgnoreBasePattern(RegexPattern):
 
 			else:
 				# Regular character, escape it for regex.
-				regex += re.escape(char)
+				regex_parts.append(re.escape(char))
 
 		if escape:
 			raise ValueError((
 				f"Escape character found with no next character to escape: {pattern!r}"
 			))  # ValueError
 
-		return regex
+		return ''.join(regex_parts)
 
 
 class GitIgnorePatternError(ValueError):
@@ -19,6 +19,10 @@ from .base import (
 	GitIgnorePatternError,
 	_BYTES_ENCODING,
 	_GitIgnoreBasePattern)
+from ._ir import (
+	GitIgnorePatternIR,
+	TailHint,
+	_INNER_SEGMENT)
 
 
 class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
@@ -34,7 +38,7 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 	def __normalize_segments(
 		is_dir_pattern: bool,
 		pattern_segs: list[str],
-	) -> tuple[Optional[list[str]], Optional[str]]:
+	) -> tuple[Optional[list[str]], Optional[TailHint]]:
 		"""
 		Normalize the pattern segments to make processing easier.
 
@@ -48,7 +52,8 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 
 		- The normalized segments (:class:`list` of :class:`str`; or :data:`None`).
 
-		- The regular expression override (:class:`str` or :data:`None`).
+		- The tail of the special case pattern without segments (:class:`str` or
+		  :data:`None`). See :class:`.GitIgnorePatternIR`.
 		"""
 		if not pattern_segs[0]:
 			# A pattern beginning with a slash ('/') should match relative to the root
@@ -95,10 +100,10 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 			if is_dir_pattern:
 				# The pattern "**/" will be normalized to "**", but it should match
 				# everything except for files in the root. Special case this pattern.
-				return (None, '/')
+				return (None, 'descendants')
 			else:
 				# The pattern "**" will match every path. Special case this pattern.
-				return (None, '.')
+				return (None, 'path')
 
 		elif (
 			seg_count == 2
@@ -107,7 +112,7 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 		):
 			# The pattern "*" will be normalized to "**/*" and will match every
 			# path. Special case this pattern for efficiency.
-			return (None, '.')
+			return (None, 'path')
 
 		elif (
 			seg_count == 3
@@ -118,38 +123,26 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 			# The pattern "*/" will be normalized to "**/*/**" which will match every
 			# file not in the root directory. Special case this pattern for
 			# efficiency.
-			return (None, '/')
+			return (None, 'descendants')
 
-		# No regular expression override, return modified pattern segments.
+		# No special case, return modified pattern segments.
 		return (pattern_segs, None)
 
 	@override
 	@classmethod
-	def pattern_to_regex(
-		cls,
-		pattern: AnyStr,
-	) -> tuple[Optional[AnyStr], Optional[bool]]:
+	def _pattern_to_ir(cls, pattern: AnyStr) -> Optional[GitIgnorePatternIR]:
 		"""
-		Convert the pattern into a regular expression.
-
-		*pattern* (:class:`str` or :class:`bytes`) is the pattern to convert into a
-		regular expression.
-
-		Returns a :class:`tuple` containing:
+		Parse the pattern into its intermediate representation.
 
-			-	*pattern* (:class:`str`, :class:`bytes` or :data:`None`) is the
-				uncompiled regular expression.
+		*pattern* (:class:`str` or :class:`bytes`) is the pattern to parse.
 
-			-	*include* (:class:`bool` or :data:`None`) is whether matched files
-				should be included (:data:`True`), excluded (:data:`False`), or is a
-				null-operation (:data:`None`).
+		Returns the intermediate representation (:class:`.GitIgnorePatternIR`), or
+		:data:`None` if the pattern is a null-operation.
 		"""
 		if isinstance(pattern, str):
 			pattern_str = pattern
-			return_type = str
 		elif isinstance(pattern, bytes):
 			pattern_str = pattern.decode(_BYTES_ENCODING)
-			return_type = bytes
 		else:
 			raise TypeError(f"{pattern=!r} is not a unicode or byte string.")
 
@@ -165,19 +158,18 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 			# removed).
 			pattern_str = pattern_str.rstrip()
 
-		regex: Optional[str]
-		include: Optional[bool]
+		include: bool
 
 		if not pattern_str:
 			# A blank pattern is a null-operation (neither includes nor excludes
 			# files).
-			return (None, None)
+			return None
 
 		elif pattern_str.startswith('#'):
 			# A pattern starting with a hash ('#') serves as a comment (neither
 			# includes nor excludes files). Escape the hash with a backslash to match
 			# a literal hash (i.e., '\#').
-			return (None, None)
+			return None
 
 		if pattern_str.startswith('!'):
 			# A pattern starting with an exclamation mark ('!') negates the pattern
@@ -206,7 +198,7 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 
 		# Normalize pattern to make processing easier.
 		try:
-			pattern_segs, override_regex = cls.__normalize_segments(
+			pattern_segs, special_tail = cls.__normalize_segments(
 				is_dir_pattern, orig_segs,
 			)
 		except ValueError as e:
@@ -214,106 +206,99 @@ class GitIgnoreBasicPattern(_GitIgnoreBasePattern):
 				f"Invalid git pattern: {original_pattern!r}"
 			)) from e  # GitIgnorePatternError
 
-		if override_regex is not None:
-			# Use regex override.
-			regex = override_regex
+		if special_tail is not None:
+			# Use special case without segments.
+			return GitIgnorePatternIR(
+				anchored=False,
+				dir_mark=False,
+				dir_only=is_dir_pattern,
+				include=include,
+				segments=(),
+				tail=special_tail,
+			)
 
 		elif pattern_segs is not None:
-			# Build regular expression from pattern.
+			# Translate segments.
 			try:
-				regex_parts = cls.__translate_segments(pattern_segs)
+				anchored, segments, tail = cls.__translate_segments(pattern_segs)
 			except ValueError as e:
 				raise GitIgnorePatternError((
 					f"Invalid git pattern: {original_pattern!r}"
 				)) from e  # GitIgnorePatternError
 
-			regex = ''.join(regex_parts)
+			return GitIgnorePatternIR(
+				anchored=anchored,
+				dir_mark=False,
+				dir_only=is_dir_pattern,
+				include=include,
+				segments=segments,
+				tail=tail,
+			)
 
 		else:
 			assert_unreachable((
-				f"{override_regex=} and {pattern_segs=} cannot both be null."
+				f"{special_tail=} and {pattern_segs=} cannot both be null."
 			))  # assert_unreachable
 
-		# Encode regex if needed.
-		out_regex: AnyStr
-		if regex is not None and return_type is bytes:
-			regex_bytes = regex.encode(_BYTES_ENCODING)
-			out_regex = regex_bytes  # type: ignore[assignment]
-		else:
-			out_regex = regex  # type: ignore[assignment]
-
-		return (out_regex, include)
-
 	@classmethod
-	def __translate_segments(cls, pattern_segs: list[str]) -> list[str]:
+	def __translate_segments(
+		cls,
+		pattern_segs: list[str],
+	) -> tuple[bool, tuple[str, ...], TailHint]:
 		"""
 		Translate the pattern segments to regular expressions.
 
-		*pattern_segs* (:class:`list` of :class:`str`) contains the pattern
-		segments.
+		*pattern_segs* (:class:`list` of :class:`str`) contains the normalized
+		pattern segments.
 
-		Returns the regular expression parts (:class:`list` of :class:`str`).
+		Returns a :class:`tuple` containing whether the pattern is anchored
+		(:class:`bool`), the translated segments (:class:`tuple` of :class:`str`),
+		and the tail (:class:`str`). See :class:`.GitIgnorePatternIR`.
 		"""
-		# Build regular expression from pattern.
-		out_parts = []
-		need_slash = False
-		end = len(pattern_segs) - 1
-		for i, seg in enumerate(pattern_segs):
+		anchored = True
+		if pattern_segs[0] == '**':
+			# A normalized pattern beginning with double-asterisks ('**') will match
+			# any leading path segments.
+			# - NOTICE: '(?:^|/)' benchmarks slower using p15 (sm=0.9382,
+			#   hs=0.9966, re2=0.9337).
+			anchored = False
+			del pattern_segs[0]
+
+		tail: TailHint
+		if pattern_segs[-1] == '**':
+			# A normalized pattern ending with double-asterisks ('**') will match any
+			# trailing path segments.
+			tail = 'descendants'
+			del pattern_segs[-1]
+		elif pattern_segs[-1] == '*':
+			# A pattern ending with an asterisk ('*') will match a file or directory
+			# (without matching descendant paths). E.g., "foo/*" matches
+			# "foo/test.json", "foo/bar/", but not "foo/bar/hello.c".
+			tail = 'entry'
+		else:
+			# A pattern ending without a slash ('/') will match a file or a directory
+			# (with paths underneath it). E.g., "foo" matches "foo", "foo/bar",
+			# "foo/bar/baz", etc.
+			tail = 'path'
+
+		out_segs = []
+		for seg in pattern_segs:
 			if seg == '**':
-				if i == 0:
-					# A normalized pattern beginning with double-asterisks ('**') will
-					# match any leading path segments.
-					# - NOTICE: '(?:^|/)' benchmarks slower using p15 (sm=0.9382,
-					#   hs=0.9966, re2=0.9337).
-					out_parts.append('^(?:.+/)?')
-
-				elif i < end:
-					# A pattern with inner double-asterisks ('**') will match multiple (or
-					# zero) inner path segments.
-					out_parts.append('(?:/.+)?')
-					need_slash = True
-
-				else:
-					assert i == end, (i, end)
-					# A normalized pattern ending with double-asterisks ('**') will match
-					# any trailing path segments.
-					out_parts.append('/')
+				# A pattern with inner double-asterisks ('**') will match multiple (or
+				# zero) inner path segments.
+				out_segs.append(_INNER_SEGMENT)
+
+			elif seg == '*':
+				# Match whole path segment.
+				out_segs.append('[^/]+')
 
 			else:
-				# Match path segment.
-				if i == 0:
-					# Anchor to root directory.
-					out_parts.append('^')
-
-				if need_slash:
-					out_parts.append('/')
-
-				if seg == '*':
-					# Match whole path segment.
-					out_parts.append('[^/]+')
-
-				else:
-					# Match segment glob pattern.
-					# - EDGE CASE: The gitignore docs defer to *fnmatch(3)* which treats
-					#   invalid range notation as a literal.
-					out_parts.append(cls._translate_segment_glob(seg, 'literal'))
-
-				if i == end:
-					if seg == '*':
-						# A pattern ending with an asterisk ('*') will match a file or
-						# directory (without matching descendant paths). E.g., "foo/*"
-						# matches "foo/test.json", "foo/bar/", but not "foo/bar/hello.c".
-						out_parts.append('/?$')
-
-					else:
-						# A pattern ending without a slash ('/') will match a file or a
-						# directory (with paths underneath it). E.g., "foo" matches "foo",
-						# "foo/bar", "foo/bar/baz", etc.
-						out_parts.append('(?:/|$)')
-
-				need_slash = True
-
-		return out_parts
+				# Match segment glob pattern.
+				# - EDGE CASE: The gitignore docs defer to *fnmatch(3)* which treats
+				#   invalid range notation as a literal.
+				out_segs.append(cls._translate_segment_glob(seg, 'literal'))
+
+		return (anchored, tuple(out_segs), tail)
 
 
 # Register GitIgnoreBasicPattern as "gitignore".
@@ -0,0 +1,110 @@
+"""
+This module provides :class:`SparseConePattern` which implements the patterns of
+Git's `sparse-checkout`_ cone mode. Cone mode restricts the patterns to
+directories so they can be matched by looking up the parent directories of a
+path instead of matching globs.
+
+.. _`sparse-checkout`: https://git-scm.com/docs/git-sparse-checkout
+"""
+
+from typing import (
+	Literal,
+	Optional)  # Replaced by `X | None` in 3.10.
+
+from pathspec import util
+
+from .spec import (
+	GitIgnoreSpecPattern)
+from ._ir import (
+	_ESCAPE_RE,
+	_LITERAL_RE)
+
+ConeKindHint = Literal['children', 'recursive']
+"""
+The type hint for the kind of a cone-mode pattern:
+
+-	:data:`"children"`: The pattern matches the paths underneath the
+	subdirectories of the directory (e.g., "/A/\\*/" or "/\\*/").
+
+-	:data:`"recursive"`: The pattern matches the paths underneath the directory
+	(e.g., "/A/B/"), or every path for the root directory ("/\\*").
+"""
+
+_WHOLE_SEGMENT = '[^/]+'
+"""
+The translated glob matching a whole path segment ('*').
+"""
+
+
+class SparseConePattern(GitIgnoreSpecPattern):
+	"""
+	The :class:`SparseConePattern` class represents a compiled sparse-checkout
+	pattern. It matches the same as :class:`.GitIgnoreSpecPattern`. When every
+	pattern of a :class:`~pathspec.pathspec.PathSpec` is in the cone-mode format,
+	the best backend matches them by looking up the parent directories of each
+	path. Otherwise, the patterns are matched as globs. This is registered as
+	"sparse-cone".
+
+	The cone-mode format only uses the following patterns (optionally negated):
+
+	-	"/\\*": Match every path.
+
+	-	"/\\*/": Match every path in a subdirectory.
+
+	-	"/A/B/": Match every path underneath the directory.
+
+	-	"/A/B/\\*/": Match every path in a subdirectory of the directory.
+	"""
+
+	# Keep the dict-less class hierarchy.
+	__slots__ = ()
+
+	def _get_cone(self) -> Optional[tuple[ConeKindHint, str]]:
+		"""
+		.. warning:: This method is not part of the public API. It is subject to
+			change.
+
+		Get the cone-mode form of the pattern.
+
+		Returns a :class:`tuple` containing the kind of the pattern (:class:`str`),
+		and its directory key (:class:`str`) which is either empty for the root
+		directory or ends with a slash ('/'). This is :data:`None` if the pattern is
+		a null-operation, or is not in the cone-mode format.
+		"""
+		ir = self._get_ir()
+		if ir is None or not ir.anchored or not ir.segments:
+			return None
+
+		segments = ir.segments
+		kind: ConeKindHint
+		if ir.tail == 'path':
+			if segments != (_WHOLE_SEGMENT,):
+				return None
+
+			# The pattern "/*" matches every path.
+			return ('recursive', '')
+
+		elif ir.tail != 'descendants':
+			return None
+
+		elif segments[-1] == _WHOLE_SEGMENT:
+			kind = 'children'
+			segments = segments[:-1]
+
+		else:
+			kind = 'recursive'
+
+		dir_parts = []
+		for seg in segments:
+			if _LITERAL_RE.fullmatch(seg) is None:
+				# The segment is not a literal directory name.
+				return None
+
+			dir_parts.append(_ESCAPE_RE.sub(r'\1', seg))
+			dir_parts.append('/')
+
+		return (kind, ''.join(dir_parts))
+
+
+# Register SparseConePattern as "sparse-cone".
+util.register_pattern('sparse-cone', SparseConePattern)
@@ -22,22 +22,13 @@ from .base import (
 	_BYTES_ENCODING,
 	_GitIgnoreBasePattern,
 	_RangeError)
-
-_DIR_MARK = 'ps_d'
-"""
-The regex group name for the directory marker. This is only used by
-:class:`GitIgnoreSpec`.
-"""
-
-_DIR_MARK_CG = f'(?P<{_DIR_MARK}>/)'
-"""
-This regular expression matches the directory marker.
-"""
-
-_DIR_MARK_OPT = f'(?:{_DIR_MARK_CG}|$)'
-"""
-This regular expression matches the optional directory marker and sub-path.
-"""
+from ._ir import (
+	GitIgnorePatternIR,
+	TailHint,
+	_DIR_MARK,
+	_DIR_MARK_CG,
+	_DIR_MARK_OPT,
+	_INNER_SEGMENT)
 
 
 class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
@@ -53,11 +44,60 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 	# Keep the dict-less class hierarchy.
 	__slots__ = ()
 
+	@override
+	def _split_priority_regex(self, regex: str) -> tuple[str, Optional[str], int]:
+		"""
+		Split the regular expression to remove the directory marker capture group.
+		This is only used for a precompiled regular expression.
+
+		*regex* (:class:`str`) is the uncompiled regular expression.
+
+		Returns a :class:`tuple` containing the regular expression to match
+		(:class:`str`), the file variant to check when it matched (:class:`str` or
+		:data:`None`), and the priority when there is no file variant
+		(:class:`int`).
+		"""
+		if _DIR_MARK_CG not in regex:
+			# No directory marker. The pattern can only match by a file pattern.
+			return (regex, None, 2)
+		elif regex.endswith(_DIR_MARK_OPT):
+			# Regex has optional directory marker. Split regex into the match and file
+			# variants.
+			base_regex = regex[:-len(_DIR_MARK_OPT)]
+			return (f'{base_regex}(?:/|$)', f'{base_regex}$', 1)
+		else:
+			# Remove capture group. The pattern can only match by a directory pattern.
+			return (regex.replace(_DIR_MARK_CG, '/'), None, 1)
+
+	@override
+	def _split_regex_variants(self, regex: str) -> list[tuple[str, bool]]:
+		"""
+		Split the regular expression into the directory and file variants to remove
+		the directory marker capture group. This is only used for a precompiled
+		regular expression.
+
+		*regex* (:class:`str`) is the uncompiled regular expression.
+
+		Returns a :class:`list` containing each regular expression (:class:`str`),
+		and whether it matches by a directory pattern (:class:`bool`).
+		"""
+		if _DIR_MARK_CG not in regex:
+			# No directory marker.
+			return [(regex, False)]
+		elif regex.endswith(_DIR_MARK_OPT):
+			# Regex has optional directory marker. Split regex into directory and file
+			# variants.
+			base_regex = regex[:-len(_DIR_MARK_OPT)]
+			return [(f'{base_regex}/', True), (f'{base_regex}$', False)]
+		else:
+			# Remove capture group.
+			return [(regex.replace(_DIR_MARK_CG, '/'), True)]
+
 	@staticmethod
 	def __normalize_segments(
 		is_dir_pattern: bool,
 		pattern_segs: list[str],
-	) -> tuple[Optional[list[str]], Optional[str]]:
+	) -> tuple[Optional[list[str]], Optional[TailHint]]:
 		"""
 		Normalize the pattern segments to make processing easier.
 
@@ -71,7 +111,8 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 
 		- The normalized segments (:class:`list` of :class:`str`; or :data:`None`).
 
-		- The regular expression override (:class:`str` or :data:`None`).
+		- The tail of the special case pattern without segments (:class:`str` or
+		  :data:`None`). See :class:`.GitIgnorePatternIR`.
 		"""
 		if not pattern_segs[0]:
 			# A pattern beginning with a slash ('/') should match relative to the root
@@ -118,10 +159,10 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 			if is_dir_pattern:
 				# The pattern "**/" will be normalized to "**", but it should match
 				# everything except for files in the root. Special case this pattern.
-				return (None, _DIR_MARK_CG)
+				return (None, 'descendants')
 			else:
 				# The pattern "**" will match every path. Special case this pattern.
-				return (None, '.')
+				return (None, 'path')
 
 		elif (
 			seg_count == 2
@@ -130,7 +171,7 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 		):
 			# The pattern "*" will be normalized to "**/*" and will match every
 			# path. Special case this pattern for efficiency.
-			return (None, '.')
+			return (None, 'path')
 
 		elif (
 			seg_count == 3
@@ -141,41 +182,26 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 			# The pattern "*/" will be normalized to "**/*/**" which will match every
 			# file not in the root directory. Special case this pattern for
 			# efficiency.
-			if is_dir_pattern:
-				return (None, _DIR_MARK_CG)
-			else:
-				return (None, '/')
+			return (None, 'descendants')
 
-		# No regular expression override, return modified pattern segments.
+		# No special case, return modified pattern segments.
 		return (pattern_segs, None)
 
 	@override
 	@classmethod
-	def pattern_to_regex(
-		cls,
-		pattern: AnyStr,
-	) -> tuple[Optional[AnyStr], Optional[bool]]:
+	def _pattern_to_ir(cls, pattern: AnyStr) -> Optional[GitIgnorePatternIR]:
 		"""
-		Convert the pattern into a regular expression.
-
-		*pattern* (:class:`str` or :class:`bytes`) is the pattern to convert into a
-		regular expression.
-
-		Returns a :class:`tuple` containing:
+		Parse the pattern into its intermediate representation.
 
-			-	*pattern* (:class:`str`, :class:`bytes` or :data:`None`) is the
-				uncompiled regular expression.
+		*pattern* (:class:`str` or :class:`bytes`) is the pattern to parse.
 
-			-	*include* (:class:`bool` or :data:`None`) is whether matched files
-				should be included (:data:`True`), excluded (:data:`False`), or is a
-				null-operation (:data:`None`).
+		Returns the intermediate representation (:class:`.GitIgnorePatternIR`), or
+		:data:`None` if the pattern is a null-operation.
 		"""
 		if isinstance(pattern, str):
 			pattern_str = pattern
-			return_type = str
 		elif isinstance(pattern, bytes):
 			pattern_str = pattern.decode(_BYTES_ENCODING)
-			return_type = bytes
 		else:
 			raise TypeError(f"{pattern=!r} is not a unicode or byte string.")
 
@@ -191,24 +217,23 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 			# removed). Git does not remove leading spaces.
 			pattern_str = pattern_str.rstrip()
 
-		regex: Optional[str]
-		include: Optional[bool]
+		include: bool
 
 		if not pattern_str:
 			# A blank pattern is a null-operation (neither includes nor excludes
 			# files).
-			return (None, None)
+			return None
 
 		elif pattern_str.startswith('#'):
 			# A pattern starting with a hash ('#') serves as a comment (neither
 			# includes nor excludes files). Escape the hash with a backslash to match
 			# a literal hash (i.e., '\#').
-			return (None, None)
+			return None
 
 		elif pattern_str == '/':
 			# EDGE CASE: According to `git check-ignore` (v2.4.1), a single '/' does
 			# not match any file.
-			return (None, None)
+			return None
 
 		if pattern_str.startswith('!'):
 			# A pattern starting with an exclamation mark ('!') negates the pattern
@@ -229,7 +254,7 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 
 		# Normalize pattern to make processing easier.
 		try:
-			pattern_segs, override_regex = cls.__normalize_segments(
+			pattern_segs, special_tail = cls.__normalize_segments(
 				is_dir_pattern, orig_segs,
 			)
 		except ValueError as e:
@@ -237,108 +262,93 @@ class GitIgnoreSpecPattern(_GitIgnoreBasePattern):
 				f"Invalid git pattern: {original_pattern!r}"
 			)) from e  # GitIgnorePatternError
 
-		if override_regex is not None:
-			# Use regex override.
-			regex = override_regex
+		if special_tail is not None:
+			# Use special case without segments.
+			return GitIgnorePatternIR(
+				anchored=False,
+				dir_mark=True,
+				dir_only=is_dir_pattern,
+				include=include,
+				segments=(),
+				tail=special_tail,
+			)
 
 		elif pattern_segs is not None:
-			# Build regular expression from pattern.
+			# Translate segments.
 			try:
-				regex_parts = cls.__translate_segments(is_dir_pattern, pattern_segs)
+				anchored, segments, tail = cls.__translate_segments(pattern_segs)
 			except _RangeError:
 				# EDGE CASE: Git discards patterns with invalid range notation.
-				return (None, None)
+				return None
 			except ValueError as e:
 				raise GitIgnorePatternError((
 					f"Invalid git pattern: {original_pattern!r}"
 				)) from e  # GitIgnorePatternError
 
-			regex = ''.join(regex_parts)
+			return GitIgnorePatternIR(
+				anchored=anchored,
+				dir_mark=True,
+				dir_only=is_dir_pattern,
+				include=include,
+				segments=segments,
+				tail=tail,
+			)
 
 		else:
 			assert_unreachable((
-				f"{override_regex=} and {pattern_segs=} cannot both be null."
+				f"{special_tail=} and {pattern_segs=} cannot both be null."
 			))  # assert_unreachable
 
-		# Encode regex if needed.
-		out_regex: AnyStr
-		if regex is not None and return_type is bytes:
-			regex_bytes = regex.encode(_BYTES_ENCODING)
-			out_regex = regex_bytes  # type: ignore[assignment]
-		else:
-			out_regex = regex  # type: ignore[assignment]
-
-		return (out_regex, include)
-
 	@classmethod
 	def __translate_segments(
 		cls,
-		is_dir_pattern: bool,
 		pattern_segs: list[str],
-	) -> list[str]:
+	) -> tuple[bool, tuple[str, ...], TailHint]:
 		"""
 		Translate the pattern segments to regular expressions.
 
-		*is_dir_pattern* (:class:`bool`) is whether the pattern is a directory
-		pattern (i.e., ends with a slash '/').
-
-		*pattern_segs* (:class:`list` of :class:`str`) contains the pattern
-		segments.
+		*pattern_segs* (:class:`list` of :class:`str`) contains the normalized
+		pattern segments.
 
 		Raises :class:`_RangeError` if invalid range notation is found.
 
-		Returns the regular expression parts (:class:`list` of :class:`str`).
+		Returns a :class:`tuple` containing whether the pattern is anchored
+		(:class:`bool`), the translated segments (:class:`tuple` of :class:`str`),
+		and the tail (:class:`str`). See :class:`.GitIgnorePatternIR`.
 		"""
-		# Build regular expression from pattern.
-		out_parts = []
-		need_slash = False
-		end = len(pattern_segs) - 1
-		for i, seg in enumerate(pattern_segs):
-			if seg == '**':
-				if i == 0:
-					# A normalized pattern beginning with double-asterisks ('**') will
-					# match any leading path segments.
-					out_parts.append('^(?:.+/)?')
-
-				elif i < end:
-					# A pattern with inner double-asterisks ('**') will match multiple (or
-					# zero) inner path segments.
-					out_parts.append('(?:/.+)?')
-					need_slash = True
-
-				else:
-					assert i == end, (i, end)
-					# A normalized pattern ending with double-asterisks ('**') will match
-					# any trailing path segments.
-					if is_dir_pattern:
-						out_parts.append(_DIR_MARK_CG)
-					else:
-						out_parts.append('/')
-
-			else:
-				# Match path segment.
-				if i == 0:
-					# Anchor to root directory.
-					out_parts.append('^')
-
-				if need_slash:
-					out_parts.append('/')
+		anchored = True
+		if pattern_segs[0] == '**':
+			# A normalized pattern beginning with double-asterisks ('**') will match
+			# any leading path segments.
+			anchored = False
+			del pattern_segs[0]
 
-				if seg == '*':
-					# Match whole path segment.
-					out_parts.append('[^/]+')
+		tail: TailHint
+		if pattern_segs[-1] == '**':
+			# A normalized pattern ending with double-asterisks ('**') will match any
+			# trailing path segments.
+			tail = 'descendants'
+			del pattern_segs[-1]
+		else:
+			# A pattern ending without a slash ('/') will match a file or a directory
+			# (with paths underneath it). E.g., "foo" matches "foo", "foo/bar",
+			# "foo/bar/baz", etc.
+			tail = 'path'
 
-				else:
-					# Match segment glob pattern.
-					# - EDGE CASE: Git discards patterns with invalid range notation.
-					out_parts.append(cls._translate_segment_glob(seg, 'raise'))
+		out_segs = []
+		for seg in pattern_segs:
+			if seg == '**':
+				# A pattern with inner double-asterisks ('**') will match multiple (or
+				# zero) inner path segments.
+				out_segs.append(_INNER_SEGMENT)
 
-				if i == end:
-					# A pattern ending without a slash ('/') will match a file or a
-					# directory (with paths underneath it). E.g., "foo" matches "foo",
-					# "foo/bar", "foo/bar/baz", etc.
-					out_parts.append(_DIR_MARK_OPT)
+			elif seg == '*':
+				# Match whole path segment.
+				out_segs.append('[^/]+')
 
-				need_slash = True
+			else:
+				# Match segment glob pattern.
+				# - EDGE CASE: Git discards patterns with invalid range notation.
+				out_segs.append(cls._translate_segment_glob(seg, 'raise'))
 
-		return out_parts
+		return (anchored, tuple(out_segs), tail)
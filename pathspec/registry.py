@@ -0,0 +1,270 @@
+"""
+This module provides :class:`.SpecRegistry` which interns compiled path-specs
+so identical pattern files share their compiled patterns and backend.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import sys
+import threading
+from collections import (
+	OrderedDict)
+from collections.abc import (
+	Iterable)
+from typing import (
+	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
+	Optional,  # Replaced by `X | None` in 3.10.
+	TypeVar,
+	Union,  # Replaced by `X | Y` in 3.10.
+	cast)
+
+from pathspec.backend import (
+	BackendNamesHint)
+from pathspec.gitignore import (
+	GitIgnoreSpec)
+from pathspec.pathspec import (
+	PathSpec)
+from pathspec.pattern import (
+	Pattern,
+	RegexPattern)
+from pathspec._typing import (
+	AnyStr)  # Removed in 3.18.
+
+TSpec = TypeVar("TSpec", bound=PathSpec)
+"""
+Type variable for the path-spec class.
+"""
+
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+"""
+The default approximate memory budget (in bytes) of a :class:`.SpecRegistry`.
+"""
+
+_REGEX_SIZE_FACTOR = 12
+"""
+The approximate memory used by a compiled pattern and its backend data relative
+to the size of its regular expression. This was measured with
+:mod:`tracemalloc` for each backend.
+"""
+
+_RegistryKey = tuple[type, object, str, bytes]
+"""
+The type hint for a registry key:
+
+-	*0* (:class:`type`) is the path-spec class.
+
+-	*1* (:class:`object`) is the pattern factory.
+
+-	*2* (:class:`str`) is the backend name.
+
+-	*3* (:class:`bytes`) is the fingerprint of the pattern lines.
+"""
+
+
+class SpecRegistry(object):
+	"""
+	The :class:`SpecRegistry` class interns compiled path-specs by the content
+	of their pattern lines, pattern factory, and backend. Path-specs created from
+	identical pattern lines share their compiled patterns and backend. The least
+	recently used path-specs are evicted when the approximate memory budget is
+	exceeded.
+
+	The registry is thread-safe.
+	"""
+
+	def __init__(self, max_memory: Optional[int] = None) -> None:
+		"""
+		Initializes the :class:`SpecRegistry` instance.
+
+		*max_memory* (:class:`int` or :data:`None`) is the approximate memory budget
+		(in bytes) of the compiled path-specs. Default is :data:`None` for
+		:data:`DEFAULT_MAX_MEMORY`.
+		"""
+		if max_memory is None:
+			max_memory = DEFAULT_MAX_MEMORY
+		elif max_memory < 0:
+			raise ValueError(f"max_memory:{max_memory!r} cannot be negative.")
+
+		self._lock = threading.Lock()
+		"""
+		*_lock* (:class:`threading.Lock`) synchronizes access to the registry.
+		"""
+
+		self._memory = 0
+		"""
+		*_memory* (:class:`int`) is the approximate memory (in bytes) used by the
+		compiled path-specs.
+		"""
+
+		self._specs: OrderedDict[_RegistryKey, tuple[PathSpec, int]] = OrderedDict()
+		"""
+		*_specs* (:class:`~collections.OrderedDict`) maps registry key
+		(:class:`tuple`) to the compiled path-spec (:class:`.PathSpec`) and its
+		approximate memory (:class:`int`). The least recently used path-spec is
+		first.
+		"""
+
+		self.max_memory: int = max_memory
+		"""
+		*max_memory* (:class:`int`) is the approximate memory budget (in bytes) of
+		the compiled path-specs.
+		"""
+
+	def __len__(self) -> int:
+		"""
+		Returns the number of compiled path-specs in the registry (:class:`int`).
+		"""
+		return len(self._specs)
+
+	def clear(self) -> None:
+		"""
+		Remove all compiled path-specs from the registry.
+		"""
+		with self._lock:
+			self._specs.clear()
+			self._memory = 0
+
+	def from_lines(
+		self,
+		spec_class: type[TSpec],
+		pattern_factory: Union[str, type[Pattern], Callable[[AnyStr], Pattern], None],
+		lines: Iterable[AnyStr],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+	) -> TSpec:
+		"""
+		Get the path-spec for the pattern lines. The path-spec is only compiled if
+		identical pattern lines were not already compiled.
+
+		*spec_class* (:class:`type`) is the path-spec class (:class:`.PathSpec` or
+		a subclass such as :class:`.GitIgnoreSpec`).
+
+		*pattern_factory* is the pattern factory passed to the
+		:meth:`~.PathSpec.from_lines` method of *spec_class*.
+
+		*lines* (:class:`~collections.abc.Iterable`) yields each uncompiled pattern
+		(:class:`str` or :class:`bytes`).
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (regular expression)
+		matching backend to use. Default is :data:`None` for "best" to use the best
+		available backend.
+
+		Returns the path-spec (*spec_class*). This is a shallow copy of the
+		interned path-spec. It shares the compiled patterns and backend so adding
+		patterns to it will not affect other path-specs.
+		"""
+		line_list = list(lines)
+		if backend is None:
+			backend = 'best'
+
+		key: _RegistryKey = (
+			spec_class, pattern_factory, backend, _fingerprint_lines(line_list),
+		)
+		with self._lock:
+			entry = self._specs.get(key)
+			if entry is not None:
+				self._specs.move_to_end(key)
+
+		if entry is None:
+			# Compile the path-spec outside of the lock so compiling one path-spec does
+			# not block the others.
+			spec: TSpec
+			if pattern_factory is None:
+				# Only a path-spec class with a default pattern factory (i.e.,
+				# GitIgnoreSpec) accepts no factory.
+				if not issubclass(spec_class, GitIgnoreSpec):
+					raise TypeError(f"{pattern_factory=!r} requires {spec_class=!r} to be a GitIgnoreSpec.")
+
+				spec = spec_class.from_lines(line_list, backend=backend)
+			else:
+				# The overloads of `PathSpec.from_lines()` return `PathSpec` instead of
+				# the class it was called on.
+				spec = cast(TSpec, spec_class.from_lines(
+					pattern_factory, line_list, backend=backend,
+				))
+			spec.patterns = tuple(spec.patterns)
+			entry = (spec, _estimate_spec_memory(spec))
+
+			with self._lock:
+				# Another thread may have compiled the same path-spec.
+				entry = self._specs.setdefault(key, entry)
+				if entry[0] is spec:
+					self._memory += entry[1]
+					self._evict()
+
+		return copy.copy(entry[0])  # type: ignore[return-value]
+
+	@property
+	def memory(self) -> int:
+		"""
+		*memory* (:class:`int`) is the approximate memory (in bytes) used by the
+		compiled path-specs.
+		"""
+		return self._memory
+
+	def _evict(self) -> None:
+		"""
+		Evict the least recently used path-specs until the approximate memory is
+		within the budget. The most recently used path-spec is always kept. The
+		lock must be held.
+		"""
+		specs = self._specs
+		while self._memory > self.max_memory and len(specs) > 1:
+			_key, (_spec, memory) = specs.popitem(last=False)
+			self._memory -= memory
+
+
+def _estimate_spec_memory(spec: PathSpec) -> int:
+	"""
+	Estimate the memory used by the path-spec.
+
+	*spec* (:class:`.PathSpec`) is the path-spec.
+
+	Returns the approximate memory (in bytes) used by the compiled patterns and
+	backend (:class:`int`).
+	"""
+	memory = sys.getsizeof(spec.patterns)
+	for pattern in spec.patterns:
+		memory += sys.getsizeof(pattern)
+		if isinstance(pattern, RegexPattern):
+			memory += sys.getsizeof(pattern.pattern)
+			if (raw_regex := pattern.raw_regex) is not None:
+				memory += sys.getsizeof(raw_regex) * _REGEX_SIZE_FACTOR
+
+	return memory
+
+
+def _fingerprint_lines(lines: Iterable[Union[str, bytes]]) -> bytes:
+	"""
+	Generate the fingerprint of the pattern lines.
+
+	*lines* (:class:`~collections.abc.Iterable`) yields each uncompiled pattern
+	(:class:`str` or :class:`bytes`).
+
+	Returns the fingerprint (:class:`bytes`).
+	"""
+	hasher = hashlib.blake2b(digest_size=16)
+	for line in lines:
+		if not line:
+			# Empty lines are skipped by `PathSpec.from_lines()`.
+			continue
+
+		# Prefix each line with its type and length to keep the encoding
+		# unambiguous.
+		if isinstance(line, str):
+			line_bytes = line.encode('utf8', 'surrogatepass')
+			hasher.update(f's{len(line_bytes)}:'.encode('ascii'))
+		else:
+			line_bytes = line
+			hasher.update(f'b{len(line_bytes)}:'.encode('ascii'))
+
+		hasher.update(line_bytes)
+
+	return hasher.digest()
+
+
+default_registry = SpecRegistry()
+"""
+*default_registry* (:class:`SpecRegistry`) is the process-wide registry.
+"""
@@ -0,0 +1,242 @@
+"""
+This module provides :class:`.PathSpecMap` which maps files to the value of the
+last pattern that matched them (e.g., for *CODEOWNERS* or *.gitattributes*).
+"""
+from __future__ import annotations
+
+from collections.abc import (
+	Collection,
+	Iterable,
+	Iterator,
+	Sequence)
+from typing import (
+	Callable,  # Replaced by `collections.abc.Callable` in 3.9.2.
+	Generic,
+	Optional,  # Replaced by `X | None` in 3.10.
+	TypeVar,
+	Union,  # Replaced by `X | Y` in 3.10.
+	cast)
+
+from pathspec import util
+from pathspec.backend import (
+	BackendNamesHint,
+	_Backend)
+from pathspec._backends.agg import (
+	make_pathspec_backend)
+from pathspec.pattern import (
+	Pattern)
+from pathspec.patterns.gitignore.base import (
+	_GitIgnoreBasePattern)
+from pathspec._typing import (
+	AnyStr)  # Removed in 3.18.
+from pathspec.util import (
+	StrPath,
+	TStrPath,
+	_is_iterable,
+	normalize_file)
+
+Self = TypeVar("Self", bound='PathSpecMap')
+"""
+:class:`.PathSpecMap` self type hint to support Python v<3.11 using PEP 673
+recommendation.
+"""
+
+TValue = TypeVar("TValue")
+"""
+Type variable for the value of a pattern.
+"""
+
+
+class PathSpecMap(Generic[TValue]):
+	"""
+	The :class:`PathSpecMap` class associates a value with each compiled
+	:class:`.Pattern`. A file is mapped to the value of the last pattern that
+	matched it (i.e., the last matching rule wins). The patterns are matched the
+	same as :class:`.PathSpec` using a single backend for all of the patterns.
+	"""
+
+	def __init__(
+		self,
+		items: Iterable[tuple[Pattern, TValue]],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+	) -> None:
+		"""
+		Initializes the :class:`.PathSpecMap` instance.
+
+		*items* (:class:`~collections.abc.Iterable` of :class:`tuple`) contains
+		each compiled pattern (:class:`.Pattern`), and its value.
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (regular expression)
+		matching backend to use. Default is :data:`None` for "best" to use the best
+		available backend. Priority of backends is: "re2", "hyperscan", "simple".
+		The "simple" backend is always available.
+		"""
+		patterns: list[Pattern] = []
+		values: list[TValue] = []
+		for pattern, value in items:
+			patterns.append(pattern)
+			values.append(value)
+
+		if backend is None:
+			backend = 'best'
+
+		backend_name = cast(BackendNamesHint, backend)
+
+		self._backend: _Backend = make_pathspec_backend(backend_name, patterns)
+		"""
+		*_backend* (:class:`._Backend`) is the pattern (regular expression) matching
+		backend.
+		"""
+
+		self._backend_name: BackendNamesHint = backend_name
+		"""
+		*_backend_name* (:class:`str`) is the name of backend to use.
+		"""
+
+		self.patterns: Sequence[Pattern] = patterns
+		"""
+		*patterns* (:class:`~collections.abc.Sequence` of :class:`.Pattern`)
+		contains the compiled patterns.
+		"""
+
+		self.values: Sequence[TValue] = values
+		"""
+		*values* (:class:`~collections.abc.Sequence`) contains the value of each
+		pattern in :attr:`self.patterns <.PathSpecMap.patterns>`.
+		"""
+
+	def __len__(self) -> int:
+		"""
+		Returns the number of :attr:`self.patterns <.PathSpecMap.patterns>` this
+		path-spec map contains (:class:`int`).
+		"""
+		return len(self.patterns)
+
+	def __repr__(self) -> str:
+		"""
+		Returns a debug representation of this path-spec map.
+		"""
+		items = list(zip(self.patterns, self.values))
+		return f"{self.__class__.__name__}(items={items!r}, backend={self._backend_name!r})"
+
+	@classmethod
+	def from_lines(
+		cls: type[Self],
+		pattern_factory: Union[str, type[Pattern], Callable[[AnyStr], Pattern]],
+		items: Iterable[tuple[AnyStr, TValue]],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+	) -> Self:
+		"""
+		Compiles the pattern lines.
+
+		*pattern_factory* can be either the name of a registered pattern factory
+		(:class:`str`), or a :class:`~collections.abc.Callable` used to compile
+		patterns. It must accept an uncompiled pattern (:class:`str`) and return the
+		compiled pattern (:class:`.Pattern`).
+
+		*items* (:class:`~collections.abc.Iterable` of :class:`tuple`) yields each
+		uncompiled pattern (:class:`str`), and its value. An item with an empty
+		pattern is skipped.
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (or regular
+		expression) matching backend to use. Default is :data:`None` for "best" to
+		use the best available backend.
+
+		Returns the :class:`PathSpecMap` instance.
+		"""
+		use_factory: Callable[[AnyStr], Pattern]
+		if isinstance(pattern_factory, str):
+			use_factory = util.lookup_pattern(pattern_factory)
+		elif callable(pattern_factory):
+			# A pattern class is used as a factory accepting the line.
+			use_factory = cast(Callable[[AnyStr], Pattern], pattern_factory)
+		else:
+			raise TypeError(f"pattern_factory:{pattern_factory!r} is not callable.")
+
+		if not _is_iterable(items):
+			raise TypeError(f"items:{items!r} is not an iterable.")
+
+		use_items = [__item for __item in items if __item[0]]
+		lines = [__line for __line, _value in use_items]
+
+		# Check the class of the factory through another name so the type of
+		# `use_factory` is not narrowed.
+		factory_cls: object = use_factory
+		patterns: Sequence[Pattern]
+		if isinstance(factory_cls, type) and issubclass(factory_cls, _GitIgnoreBasePattern):
+			# Compile gitignore patterns in bulk.
+			patterns = factory_cls.compile_lines(lines)
+		else:
+			patterns = [use_factory(__line) for __line in lines]
+
+		return cls(
+			zip(patterns, [__value for _line, __value in use_items]),
+			backend=backend,
+		)
+
+	def lookup(
+		self,
+		file: StrPath,
+		separators: Optional[Collection[str]] = None,
+	) -> Optional[TValue]:
+		"""
+		Get the value for the file.
+
+		*file* (:class:`str` or :class:`os.PathLike`) is the file path to be matched
+		against :attr:`self.patterns <.PathSpecMap.patterns>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		Returns the value of the last pattern that matched *file*, or :data:`None`
+		if no pattern matched or the last pattern that matched is negated.
+		"""
+		norm_file = normalize_file(file, separators)
+		include, index = self._backend.match_file(norm_file)
+		if include:
+			assert index is not None, (include, index)
+			return self.values[index]
+		else:
+			return None
+
+	def lookup_files(
+		self,
+		files: Iterable[TStrPath],
+		separators: Optional[Collection[str]] = None,
+		*,
+		presorted: Optional[bool] = None,
+	) -> Iterator[tuple[TStrPath, Optional[TValue]]]:
+		"""
+		Get the value for each file.
+
+		*files* (:class:`~collections.abc.Iterable` of :class:`str` or
+		:class:`os.PathLike`) contains the file paths to be matched against
+		:attr:`self.patterns <.PathSpecMap.patterns>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		*presorted* (:class:`bool` or :data:`None`) is whether the files are sorted
+		(or grouped by directory). See :meth:`.PathSpec.check_files`.
+
+		Returns an :class:`~collections.abc.Iterator` yielding a :class:`tuple` for
+		each file containing the file path (:class:`str` or :class:`os.PathLike`),
+		and its value (see :meth:`.PathSpecMap.lookup`).
+		"""
+		if not _is_iterable(files):
+			raise TypeError(f"files:{files!r} is not an iterable.")
+
+		values = self.values
+		match_file = self._backend.make_batch_matcher(presorted=presorted)
+		for orig_file in files:
+			norm_file = normalize_file(orig_file, separators)
+			include, index = match_file(norm_file)
+			if include:
+				assert index is not None, (include, index)
+				yield (orig_file, values[index])
+			else:
+				yield (orig_file, None)
@@ -0,0 +1,182 @@
+"""
+This module provides :class:`.PathSpecSet` which checks files against many
+path-specs at once.
+"""
+from __future__ import annotations
+
+from collections.abc import (
+	Collection,
+	Iterable,
+	Iterator,
+	Sequence)
+from typing import (
+	Optional,  # Replaced by `X | None` in 3.10.
+	Union,  # Replaced by `X | Y` in 3.10.
+	cast)
+
+from pathspec.backend import (
+	BackendNamesHint,
+	_SetBackend)
+from pathspec._backends.agg import (
+	make_specset_backend)
+from pathspec.gitignore import (
+	GitIgnoreSpec)
+from pathspec.pathspec import (
+	PathSpec)
+from pathspec.util import (
+	CheckResult,
+	StrPath,
+	TStrPath,
+	_is_iterable,
+	normalize_file)
+
+
+class PathSpecSet(object):
+	"""
+	The :class:`PathSpecSet` class checks files against many independent
+	:class:`.PathSpec` instances at once. The patterns of every path-spec are
+	compiled into a single backend, so each file is scanned once instead of once
+	per path-spec. A :class:`.GitIgnoreSpec` keeps its gitignore behavior.
+	"""
+
+	def __init__(
+		self,
+		specs: Iterable[PathSpec],
+		*,
+		backend: Union[BackendNamesHint, str, None] = None,
+	) -> None:
+		"""
+		Initializes the :class:`.PathSpecSet` instance.
+
+		*specs* (:class:`~collections.abc.Iterable` of :class:`.PathSpec`) contains
+		the path-specs. Each path-spec is identified by its index.
+
+		*backend* (:class:`str` or :data:`None`) is the pattern (regular expression)
+		matching backend to use. Default is :data:`None` for "best" to use the best
+		available backend. Priority of backends is: "re2", "hyperscan", "simple".
+		The "simple" backend is always available.
+		"""
+		use_specs = list(specs)
+		for spec in use_specs:
+			if not isinstance(spec, PathSpec):
+				raise TypeError(f"spec:{spec!r} is not a PathSpec.")
+
+		if backend is None:
+			backend = 'best'
+
+		backend_name = cast(BackendNamesHint, backend)
+
+		self._backend: _SetBackend = make_specset_backend(backend_name, [
+			(__spec.patterns, isinstance(__spec, GitIgnoreSpec))
+			for __spec in use_specs
+		])
+		"""
+		*_backend* (:class:`._SetBackend`) is the pattern (regular expression)
+		matching backend.
+		"""
+
+		self._backend_name: BackendNamesHint = backend_name
+		"""
+		*_backend_name* (:class:`str`) is the name of backend to use.
+		"""
+
+		self.specs: Sequence[PathSpec] = use_specs
+		"""
+		*specs* (:class:`~collections.abc.Sequence` of :class:`.PathSpec`) contains
+		the path-specs.
+		"""
+
+	def __len__(self) -> int:
+		"""
+		Returns the number of :attr:`self.specs <.PathSpecSet.specs>` this set
+		contains (:class:`int`).
+		"""
+		return len(self.specs)
+
+	def __repr__(self) -> str:
+		"""
+		Returns a debug representation of this path-spec set.
+		"""
+		return f"{self.__class__.__name__}(specs={self.specs!r}, backend={self._backend_name!r})"
+
+	def check_file(
+		self,
+		file: TStrPath,
+		separators: Optional[Collection[str]] = None,
+	) -> dict[int, CheckResult[TStrPath]]:
+		"""
+		Check the file against each path-spec.
+
+		*file* (:class:`str` or :class:`os.PathLike`) is the file path to be matched
+		against :attr:`self.specs <.PathSpecSet.specs>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		Returns a :class:`dict` mapping the index of each path-spec with a matched
+		pattern (:class:`int`) to its file check result (:class:`.CheckResult`).
+		"""
+		norm_file = normalize_file(file, separators)
+		return {
+			__spec_index: CheckResult(file, __include, __index)
+			for __spec_index, (__include, __index) in self._backend.match_file(norm_file).items()
+		}
+
+	def match_file(
+		self,
+		file: StrPath,
+		separators: Optional[Collection[str]] = None,
+	) -> list[int]:
+		"""
+		Matches the file to each path-spec.
+
+		*file* (:class:`str` or :class:`os.PathLike`) is the file path to be matched
+		against :attr:`self.specs <.PathSpecSet.specs>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		Returns the sorted indices of the path-specs which matched *file*
+		(:class:`list` of :class:`int`).
+		"""
+		norm_file = normalize_file(file, separators)
+		return sorted(
+			__spec_index
+			for __spec_index, (__include, _index) in self._backend.match_file(norm_file).items()
+			if __include
+		)
+
+	def match_files(
+		self,
+		files: Iterable[TStrPath],
+		separators: Optional[Collection[str]] = None,
+	) -> Iterator[tuple[TStrPath, list[int]]]:
+		"""
+		Matches the files to each path-spec.
+
+		*files* (:class:`~collections.abc.Iterable` of :class:`str` or
+		:class:`os.PathLike`) contains the file paths to be matched against
+		:attr:`self.specs <.PathSpecSet.specs>`.
+
+		*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+		:data:`None`) optionally contains the path separators to normalize. See
+		:func:`.normalize_file` for more information.
+
+		Returns an :class:`~collections.abc.Iterator` yielding a :class:`tuple` for
+		each file containing the file path (:class:`str` or :class:`os.PathLike`),
+		and the sorted indices of the path-specs which matched it (:class:`list` of
+		:class:`int`).
+		"""
+		if not _is_iterable(files):
+			raise TypeError(f"files:{files!r} is not an iterable.")
+
+		match_file = self._backend.match_file
+		for orig_file in files:
+			norm_file = normalize_file(orig_file, separators)
+			yield (orig_file, sorted(
+				__spec_index
+				for __spec_index, (__include, _index) in match_file(norm_file).items()
+				if __include
+			))
@@ -3,6 +3,7 @@ This module provides utility methods for dealing with path-specs.
 """
 from __future__ import annotations
 
+import mmap
 import os
 import os.path
 import pathlib
@@ -22,7 +23,8 @@ from typing import (
 	Optional,  # Replaced by `X | None` in 3.10.
 	TypeVar,
 	Union,  # Replaced by `X | Y` in 3.10.
-	cast)
+	cast,
+	overload)
 
 from .pattern import (
 	Pattern)
@@ -32,6 +34,8 @@ from ._typing import (
 
 StrPath = Union[str, os.PathLike[str]]
 
+BytesPath = Union[bytes, os.PathLike[bytes]]
+
 TPattern = TypeVar('TPattern', bound=Pattern)
 """
 Type variable for :class:`.Pattern`. This is used by :class:`pathspec.pathspec.PathSpec`
@@ -49,6 +53,11 @@ TStrPath = TypeVar('TStrPath', bound=StrPath)
 Type variable for :class:`str` or :class:`os.PathLike`.
 """
 
+TAnyPath = TypeVar('TAnyPath', bound=Union[StrPath, BytesPath])
+"""
+Type variable for :class:`str`, :class:`bytes` or :class:`os.PathLike`.
+"""
+
 NORMALIZE_PATH_SEPS = [
 	cast(str, __sep)
 	for __sep in [os.sep, os.altsep]
@@ -61,6 +70,33 @@ operating system. The separators are determined by examining :data:`os.sep` and
 :data:`os.altsep`.
 """
 
+_NORMALIZE_PATH_SEPS_BYTES = [os.fsencode(__sep) for __sep in NORMALIZE_PATH_SEPS]
+"""
+*_NORMALIZE_PATH_SEPS_BYTES* (:class:`list` of :class:`bytes`) contains
+:data:`NORMALIZE_PATH_SEPS` encoded for :class:`bytes` paths.
+"""
+
+_NORMALIZE_PREFIXES = ('/', './')
+"""
+*_NORMALIZE_PREFIXES* (:class:`tuple` of :class:`str`) contains the path
+prefixes removed by :func:`.normalize_file`.
+"""
+
+_TREE_FILES_NORMALIZED = not NORMALIZE_PATH_SEPS
+"""
+*_TREE_FILES_NORMALIZED* (:class:`bool`) is whether the paths yielded by
+:func:`.iter_tree_files` and :func:`.iter_tree_entries` are already normalized
+(see :func:`.normalize_file`). They are relative without a leading ``"./"``,
+and only need their separators normalized when the operating system does not
+use the POSIX separator.
+"""
+
+_PATH_LIST_CHUNK_SIZE = 1 << 20
+"""
+*_PATH_LIST_CHUNK_SIZE* (:class:`int`) is the default number of bytes of a path
+list split at once by :func:`.iter_path_list`.
+"""
+
 _registered_patterns: dict[str, Callable[[Union[str, bytes]], Pattern]] = {}
 """
 *_registered_patterns* (:class:`dict`) maps a name (:class:`str`) to the
@@ -112,7 +148,7 @@ def check_match_file(
 		# Check patterns in reverse order. The first pattern that matches takes
 		# precedence.
 		for index, pattern in patterns:
-			if pattern.include is not None and pattern.match_file(file) is not None:
+			if pattern.include is not None and pattern.matches_file(file):
 				return pattern.include, index
 
 		return None, None
@@ -122,7 +158,7 @@ def check_match_file(
 		out_include: Optional[bool] = None
 		out_index: Optional[int] = None
 		for index, pattern in patterns:
-			if pattern.include is not None and pattern.match_file(file) is not None:
+			if pattern.include is not None and pattern.matches_file(file):
 				out_include = pattern.include
 				out_index = index
 
@@ -150,12 +186,18 @@ def detailed_match_files(
 
 	Returns the matched files (:class:`dict`) which maps each matched file
 	(:class:`str`) to the patterns that matched in order (:class:`.MatchDetail`).
+
+	Each pattern is matched against every file. Use
+	:meth:`.PathSpec.detailed_match_files` to stream the results using the
+	backend of a path-spec instead.
 	"""
 	all_files = files if isinstance(files, Collection) else list(files)
 	return_files: dict[str, MatchDetail] = {}
 	for pattern in patterns:
 		if pattern.include is not None:
-			result_files = pattern.match(all_files)  # TODO: Replace with `.match_file()`.
+			result_files = [
+				__file for __file in all_files if pattern.match_file(__file) is not None
+			]
 			if pattern.include:
 				# Add files and record pattern.
 				for result_file in result_files:
@@ -207,6 +249,76 @@ def _is_iterable(value: Any) -> bool:
 	return isinstance(value, Iterable) and not isinstance(value, (str, bytes))
 
 
+def iter_path_list(
+	path_list: Union[StrPath, BytesPath],
+	delimiter: Optional[bytes] = None,
+	*,
+	chunk_size: Optional[int] = None,
+) -> Iterator[tuple[int, bytes]]:
+	"""
+	Read the paths from a file containing a list of delimited paths (e.g., the
+	output of ``git ls-files -z`` or ``find -print0``). The file is
+	memory-mapped, and split a chunk at a time so memory use does not depend on
+	the size of the file.
+
+	*path_list* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the
+	path to the file.
+
+	*delimiter* (:class:`bytes` or :data:`None`) is the single byte separating
+	the paths (e.g., ``b"\\n"``). Default is :data:`None` for ``b"\\0"``. Empty
+	paths are skipped.
+
+	*chunk_size* (:class:`int` or :data:`None`) is the number of bytes to split
+	at once. A chunk is extended to the end of a path which crosses its end.
+	Default is :data:`None` for 1 MiB.
+
+	Returns an :class:`~collections.abc.Iterator` yielding a :class:`tuple` for
+	each path containing its offset in the file (:class:`int`), and the path
+	(:class:`bytes`).
+	"""
+	if delimiter is None:
+		delimiter = b'\0'
+	elif not isinstance(delimiter, bytes) or len(delimiter) != 1:
+		raise ValueError(f"{delimiter=!r} must be a single byte.")
+
+	if chunk_size is None:
+		chunk_size = _PATH_LIST_CHUNK_SIZE
+	elif chunk_size < 1:
+		raise ValueError(f"{chunk_size=!r} must be positive.")
+
+	with open(path_list, 'rb') as fh:
+		try:
+			buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			# An empty file cannot be memory-mapped.
+			return
+
+	with buf:
+		buf_len = len(buf)
+		pos = 0
+		while pos < buf_len:
+			end = pos + chunk_size
+			if end >= buf_len:
+				end = buf_len
+			else:
+				# End the chunk after its last delimiter so no path is split. A path
+				# longer than the chunk extends it to its delimiter.
+				cut = buf.rfind(delimiter, pos, end)
+				if cut == -1:
+					cut = buf.find(delimiter, end)
+
+				end = buf_len if cut == -1 else cut + 1
+
+			offset = pos
+			for path in buf[pos:end].split(delimiter):
+				if path:
+					yield (offset, path)
+
+				offset += len(path) + 1
+
+			pos = end
+
+
 @deprecated((
 	"pathspec.util.iter_tree() is deprecated. Use iter_tree_files() instead."
 ))
@@ -219,14 +331,16 @@ def iter_tree(root, on_error=None, follow_links=None):
 
 
 def iter_tree_entries(
-	root: StrPath,
+	root: Union[StrPath, BytesPath],
 	on_error: Optional[Callable[[OSError], None]] = None,
 	follow_links: Optional[bool] = None,
 ) -> Iterator['TreeEntry']:
 	"""
 	Walks the specified directory for all files and directories.
 
-	*root* (:class:`str` or :class:`os.PathLike`) is the root directory to search.
+	*root* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the root
+	directory to search. If *root* is :class:`bytes`, the directories are scanned
+	as :class:`bytes` and the entry names and paths are :class:`bytes`.
 
 	*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally is
 	the error handler for file-system exceptions. It will be called with the
@@ -248,26 +362,32 @@ def iter_tree_entries(
 	if follow_links is None:
 		follow_links = True
 
-	yield from _iter_tree_entries_next(os.path.abspath(root), '', {}, on_error, follow_links)
+	root_full = os.path.abspath(root)
+	if isinstance(root_full, bytes):
+		yield from _iter_tree_entries_next(root_full, b'', {}, on_error, follow_links)
+	else:
+		yield from _iter_tree_entries_next(root_full, '', {}, on_error, follow_links)
 
 
 def _iter_tree_entries_next(
-	root_full: str,
-	dir_rel: str,
-	memo: dict[str, str],
+	root_full: AnyStr,
+	dir_rel: AnyStr,
+	memo: dict[AnyStr, AnyStr],
 	on_error: Optional[Callable[[OSError], None]],
 	follow_links: bool,
 ) -> Iterator['TreeEntry']:
 	"""
 	Scan the directory for all descendant files.
 
-	*root_full* (:class:`str`) the absolute path to the root directory.
+	*root_full* (:class:`str` or :class:`bytes`) the absolute path to the root
+	directory.
 
-	*dir_rel* (:class:`str`) the path to the directory to scan relative to
-	*root_full*.
+	*dir_rel* (:class:`str` or :class:`bytes`) the path to the directory to scan
+	relative to *root_full*.
 
 	*memo* (:class:`dict`) keeps track of ancestor directories encountered. Maps
-	each ancestor real path (:class:`str`) to relative path (:class:`str`).
+	each ancestor real path (:class:`str` or :class:`bytes`) to relative path
+	(:class:`str` or :class:`bytes`).
 
 	*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally is
 	the error handler for file-system exceptions.
@@ -277,7 +397,7 @@ def _iter_tree_entries_next(
 
 	Yields each entry (:class:`.TreeEntry`).
 	"""
-	dir_full = os.path.join(root_full, dir_rel)
+	dir_full = _join_path(root_full, dir_rel)
 	dir_real = os.path.realpath(dir_full)
 
 	# Remember each encountered ancestor directory and its canonical (real) path.
@@ -290,7 +410,7 @@ def _iter_tree_entries_next(
 	with os.scandir(dir_full) as scan_iter:
 		node_ent: os.DirEntry
 		for node_ent in scan_iter:
-			node_rel = os.path.join(dir_rel, node_ent.name)
+			node_rel = _join_path(dir_rel, node_ent.name)
 
 			# Inspect child node.
 			try:
@@ -330,16 +450,44 @@ def _iter_tree_entries_next(
 	del memo[dir_real]
 
 
+@overload
 def iter_tree_files(
 	root: StrPath,
 	on_error: Optional[Callable[[OSError], None]] = None,
 	follow_links: Optional[bool] = None,
 ) -> Iterator[str]:
+	...
+
+
+@overload
+def iter_tree_files(
+	root: BytesPath,
+	on_error: Optional[Callable[[OSError], None]] = None,
+	follow_links: Optional[bool] = None,
+) -> Iterator[bytes]:
+	...
+
+
+@overload
+def iter_tree_files(
+	root: Union[StrPath, BytesPath],
+	on_error: Optional[Callable[[OSError], None]] = None,
+	follow_links: Optional[bool] = None,
+) -> Iterator[Union[str, bytes]]:
+	...
+
+
+def iter_tree_files(
+	root: Union[StrPath, BytesPath],
+	on_error: Optional[Callable[[OSError], None]] = None,
+	follow_links: Optional[bool] = None,
+) -> Iterator[Union[str, bytes]]:
 	"""
 	Walks the specified directory for all files.
 
-	*root* (:class:`str` or :class:`os.PathLike`) is the root directory to search
-	for files.
+	*root* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the root
+	directory to search for files. If *root* is :class:`bytes`, the directories
+	are scanned as :class:`bytes` and the file paths are :class:`bytes`.
 
 	*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally is
 	the error handler for file-system exceptions. It will be called with the
@@ -353,7 +501,7 @@ def iter_tree_files(
 	Raises :exc:`.RecursionError` if recursion is detected.
 
 	Returns an :class:`~collections.abc.Iterator` yielding the path to each file
-	(:class:`str`) relative to *root*.
+	(:class:`str` or :class:`bytes`) relative to *root*.
 	"""
 	if on_error is not None and not callable(on_error):
 		raise TypeError(f"on_error:{on_error!r} is not callable.")
@@ -361,26 +509,32 @@ def iter_tree_files(
 	if follow_links is None:
 		follow_links = True
 
-	yield from _iter_tree_files_next(os.path.abspath(root), '', {}, on_error, follow_links)
+	root_full = os.path.abspath(root)
+	if isinstance(root_full, bytes):
+		yield from _iter_tree_files_next(root_full, b'', {}, on_error, follow_links)
+	else:
+		yield from _iter_tree_files_next(root_full, '', {}, on_error, follow_links)
 
 
 def _iter_tree_files_next(
-	root_full: str,
-	dir_rel: str,
-	memo: dict[str, str],
+	root_full: AnyStr,
+	dir_rel: AnyStr,
+	memo: dict[AnyStr, AnyStr],
 	on_error: Optional[Callable[[OSError], None]],
 	follow_links: bool,
-) -> Iterator[str]:
+) -> Iterator[AnyStr]:
 	"""
 	Scan the directory for all descendant files.
 
-	*root_full* (:class:`str`) the absolute path to the root directory.
+	*root_full* (:class:`str` or :class:`bytes`) the absolute path to the root
+	directory.
 
-	*dir_rel* (:class:`str`) the path to the directory to scan relative to
-	*root_full*.
+	*dir_rel* (:class:`str` or :class:`bytes`) the path to the directory to scan
+	relative to *root_full*.
 
 	*memo* (:class:`dict`) keeps track of ancestor directories encountered. Maps
-	each ancestor real path (:class:`str`) to relative path (:class:`str`).
+	each ancestor real path (:class:`str` or :class:`bytes`) to relative path
+	(:class:`str` or :class:`bytes`).
 
 	*on_error* (:class:`~collections.abc.Callable` or :data:`None`) optionally is
 	the error handler for file-system exceptions.
@@ -388,9 +542,9 @@ def _iter_tree_files_next(
 	*follow_links* (:class:`bool`) is whether to walk symbolic links that resolve
 	to directories.
 
-	Yields each file path (:class:`str`).
+	Yields each file path (:class:`str` or :class:`bytes`).
 	"""
-	dir_full = os.path.join(root_full, dir_rel)
+	dir_full = _join_path(root_full, dir_rel)
 	dir_real = os.path.realpath(dir_full)
 
 	# Remember each encountered ancestor directory and its canonical (real) path.
@@ -403,7 +557,7 @@ def _iter_tree_files_next(
 	with os.scandir(dir_full) as scan_iter:
 		node_ent: os.DirEntry
 		for node_ent in scan_iter:
-			node_rel = os.path.join(dir_rel, node_ent.name)
+			node_rel = _join_path(dir_rel, node_ent.name)
 
 			if node_ent.is_dir(follow_symlinks=follow_links):
 				# Child node is a directory, recurse into it and yield its descendant
@@ -426,6 +580,24 @@ def _iter_tree_files_next(
 	del memo[dir_real]
 
 
+def _join_path(path: AnyStr, name: AnyStr) -> AnyStr:
+	"""
+	Join the path and name with :func:`os.path.join`. Each type is narrowed
+	separately so :class:`str` and :class:`bytes` are never mixed.
+
+	*path* (:class:`str` or :class:`bytes`) is the path.
+
+	*name* (:class:`str` or :class:`bytes`) is the name to append to *path*.
+
+	Returns the joined path (:class:`str` or :class:`bytes`).
+	"""
+	if isinstance(path, bytes) and isinstance(name, bytes):
+		return os.path.join(path, name)
+	else:
+		assert isinstance(path, str) and isinstance(name, str), (path, name)
+		return os.path.join(path, name)
+
+
 def lookup_pattern(name: str) -> Callable[[AnyStr], Pattern]:
 	"""
 	Looks up a registered pattern factory by name.
@@ -491,15 +663,41 @@ def match_files(
 	return return_files
 
 
+@overload
 def normalize_file(
 	file: StrPath,
 	separators: Optional[Collection[str]] = None,
 ) -> str:
+	...
+
+
+@overload
+def normalize_file(
+	file: BytesPath,
+	separators: Optional[Collection[str]] = None,
+) -> bytes:
+	...
+
+
+@overload
+def normalize_file(
+	file: Union[StrPath, BytesPath],
+	separators: Optional[Collection[str]] = None,
+) -> Union[str, bytes]:
+	...
+
+
+def normalize_file(
+	file: Union[StrPath, BytesPath],
+	separators: Optional[Collection[str]] = None,
+) -> Union[str, bytes]:
 	"""
 	Normalizes the file path to use the POSIX path separator (i.e., ``"/"``), and
 	make the paths relative (remove leading ``"/"``).
 
-	*file* (:class:`str` or :class:`os.PathLike`) is the file path.
+	*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+	path. A :class:`bytes` path is normalized as :class:`bytes` without decoding
+	it.
 
 	*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
 	:data:`None`) optionally contains the path separators to normalize. This does
@@ -508,25 +706,134 @@ def normalize_file(
 	To prevent normalization, pass an empty container (e.g., an empty tuple
 	``()``).
 
-	Returns the normalized file path (:class:`str`).
+	Returns the normalized file path (:class:`str` or :class:`bytes`).
 	"""
+	# Convert path object to string.
+	norm_file = os.fspath(file)
+	if isinstance(norm_file, bytes):
+		return _normalize_bytes_file(norm_file, separators)
+
 	# Normalize path separators.
 	if separators is None:
 		separators = NORMALIZE_PATH_SEPS
 
 	assert separators is not None, separators
 
-	# Convert path object to string.
-	norm_file: str = os.fspath(file)
-
 	for sep in separators:
 		norm_file = norm_file.replace(sep, posixpath.sep)
 
-	if norm_file.startswith('/'):
+	# NOTICE: Most paths have neither prefix so check both at once.
+	if norm_file.startswith(_NORMALIZE_PREFIXES):
+		if norm_file[0] == '/':
+			# Make path relative.
+			norm_file = norm_file[1:]
+		else:
+			# Remove current directory prefix.
+			norm_file = norm_file[2:]
+
+	return norm_file
+
+
+@overload
+def normalize_file_batch(
+	files: Iterable[StrPath],
+	separators: Optional[Collection[str]] = None,
+) -> list[str]:
+	...
+
+
+@overload
+def normalize_file_batch(
+	files: Iterable[BytesPath],
+	separators: Optional[Collection[str]] = None,
+) -> list[bytes]:
+	...
+
+
+@overload
+def normalize_file_batch(
+	files: Iterable[Union[StrPath, BytesPath]],
+	separators: Optional[Collection[str]] = None,
+) -> Sequence[Union[str, bytes]]:
+	...
+
+
+def normalize_file_batch(
+	files: Iterable[Union[StrPath, BytesPath]],
+	separators: Optional[Collection[str]] = None,
+) -> Sequence[Union[str, bytes]]:
+	"""
+	Normalizes the file paths the same as :func:`.normalize_file` in one pass.
+
+	*files* (:class:`~collections.abc.Iterable` of :class:`str`, :class:`bytes`
+	or :class:`os.PathLike`) contains the file paths to normalize.
+
+	*separators* (:class:`~collections.abc.Collection` of :class:`str`; or
+	:data:`None`) optionally contains the path separators to normalize. See
+	:func:`.normalize_file` for more information.
+
+	Returns the normalized file paths (:class:`list` of :class:`str` or
+	:class:`bytes`) in the same order as *files*.
+	"""
+	if not _is_iterable(files):
+		raise TypeError(f"files:{files!r} is not an iterable.")
+
+	seps = NORMALIZE_PATH_SEPS if separators is None else separators
+	fspath = os.fspath
+	prefixes = _NORMALIZE_PREFIXES
+	norm_files: list[Union[str, bytes]] = []
+	append = norm_files.append
+	for file in files:
+		norm_file = fspath(file)
+		if isinstance(norm_file, bytes):
+			append(_normalize_bytes_file(norm_file, separators))
+			continue
+
+		for sep in seps:
+			norm_file = norm_file.replace(sep, '/')
+
+		if norm_file.startswith(prefixes):
+			norm_file = norm_file[1:] if norm_file[0] == '/' else norm_file[2:]
+
+		append(norm_file)
+
+	return norm_files
+
+
+def _normalize_bytes_file(
+	file: bytes,
+	separators: Optional[Collection[Union[str, bytes]]],
+) -> bytes:
+	"""
+	Normalizes the :class:`bytes` file path. See :func:`.normalize_file`.
+
+	*file* (:class:`bytes`) is the file path.
+
+	*separators* (:class:`~collections.abc.Collection` of :class:`str` or
+	:class:`bytes`; or :data:`None`) optionally contains the path separators to
+	normalize.
+
+	Returns the normalized file path (:class:`bytes`).
+	"""
+	# Normalize path separators.
+	seps: Iterable[bytes]
+	if separators is None:
+		seps = _NORMALIZE_PATH_SEPS_BYTES
+	else:
+		seps = [
+			__sep if isinstance(__sep, bytes) else os.fsencode(__sep)
+			for __sep in separators
+		]
+
+	norm_file = file
+	for sep in seps:
+		norm_file = norm_file.replace(sep, b'/')
+
+	if norm_file.startswith(b'/'):
 		# Make path relative.
 		norm_file = norm_file[1:]
 
-	elif norm_file.startswith('./'):
+	elif norm_file.startswith(b'./'):
 		# Remove current directory prefix.
 		norm_file = norm_file[2:]
 
@@ -655,27 +962,29 @@ class RecursionError(Exception):
 
 	def __init__(
 		self,
-		real_path: str,
-		first_path: str,
-		second_path: str,
+		real_path: Union[str, bytes],
+		first_path: Union[str, bytes],
+		second_path: Union[str, bytes],
 	) -> None:
 		"""
 		Initializes the :exc:`RecursionError` instance.
 
-		*real_path* (:class:`str`) is the real path that recursion was encountered
-		on.
+		*real_path* (:class:`str` or :class:`bytes`) is the real path that recursion
+		was encountered on.
 
-		*first_path* (:class:`str`) is the first path encountered for *real_path*.
+		*first_path* (:class:`str` or :class:`bytes`) is the first path encountered
+		for *real_path*.
 
-		*second_path* (:class:`str`) is the second path encountered for *real_path*.
+		*second_path* (:class:`str` or :class:`bytes`) is the second path
+		encountered for *real_path*.
 		"""
 		super().__init__(real_path, first_path, second_path)
 
 	@property
-	def first_path(self) -> str:
+	def first_path(self) -> Union[str, bytes]:
 		"""
-		*first_path* (:class:`str`) is the first path encountered for
-		:attr:`self.real_path <RecursionError.real_path>`.
+		*first_path* (:class:`str` or :class:`bytes`) is the first path encountered
+		for :attr:`self.real_path <RecursionError.real_path>`.
 		"""
 		return self.args[1]
 
@@ -690,24 +999,24 @@ class RecursionError(Exception):
 		)
 
 	@property
-	def real_path(self) -> str:
+	def real_path(self) -> Union[str, bytes]:
 		"""
-		*real_path* (:class:`str`) is the real path that recursion was
-		encountered on.
+		*real_path* (:class:`str` or :class:`bytes`) is the real path that
+		recursion was encountered on.
 		"""
 		return self.args[0]
 
 	@property
-	def second_path(self) -> str:
+	def second_path(self) -> Union[str, bytes]:
 		"""
-		*second_path* (:class:`str`) is the second path encountered for
-		:attr:`self.real_path <RecursionError.real_path>`.
+		*second_path* (:class:`str` or :class:`bytes`) is the second path
+		encountered for :attr:`self.real_path <RecursionError.real_path>`.
 		"""
 		return self.args[2]
 
 
-@dataclass(frozen=True)
-class CheckResult(Generic[TStrPath]):
+@dataclass(frozen=True, init=False)
+class CheckResult(Generic[TAnyPath]):
 	"""
 	The :class:`CheckResult` class contains information about the file and which
 	pattern matched it.
@@ -718,11 +1027,13 @@ class CheckResult(Generic[TStrPath]):
 		'file',
 		'include',
 		'index',
+		'matches',
 	)
 
-	file: TStrPath
+	file: TAnyPath
 	"""
-	*file* (:class:`str` or :class:`os.PathLike`) is the file path.
+	*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+	path.
 	"""
 
 	include: Optional[bool]
@@ -737,6 +1048,98 @@ class CheckResult(Generic[TStrPath]):
 	matched. If :data:`None`, no pattern matched.
 	"""
 
+	matches: Optional[int]
+	"""
+	*matches* (:class:`int` or :data:`None`) is the bitset of every pattern that
+	matched. Bit *i* is set when the pattern at index *i* matched. This is only
+	set when checking with *all_matches*. Otherwise, it is :data:`None`.
+
+	Like the other fields, it is included in the equality comparison, hash and
+	:func:`repr` of the result.
+	"""
+
+	def __init__(
+		self,
+		file: TAnyPath,
+		include: Optional[bool],
+		index: Optional[int],
+		matches: Optional[int] = None,
+	) -> None:
+		"""
+		Initializes the :class:`CheckResult` instance.
+
+		*file* (:class:`str`, :class:`bytes` or :class:`os.PathLike`) is the file
+		path.
+
+		*include* (:class:`bool` or :data:`None`) is whether to include the file.
+
+		*index* (:class:`int` or :data:`None`) is the index of the last matched
+		pattern.
+
+		*matches* (:class:`int` or :data:`None`) is the bitset of every matched
+		pattern. Default is :data:`None`.
+		"""
+		# NOTICE: A field default cannot be a class attribute with `__slots__`
+		# until `dataclass(slots=True)` in Python 3.10, so initialize the frozen
+		# fields directly.
+		object.__setattr__(self, 'file', file)
+		object.__setattr__(self, 'include', include)
+		object.__setattr__(self, 'index', index)
+		object.__setattr__(self, 'matches', matches)
+
+
+@dataclass(frozen=True, init=False)
+class SourceCheckResult(CheckResult[TAnyPath]):
+	"""
+	The :class:`SourceCheckResult` class extends :class:`.CheckResult` with the
+	source and line of the pattern that matched the file. This is returned by
+	:class:`~pathspec.gitignore.LayeredGitIgnoreSpec`.
+	"""
+
+	# Make the class dict-less.
+	__slots__ = (
+		'line',
+		'source',
+	)
+
+	source: Optional[str]
+	"""
+	*source* (:class:`str` or :data:`None`) is the name of the source containing
+	the last pattern that matched. If :data:`None`, no pattern matched or the
+	pattern does not have a named source.
+	"""
+
+	line: Optional[int]
+	"""
+	*line* (:class:`int` or :data:`None`) is the line number (starting at 1) of
+	the last pattern that matched within its source. If :data:`None`, no pattern
+	matched.
+	"""
+
+	def __init__(
+		self,
+		file: TAnyPath,
+		include: Optional[bool],
+		index: Optional[int],
+		source: Optional[str],
+		line: Optional[int],
+		matches: Optional[int] = None,
+	) -> None:
+		"""
+		Initializes the :class:`SourceCheckResult` instance.
+
+		*source* (:class:`str` or :data:`None`) is the name of the source of the
+		last matched pattern.
+
+		*line* (:class:`int` or :data:`None`) is the line number of the last
+		matched pattern within its source.
+
+		See :class:`.CheckResult` for the other parameters.
+		"""
+		super().__init__(file, include, index, matches)
+		object.__setattr__(self, 'source', source)
+		object.__setattr__(self, 'line', line)
+
 
 class MatchDetail(object):
 	"""
@@ -772,17 +1175,17 @@ class TreeEntry(object):
 
 	def __init__(
 		self,
-		name: str,
-		path: str,
+		name: Union[str, bytes],
+		path: Union[str, bytes],
 		lstat: os.stat_result,
 		stat: os.stat_result,
 	) -> None:
 		"""
 		Initialize the :class:`TreeEntry` instance.
 
-		*name* (:class:`str`) is the base name of the entry.
+		*name* (:class:`str` or :class:`bytes`) is the base name of the entry.
 
-		*path* (:class:`str`) is the relative path of the entry.
+		*path* (:class:`str` or :class:`bytes`) is the relative path of the entry.
 
 		*lstat* (:class:`os.stat_result`) is the stat result of the direct entry.
 
@@ -795,14 +1198,16 @@ class TreeEntry(object):
 		*_lstat* (:class:`os.stat_result`) is the stat result of the direct entry.
 		"""
 
-		self.name: str = name
+		self.name: Union[str, bytes] = name
 		"""
-		*name* (:class:`str`) is the base name of the entry.
+		*name* (:class:`str` or :class:`bytes`) is the base name of the entry. This
+		is :class:`bytes` when the tree was walked with a :class:`bytes` root.
 		"""
 
-		self.path: str = path
+		self.path: Union[str, bytes] = path
 		"""
-		*path* (:class:`str`) is the path of the entry.
+		*path* (:class:`str` or :class:`bytes`) is the path of the entry. This is
+		:class:`bytes` when the tree was walked with a :class:`bytes` root.
 		"""
 
 		self._stat: os.stat_result = stat
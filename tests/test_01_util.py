@@ -21,13 +21,17 @@ from typing import (
 
 from pathspec.patterns.gitignore.basic import (
 	GitIgnoreBasicPattern)
+from pathspec.patterns.gitignore.spec import (
+	GitIgnoreSpecPattern)
 from pathspec.util import (
 	RecursionError,
 	check_match_file,
+	iter_path_list,
 	iter_tree_entries,
 	iter_tree_files,
 	match_file,
-	normalize_file)
+	normalize_file,
+	normalize_file_batch)
 from tests.util import (
 	get_paths_from_entries,
 	make_dirs,
@@ -112,6 +116,75 @@ class CheckMatchFileTest(unittest.TestCase):
 			'Y/Z/c.txt',
 		})
 
+	def test_03_override(self):
+		"""
+		Test checking a file with patterns overriding `match_file()`.
+		"""
+		class LowerPattern(GitIgnoreBasicPattern):
+			__slots__ = ()
+
+			def match_file(self, file):
+				return super().match_file(file.lower())
+
+		class LowerSpecPattern(GitIgnoreSpecPattern):
+			__slots__ = ()
+
+			def match_file(self, file):
+				return super().match_file(file.lower())
+
+		patterns = list(enumerate(map(LowerPattern, [
+			"*.txt",
+			"!test/",
+		])))
+		self.assertEqual(check_match_file(patterns, "A.TXT"), (True, 0))
+		self.assertEqual(check_match_file(patterns, "TEST/A.TXT"), (False, 1))
+		self.assertEqual(check_match_file(patterns, "A.BIN"), (None, None))
+
+		pattern = LowerSpecPattern("test/")
+		self.assertTrue(pattern.matches_file("TEST/A.TXT"))
+		self.assertEqual(pattern.match_file_priority("TEST/A.TXT"), 1)
+		self.assertEqual(pattern.match_file_priority("A/TEST"), 0)
+		self.assertEqual(LowerSpecPattern("*.txt").match_file_priority("A.TXT"), 2)
+
+
+class IterPathListTest(unittest.TestCase):
+	"""
+	The :class:`IterPathListTest` class tests the :func:`.iter_path_list`
+	function.
+	"""
+
+	def test_01_delimiters(self):
+		"""
+		Test splitting path lists with each delimiter and chunk size.
+		"""
+		paths = [b'a.txt', b'dir/b.txt', b'long/' * 10 + b'c.txt', b'caf\xc3\xa9.txt']
+		expected = []
+		offset = 0
+		for path in paths:
+			expected.append((offset, path))
+			offset += len(path) + 1
+
+		with tempfile.TemporaryDirectory() as temp_dir:
+			path_list = Path(temp_dir) / 'paths'
+			for delimiter in [None, b'\n']:
+				data = (delimiter or b'\0').join(paths)
+				for trailing in [b'', (delimiter or b'\0')]:
+					path_list.write_bytes(data + trailing)
+					for chunk_size in [1, 7, 16, None]:
+						with self.subTest(delimiter=delimiter, trailing=trailing, chunk_size=chunk_size):
+							results = list(iter_path_list(path_list, delimiter, chunk_size=chunk_size))
+							self.assertEqual(results, expected)
+
+			# An empty file and empty paths are skipped.
+			path_list.write_bytes(b'')
+			self.assertEqual(list(iter_path_list(path_list)), [])
+
+			path_list.write_bytes(b'\0a\0\0b\0')
+			self.assertEqual(list(iter_path_list(path_list)), [(1, b'a'), (4, b'b')])
+
+			with self.assertRaises(ValueError):
+				list(iter_path_list(path_list, b'\r\n'))
+
 
 class IterTreeTest(unittest.TestCase):
 	"""
@@ -218,6 +291,31 @@ class IterTreeTest(unittest.TestCase):
 			'Dir/Inner/f',
 		])))
 
+	def test_01_files_3_bytes(self):
+		"""
+		Tests to make sure all files are found as bytes when the root is bytes.
+		"""
+		self.make_dirs([
+			'Dir',
+		])
+		self.make_files([
+			'a',
+			'Dir/b',
+		])
+		results = set(iter_tree_files(os.fsencode(self.temp_dir)))
+		self.assertEqual(results, set(map(os.fsencode, map(ospath, [
+			'a',
+			'Dir/b',
+		]))))
+
+		entries = list(iter_tree_entries(os.fsencode(self.temp_dir)))
+		self.assertEqual({__entry.path for __entry in entries}, set(map(os.fsencode, map(ospath, [
+			'a',
+			'Dir',
+			'Dir/b',
+		]))))
+		self.assertTrue(all(isinstance(__entry.name, bytes) for __entry in entries))
+
 	def test_02_link_1_check_symlink(self):
 		"""
 		Tests whether links can be created.
@@ -708,3 +806,31 @@ class NormalizeFileTest(unittest.TestCase):
 		first_spec = normalize_file(PurePath('a.txt'))
 		second_spec = normalize_file('a.txt')
 		self.assertEqual(first_spec, second_spec)
+
+	def test_02_bytes(self):
+		"""
+		Tests normalizing a :class:`bytes` path keeps it as bytes.
+		"""
+		self.assertEqual(normalize_file(b'/a/b.txt'), b'a/b.txt')
+		self.assertEqual(normalize_file(b'./a/b.txt'), b'a/b.txt')
+		self.assertEqual(normalize_file(b'a\\b.txt', separators=['\\']), b'a/b.txt')
+		self.assertEqual(normalize_file(b'a/\xff.txt'), b'a/\xff.txt')
+
+	def test_03_batch(self):
+		"""
+		Tests normalizing a batch of paths is the same as normalizing each path.
+		"""
+		files = [
+			'/a/b.txt',
+			'./a/b.txt',
+			'a/./b.txt',
+			'.a/b.txt',
+			PurePath('a/b.txt'),
+			b'/a/b.txt',
+			'',
+		]
+		self.assertEqual(normalize_file_batch(files), [normalize_file(__f) for __f in files])
+		self.assertEqual(
+			normalize_file_batch(['\\a\\b.txt'], separators=['\\']),
+			[normalize_file('\\a\\b.txt', separators=['\\'])],
+		)
@@ -2,11 +2,17 @@
 This script tests :class:`._GitIgnoreBasePattern`.
 """
 
+import re
 import unittest
 
 from pathspec.patterns.gitignore.base import (
 	_BYTES_ENCODING,
-	_GitIgnoreBasePattern)
+	_GitIgnoreBasePattern,
+	_RangeError)
+from pathspec.patterns.gitignore.basic import (
+	GitIgnoreBasicPattern)
+from pathspec.patterns.gitignore.spec import (
+	GitIgnoreSpecPattern)
 
 
 class GitIgnoreBasePatternTest(unittest.TestCase):
@@ -38,3 +44,117 @@ class GitIgnoreBasePatternTest(unittest.TestCase):
 			escape_val = _GitIgnoreBasePattern.escape(char)
 			expect_val = char_to_escaped.get(char, char)
 			self.assertEqual(escape_val, expect_val)
+
+	def test_02_compile_lines(self):
+		"""
+		Test compiling pattern lines in bulk.
+		"""
+		for pattern_class in (GitIgnoreBasicPattern, GitIgnoreSpecPattern):
+			with self.subTest(pattern_class.__name__):
+				lines = ['*.txt', '', '!test1/', '*.txt', b'*.txt', '#comment']
+				patterns = pattern_class.compile_lines(lines)
+
+				self.assertEqual(patterns, [
+					pattern_class(__line) for __line in lines if __line
+				])
+				self.assertIs(patterns[0], patterns[2])
+				self.assertIsNot(patterns[0], patterns[3])
+
+	def test_02_translate_segment_glob(self):
+		"""
+		Test translating the same segment glob gives the same regular expression,
+		and errors are raised each time.
+		"""
+		for _ in range(2):
+			self.assertEqual(
+				_GitIgnoreBasePattern._translate_segment_glob('a[!b]*?.c', 'raise'),
+				'a[^b][^/]*[^/]\\.c',
+			)
+			self.assertEqual(
+				_GitIgnoreBasePattern._translate_segment_glob('a[b', 'literal'),
+				'a\\[b',
+			)
+			with self.assertRaises(_RangeError):
+				_GitIgnoreBasePattern._translate_segment_glob('a[b', 'raise')
+
+	def test_03_optimize_regex(self):
+		"""
+		Test lowering the patterns into regular expressions optimized for each
+		engine.
+		"""
+		for raw_pattern, engine, expected in [
+			# Basename suffix.
+			('*.txt', 're', '\\.txt(?:/|$)'),
+			('*.txt', 're2', '\\.txt(?:/|$)'),
+			('*.txt/', 'hyperscan', '\\.txt/'),
+			# Literal at the start of a segment.
+			('foo', 're', 'foo(?<![^/]foo)(?:/|$)'),
+			('foo/', 're2', '(?:^|/)foo/'),
+			('a-b*', 'hyperscan', '(?:^|/)a\\-b[^/]*(?:/|$)'),
+			# Not optimized.
+			('foo', None, '^(?:.+/)?foo(?:/|$)'),
+			('/foo', 're', '^foo(?:/|$)'),
+			('foo/*', 're', '^foo/[^/]+/?$'),
+			('[ab]c', 're2', '^(?:.+/)?[ab]c(?:/|$)'),
+			('*/', 're', '/'),
+		]:
+			with self.subTest(f"p={raw_pattern!r} e={engine!r}"):
+				ir = GitIgnoreBasicPattern(raw_pattern)._get_ir()
+				self.assertEqual(ir.to_match_regex(engine), expected)
+
+	def test_03_optimize_regex_equivalent(self):
+		"""
+		Test the optimized regular expressions match the same files.
+		"""
+		files = [
+			'foo',
+			'foo.txt',
+			'foo/bar',
+			'a/foo',
+			'a/foo/b',
+			'a/xfoo',
+			'a/foox/b',
+			'a/b.txt',
+			'a/b.txt/c',
+			'a/b.txtx',
+			'foo/a.txt',
+		]
+		for pattern_cls in [GitIgnoreBasicPattern, GitIgnoreSpecPattern]:
+			for raw_pattern in ['foo', 'foo/', 'foo*', '*.txt', '*.txt/', 'foo/**', '**/foo']:
+				pattern = pattern_cls(raw_pattern)
+				regex = pattern.regex
+				ir = pattern._get_ir()
+				for engine in ['hyperscan', 're', 're2']:
+					optimized = re.compile(ir.to_match_regex(engine))
+					for file in files:
+						with self.subTest(f"c={pattern_cls.__name__} p={raw_pattern!r} e={engine!r} f={file!r}"):
+							self.assertEqual(
+								optimized.search(file) is not None,
+								regex.search(file) is not None,
+							)
+
+	def test_04_literal(self):
+		"""
+		Test lowering the literal-equivalent patterns into literals.
+		"""
+		for raw_pattern, expected in [
+			('foo', ('foo', 'segment')),
+			('**/foo', ('foo', 'segment')),
+			('foo/', ('foo/', 'segment')),
+			('/foo', ('foo', 'root')),
+			('a/b c', ('a/b c', 'root')),
+			('foo/**', ('foo/', 'root')),
+			('*.txt', ('.txt', 'any')),
+			('*.txt/', ('.txt/', 'any')),
+			('\\*.txt', ('*.txt', 'segment')),
+			# Not literal.
+			('/*.txt', None),
+			('foo*', None),
+			('foo/*', None),
+			('a/**/b', None),
+			('*', None),
+			('**', None),
+		]:
+			with self.subTest(f"p={raw_pattern!r}"):
+				ir = GitIgnoreBasicPattern(raw_pattern)._get_ir()
+				self.assertEqual(ir.to_literal(), expected)
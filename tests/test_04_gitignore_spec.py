@@ -2,6 +2,8 @@
 This script tests :class:`.GitIgnoreSpecPattern`.
 """
 
+import copy
+import pickle
 import re
 import unittest
 try:
@@ -9,6 +11,8 @@ try:
 except ImportError:
 	from re import error as re_PatternError
 
+from pathspec.pattern import (
+	RegexPattern)
 from pathspec.patterns.gitignore.base import (
 	GitIgnorePatternError,
 	_BYTES_ENCODING)
@@ -969,3 +973,170 @@ class GitIgnoreSpecPatternTest(unittest.TestCase):
 				pattern = GitIgnoreSpecPattern(raw_pattern)
 				self.assertIs(pattern.include, None)
 				self.assertIs(pattern.regex, None)
+
+	def test_16_lazy_regex_1_compile(self):
+		"""
+		Test the regular expression is only compiled when it is accessed.
+		"""
+		pattern = GitIgnoreSpecPattern('*.txt')
+		self.assertIsNone(pattern._regex)
+		self.assertEqual(pattern.raw_regex, f'^(?:.+/)?[^/]*\\.txt{_DIR_MARK_OPT}')
+
+		regex = pattern.regex
+		self.assertEqual(regex.pattern, pattern.raw_regex)
+		self.assertIs(pattern.regex, regex)
+		self.assertTrue(pattern.match_file('a/b.txt'))
+
+	def test_16_lazy_regex_2_equal(self):
+		"""
+		Test comparing patterns does not compile their regular expressions.
+		"""
+		first_pattern = GitIgnoreSpecPattern('*.txt')
+		second_pattern = GitIgnoreSpecPattern('*.txt')
+		self.assertEqual(first_pattern, second_pattern)
+		self.assertNotEqual(first_pattern, GitIgnoreSpecPattern('*.log'))
+		self.assertIsNone(first_pattern._regex)
+		self.assertIsNone(second_pattern._regex)
+
+		# A compiled regular expression is still equal to the lazy one.
+		compiled_pattern = RegexPattern(re.compile(first_pattern.raw_regex), True)
+		self.assertEqual(compiled_pattern, first_pattern)
+		self.assertEqual(first_pattern, compiled_pattern)
+
+	def test_16_lazy_regex_3_copy(self):
+		"""
+		Test copying and pickling patterns with lazy regular expressions.
+		"""
+		pattern = GitIgnoreSpecPattern('*.txt')
+		for copied_pattern in [
+			copy.copy(pattern),
+			pickle.loads(pickle.dumps(pattern)),
+		]:
+			with self.subTest(f"c={copied_pattern!r}"):
+				self.assertIsInstance(copied_pattern, GitIgnoreSpecPattern)
+				self.assertEqual(copied_pattern, pattern)
+				self.assertEqual(copied_pattern.pattern, pattern.pattern)
+				self.assertTrue(copied_pattern.match_file('a/b.txt'))
+
+	def test_17_match_file_priority(self):
+		"""
+		Test the priority of matching a file by the file and directory variants of
+		the pattern.
+		"""
+		for raw_pattern, file, expected in [
+			('foo', 'foo', 2),
+			('foo', 'a/foo', 2),
+			('foo', 'foo/bar', 1),
+			('foo', 'foo/foo', 2),
+			('foo', 'bar', 0),
+			('foo/', 'foo/bar', 1),
+			('foo/', 'foo', 0),
+			('*.txt', 'a/b.txt', 2),
+			('/a/**', 'a/b/c', 2),
+			('# comment', 'foo', 0),
+			(b'foo', b'foo', 2),
+			(b'foo', b'foo/bar', 1),
+		]:
+			with self.subTest(f"p={raw_pattern!r} f={file!r}"):
+				pattern = GitIgnoreSpecPattern(raw_pattern)
+				self.assertEqual(pattern.match_file_priority(file), expected)
+				self.assertEqual(pattern.matches_file(file), bool(expected))
+
+	def test_17_match_file_priority_regex(self):
+		"""
+		Test the priority regular expressions are reset when the regular expression
+		is replaced.
+		"""
+		pattern = GitIgnoreSpecPattern('foo')
+		self.assertEqual(pattern.match_file_priority('foo'), 2)
+		self.assertEqual(copy.copy(pattern).match_file_priority('foo/bar'), 1)
+
+		pattern.regex = re.compile(f'^bar{_DIR_MARK_OPT}')
+		self.assertEqual(pattern.match_file_priority('foo'), 0)
+		self.assertEqual(pattern.match_file_priority('bar/foo'), 1)
+
+	def test_18_ir(self):
+		"""
+		Test parsing patterns into their intermediate representation.
+		"""
+		for raw_pattern, anchored, dir_only, include, segments, tail in [
+			('foo', False, False, True, ('foo',), 'path'),
+			('!/foo/', True, True, False, ('foo',), 'descendants'),
+			('a/**/b/*', True, False, True, ('a', '**', 'b', '[^/]+'), 'path'),
+			('**/foo/**', False, False, True, ('foo',), 'descendants'),
+			('**', False, False, True, (), 'path'),
+			('*/', False, True, True, (), 'descendants'),
+			(b'foo', False, False, True, ('foo',), 'path'),
+		]:
+			with self.subTest(f"p={raw_pattern!r}"):
+				ir = GitIgnoreSpecPattern(raw_pattern)._get_ir()
+				self.assertEqual(ir.anchored, anchored)
+				self.assertTrue(ir.dir_mark)
+				self.assertEqual(ir.dir_only, dir_only)
+				self.assertEqual(ir.include, include)
+				self.assertEqual(ir.segments, segments)
+				self.assertEqual(ir.tail, tail)
+
+		self.assertIsNone(GitIgnoreSpecPattern('# comment')._get_ir())
+		self.assertIsNone(GitIgnoreSpecPattern('[')._get_ir())
+		self.assertIsNone(GitIgnoreSpecPattern(re.compile('^foo$'), True)._get_ir())
+
+	def test_18_ir_variants(self):
+		"""
+		Test lowering the intermediate representation into the directory and file
+		variants is the same as splitting the regular expression.
+		"""
+		for raw_pattern in [
+			'foo',
+			'foo/',
+			'/foo/bar',
+			'foo/**',
+			'foo/**/',
+			'a/**/b',
+			'**',
+			'**/',
+			'*',
+			'*/',
+			'*/**',
+			'*.txt',
+			'!dir/*/',
+		]:
+			with self.subTest(f"p={raw_pattern!r}"):
+				pattern = GitIgnoreSpecPattern(raw_pattern)
+				self.assertEqual(
+					pattern._get_ir().to_variants(),
+					pattern._split_regex_variants(pattern.raw_regex),
+				)
+				self.assertEqual(
+					pattern._get_ir().to_match_regex(),
+					pattern._split_priority_regex(pattern.raw_regex)[0],
+				)
+
+		pattern = GitIgnoreSpecPattern('foo')
+		pattern.regex = re.compile(f'^bar{_DIR_MARK_OPT}')
+		self.assertEqual(pattern._get_regex_variants('re2'), [('^bar/', True), ('^bar$', False)])
+
+	def test_19_ir_covers(self):
+		"""
+		Test whether a pattern covers the paths matched by another pattern with at
+		least the same priority.
+		"""
+		for later, earlier, expected in [
+			('foo', 'foo', True),
+			('foo', '/foo', True),
+			('/foo', 'foo', False),
+			('foo', 'foo/', True),
+			('foo', 'foo/**', False),
+			('**/foo/**', 'foo/', True),
+			('foo/', '**/foo/**', False),
+			('/foo/**', 'foo/', False),
+			('**', 'a/b/', True),
+			('*/', 'a/b/', True),
+			('*/', 'a/**', False),
+			('**/*/**', 'a/**', True),
+			('foo', 'bar', False),
+		]:
+			with self.subTest(f"l={later!r} e={earlier!r}"):
+				later_ir = GitIgnoreSpecPattern(later)._get_ir()
+				earlier_ir = GitIgnoreSpecPattern(earlier)._get_ir()
+				self.assertEqual(later_ir.covers(earlier_ir), expected)
@@ -25,13 +25,22 @@ from typing import (
 from unittest import (
 	SkipTest)
 
+try:
+	import numpy
+except ModuleNotFoundError:
+	numpy = None
+
 from pathspec import (
-	PathSpec)
+	PathSpec,
+	util)
 from pathspec.backend import (
 	BackendNamesHint,
 	_Backend)
 from pathspec._backends.hyperscan.pathspec import (
 	HyperscanPsBackend)
+from pathspec._backends.layered import (
+	MERGE_LAYER_COUNT,
+	LayeredPsBackend)
 from pathspec._backends.re2.pathspec import (
 	Re2PsBackend)
 from pathspec._backends.simple.pathspec import (
@@ -45,9 +54,11 @@ from pathspec.patterns.gitignore.basic import (
 from pathspec._typing import (
 	AnyStr)  # Removed in 3.18.
 from pathspec.util import (
-	iter_tree_entries)
+	iter_tree_entries,
+	normalize_file)
 
 from .util import (
+	RE2_PARTITION_MAX_MEM,
 	CheckResult,
 	debug_includes,
 	debug_results,
@@ -163,6 +174,11 @@ class PathSpecTest(unittest.TestCase):
 					backend,
 					partial(HyperscanPsBackend, _debug_exprs=True, _test_sort=shuffle_inplace)
 				))
+				configs.append((
+					f"hyperscan (shards)",
+					backend,
+					partial(HyperscanPsBackend, shards=3, _debug_exprs=True, _test_sort=shuffle_inplace)
+				))
 			elif backend == 're2':
 				configs.append((
 					f"re2 (forward)",
@@ -179,6 +195,11 @@ class PathSpecTest(unittest.TestCase):
 					backend,
 					partial(Re2PsBackend, _debug_regex=True, _test_sort=shuffle_inplace),
 				))
+				configs.append((
+					"re2 (partitioned)",
+					backend,
+					partial(Re2PsBackend, max_mem=RE2_PARTITION_MAX_MEM, _debug_regex=True, _test_sort=shuffle_inplace),
+				))
 			else:
 				configs.append((
 					backend,
@@ -281,6 +302,170 @@ class PathSpecTest(unittest.TestCase):
 					'foo/a.py',
 				}, debug)
 
+	def test_01_check_files_columnar(self):
+		"""
+		Test checking files into result arrays.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+		]):
+			with sub_test() as spec:
+				files = ['a.txt', 'b.txt', 'c.log', b'X/a.txt']
+				includes, indices = spec.check_files_columnar(files)
+				results = list(spec.check_files(files))
+
+				self.assertEqual(includes.typecode, 'b')
+				self.assertEqual(indices.typecode, 'i')
+				self.assertEqual(list(includes), [1, 0, -1, 1])
+				self.assertEqual(list(indices), [0, 1, -1, 0])
+				self.assertEqual(list(includes), [
+					-1 if __r.include is None else int(__r.include) for __r in results
+				])
+
+				# Reuse the arrays.
+				out = spec.check_files_columnar(['c.log'], out=(includes, indices))
+				self.assertIs(out[0], includes)
+				self.assertIs(out[1], indices)
+				self.assertEqual((list(includes), list(indices)), ([-1], [-1]))
+
+				spec.check_files_columnar(['b.txt', 'a.txt'], out=(includes, indices))
+				self.assertEqual((list(includes), list(indices)), ([0, 1], [1, 0]))
+
+	def test_01_detailed_match_files(self):
+		"""
+		Test the detailed matches of files are the same as
+		:func:`.util.detailed_match_files`.
+		"""
+		files = [
+			'./a.txt',
+			'b.txt',
+			'build/a.txt',
+			'c.log',
+			'X/b.txt',
+			'X/build/c.log',
+			'Y/b.txt',
+		]
+		norm_files = [__f.removeprefix('./') for __f in files]
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+			'build/',
+			'*.txt',
+			'/build/',
+			'!X/',
+			'*.t?t',
+		]):
+			with sub_test() as spec:
+				for all_matches in [False, True]:
+					expected = {
+						__file: __detail.patterns
+						for __file, __detail in util.detailed_match_files(
+							spec.patterns, norm_files, all_matches=all_matches,
+						).items()
+					}
+					results = list(spec.detailed_match_files(files, all_matches=all_matches))
+					self.assertEqual([__f for __f, _ in results], [
+						__f for __f, __n in zip(files, norm_files) if __n in expected
+					], all_matches)
+					self.assertEqual({
+						normalize_file(__f): __d.patterns for __f, __d in results
+					}, expected, all_matches)
+
+	def test_01_match_array(self):
+		"""
+		Test matching a NumPy array of files.
+		"""
+		if numpy is None:
+			raise SkipTest("numpy is not installed.")
+
+		files = [
+			'./a.txt',
+			'b.txt',
+			'build/x.py',
+			'c.log',
+			'src/build',
+			'src/build/y.py',
+			'X/a.txt',
+			'X/README',
+		]
+		for lines in [
+			# All literal patterns.
+			['*.txt', '!b.txt', 'build/', '/X/README'],
+			# Literal patterns after a regular expression.
+			['*.t?t', '!/b.txt', 'build/', '*.log'],
+			# Regular expression last.
+			['build/', '*.txt', '!*.t[x]t'],
+		]:
+			for sub_test in self.parameterize_from_lines('gitignore', lines):
+				with sub_test() as spec:
+					expected = list(spec.check_files(files))
+					for array in [numpy.array(files), numpy.array([os.fsencode(__f) for __f in files])]:
+						mask, indices = spec.match_array(array)
+						self.assertEqual(mask.dtype, bool)
+						self.assertEqual(mask.tolist(), [bool(__r.include) for __r in expected], lines)
+						self.assertEqual(indices.tolist(), [
+							-1 if __r.index is None else __r.index for __r in expected
+						], lines)
+
+					# Object arrays are normalized.
+					mask, indices = spec.match_array(numpy.array(files, dtype=object))
+					self.assertEqual(mask.tolist(), [bool(__r.include) for __r in expected], lines)
+
+					# Normalized files.
+					norm_files = numpy.array([__f.removeprefix('./') for __f in files])
+					mask, indices = spec.match_array(norm_files, assume_normalized=True)
+					self.assertEqual(mask.tolist(), [bool(__r.include) for __r in expected], lines)
+
+	def test_01_check_file_all_matches(self):
+		"""
+		Test checking files for every matched pattern.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+			'build/',
+			'*.txt',
+			'/build/',
+			'!X/',
+			'# comment',
+			'*.t?t',
+		]):
+			with sub_test() as spec:
+				files = [
+					'a.txt',
+					'b.txt',
+					'build/a.txt',
+					'c.log',
+					'X/b.txt',
+					'X/build/c.log',
+				]
+				results = list(spec.check_files(files, all_matches=True))
+				for file, result in zip(files, results):
+					expected = sum(
+						1 << __i
+						for __i, __pat in enumerate(spec.patterns)
+						if __pat.include is not None and __pat.match_file(file) is not None
+					)
+					last = spec.check_file(file)
+					self.assertEqual(result, CheckResult(
+						file, last.include, last.index, expected,
+					), file)
+					self.assertEqual(
+						spec.check_file(os.fsencode(file), all_matches=True).matches,
+						expected,
+						file,
+					)
+
+				self.assertEqual(results[2].matches, 0b10011101)
+				self.assertIsNone(spec.check_file('a.txt').matches)
+
+				# The matches of each layer are offset by its first pattern.
+				combined = spec + PathSpec.from_lines('gitignore', ['!build/a.txt'])
+				result = combined.check_file('build/a.txt', all_matches=True)
+				self.assertEqual(result.matches, 0b110011101)
+				self.assertEqual((result.include, result.index), (False, 8))
+
 	def test_01_check_file_1_include(self):
 		"""
 		Test checking a single file that is included.
@@ -581,6 +766,35 @@ class PathSpecTest(unittest.TestCase):
 		], backend='simple')
 		self.assertEqual(first_spec, second_spec)
 
+	def test_02_eq_changed(self):
+		"""
+		Tests equality is updated when the patterns change, and path-specs are not
+		hashable.
+		"""
+		first_spec = PathSpec.from_lines('gitignore', [
+			'*.txt',
+			'!test1/**',
+		], backend='simple')
+		second_spec = PathSpec.from_lines('gitignore', [
+			'*.txt',
+			'!test1/**',
+		], backend='simple')
+		self.assertEqual(first_spec, second_spec)
+		with self.assertRaises(TypeError):
+			hash(first_spec)
+
+		second_spec += PathSpec.from_lines('gitignore', ['*.log'], backend='simple')
+		self.assertNotEqual(first_spec, second_spec)
+
+		# Change the patterns in place.
+		patterns = list(first_spec.patterns)
+		first_spec.patterns = patterns
+		self.assertNotEqual(first_spec, second_spec)
+		patterns.append(second_spec.patterns[-1])
+		self.assertEqual(first_spec, second_spec)
+		patterns.pop()
+		self.assertNotEqual(first_spec, second_spec)
+
 	def test_02_ne(self):
 		"""
 		Tests inequality.
@@ -593,6 +807,20 @@ class PathSpecTest(unittest.TestCase):
 		], backend='simple')
 		self.assertNotEqual(first_spec, second_spec)
 
+	def test_02_ne_length(self):
+		"""
+		Tests inequality with a different number of patterns.
+		"""
+		first_spec = PathSpec.from_lines('gitignore', [
+			'*.txt',
+		], backend='simple')
+		second_spec = PathSpec.from_lines('gitignore', [
+			'*.txt',
+			'*.log',
+		], backend='simple')
+		self.assertNotEqual(first_spec, second_spec)
+		self.assertNotEqual(second_spec, first_spec)
+
 	def test_03_add_1_simple(self):
 		"""
 		Test spec addition using :data:`+` operator.
@@ -816,6 +1044,64 @@ class PathSpecTest(unittest.TestCase):
 					'Y/Z/c.txt',
 				}, debug)
 
+	def test_05_match_files_assume_normalized(self):
+		"""
+		Test matching files which are assumed to be normalized.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'/a.txt',
+		]):
+			with sub_test() as spec:
+				files = ['a.txt', '/a.txt', 'x/a.txt']
+				self.assertEqual(list(spec.match_files(files)), ['a.txt', '/a.txt'])
+				self.assertEqual(list(spec.match_files(files, assume_normalized=True)), ['a.txt'])
+				self.assertEqual(
+					[__r.include for __r in spec.check_files(files, assume_normalized=True)],
+					[True, None, None],
+				)
+				self.assertIs(spec.match_file('/a.txt', assume_normalized=True), False)
+				self.assertEqual(spec.check_file('a.txt', assume_normalized=True).include, True)
+
+	def test_05_match_path_list(self):
+		"""
+		Test matching a path list file.
+		"""
+		files = [
+			b'X/a.txt',
+			b'./X/b.txt',
+			b'X/Z/c.txt',
+			b'Y/a.md',
+			b'Y/b.txt',
+		]
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+		]):
+			with sub_test() as spec:
+				self.make_dirs(['list'])
+				path_list = self.temp_dir / 'list' / 'paths'
+				path_list.write_bytes(b'\0'.join(files) + b'\0')
+				self.assertEqual(list(spec.match_path_list(path_list)), [
+					b'X/a.txt',
+					b'X/Z/c.txt',
+				])
+				self.assertEqual(list(spec.match_path_list(path_list, negate=True)), [
+					b'./X/b.txt',
+					b'Y/a.md',
+					b'Y/b.txt',
+				])
+				self.assertEqual(list(spec.match_path_list(path_list, offsets=True)), [0, 18])
+				self.assertEqual([
+					(__res.file, __res.include, __res.index)
+					for __res in spec.check_path_list(path_list)
+				], [
+					(b'X/a.txt', True, 0),
+					(b'./X/b.txt', False, 1),
+					(b'X/Z/c.txt', True, 0),
+					(b'Y/a.md', None, None),
+					(b'Y/b.txt', False, 1),
+				])
+
 	def test_05_match_tree_entries(self):
 		"""
 		Test matching a file tree.
@@ -889,6 +1175,74 @@ class PathSpecTest(unittest.TestCase):
 					'Y/Z/c.txt',
 				])), debug)
 
+	def test_05_match_files_bytes(self):
+		"""
+		Test matching bytes files.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+		]):
+			with sub_test() as spec:
+				files = {
+					b'X/a.txt',
+					b'X/b.txt',
+					b'/X/Z/c.txt',
+					b'Y/a.log',
+				}
+
+				includes = set(spec.match_files(files))
+				debug = debug_includes(spec, files, includes)
+
+				self.assertEqual(includes, {
+					b'X/a.txt',
+					b'/X/Z/c.txt',
+				}, debug)
+				self.assertEqual(spec.check_file(b'X/a.txt'), CheckResult(b'X/a.txt', True, 0))
+				self.assertEqual(spec.check_file(b'X/b.txt'), CheckResult(b'X/b.txt', False, 1))
+				self.assertIs(spec.match_file(b'X/a.log'), False)
+				self.assertEqual(list(spec.match_files([b'X/a.txt', 'Y/a.txt'])), [b'X/a.txt', 'Y/a.txt'])
+
+	def test_05_match_files_bytes_undecodable(self):
+		"""
+		Test matching bytes files which are not valid UTF-8.
+		"""
+		spec = PathSpec.from_lines('gitignore', ['*.txt', '!b*'], backend='simple')
+		files = [b'\xff.txt', b'b\xff.txt', b'\xff/a.log']
+		self.assertEqual(list(spec.match_files(files)), [b'\xff.txt'])
+
+		spec += PathSpec.from_lines('gitignore', ['*.log'], backend='simple')
+		self.assertEqual(list(spec.match_files(files)), [b'\xff.txt', b'\xff/a.log'])
+
+	def test_05_match_tree_files_bytes(self):
+		"""
+		Test matching a file tree with a bytes root.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'*.txt',
+			'!b.txt',
+		]):
+			with sub_test() as spec:
+				files = set(map(ospath, [
+					'X/a.txt',
+					'X/b.txt',
+					'X/Z/c.txt',
+				]))
+
+				self.make_dirs([
+					'X',
+					'X/Z',
+				])
+				self.make_files(files)
+
+				includes = set(spec.match_tree_files(os.fsencode(self.temp_dir)))
+				debug = debug_includes(spec, set(map(os.fsencode, files)), includes)
+
+				self.assertEqual(includes, set(map(os.fsencode, map(ospath, [
+					'X/a.txt',
+					'X/Z/c.txt',
+				]))), debug)
+
 	def test_06_issue_41_a(self):
 		"""
 		Test including a file and excluding a directory with the same name pattern,
@@ -1132,3 +1486,342 @@ class PathSpecTest(unittest.TestCase):
 			repr(spec),
 			"PathSpec(patterns=[GitIgnoreBasicPattern(pattern='*.py', include=True)], backend='simple')",
 		)
+
+	def test_12_dir_memo(self):
+		"""
+		Test checking a batch of files with directory patterns gives the same
+		results as checking each file.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'build/',
+			'*.log',
+			'!/build/keep/',
+			'/dist/**',
+			'!*.txt',
+			'lib/*/cache/',
+		]):
+			with sub_test() as spec:
+				files = [
+					'a.log',
+					'a.txt',
+					'build/a.log',
+					'build/a.txt',
+					'build/b.bin',
+					'build/keep/a.log',
+					'build/keep/a.txt',
+					'build/keep/b.bin',
+					'dist/a.txt',
+					'dist/b.bin',
+					'dist/c/d.bin',
+					'lib/x/cache/a.bin',
+					'lib/x/cache/b.txt',
+					'lib/x/y.bin',
+					'src/build/a.bin',
+					'src/build/keep/a.bin',
+					'src/c.bin',
+				]
+
+				results = list(spec.check_files(files))
+				includes = get_includes(results)
+				debug = debug_results(spec, results)
+
+				self.assertEqual(results, [spec.check_file(__f) for __f in files], debug)
+				self.assertEqual(includes, {
+					'a.log',
+					'build/a.log',
+					'build/b.bin',
+					'dist/b.bin',
+					'dist/c/d.bin',
+					'lib/x/cache/a.bin',
+					'lib/x/cache/b.txt',
+					'src/build/a.bin',
+					'src/build/keep/a.bin',
+				}, debug)
+
+	def test_13_presorted(self):
+		"""
+		Test checking presorted files gives the same results as checking each file,
+		and out of order files are still checked correctly.
+		"""
+		for sub_test in self.parameterize_from_lines('gitignore', [
+			'build/',
+			'*.log',
+			'!/build/keep/',
+			'/dist/**',
+			'!*.txt',
+			'lib/*/cache/',
+		]):
+			with sub_test() as spec:
+				files = [
+					'a.log',
+					'build/a.log',
+					'build/keep/a.log',
+					'build/keep/b.bin',
+					'build/b.bin',
+					'dist/c/d.bin',
+					'dist/a.txt',
+					'lib/x/cache/a.bin',
+					'lib/x/y.bin',
+					'lib/x/cache/b.txt',
+					'src/build/keep/a.bin',
+					'src/build/a.bin',
+					'src/c.bin',
+					'build/keep/c.bin',
+				]
+
+				results = list(spec.check_files(files, presorted=True))
+				debug = debug_results(spec, results)
+
+				self.assertEqual(results, [spec.check_file(__f) for __f in files], debug)
+				self.assertEqual(
+					list(spec.match_files(files, presorted=True)),
+					list(spec.match_files(files)),
+					debug,
+				)
+				self.assertEqual(get_includes(results), {
+					'a.log',
+					'build/a.log',
+					'build/b.bin',
+					'dist/c/d.bin',
+					'lib/x/cache/a.bin',
+					'lib/x/cache/b.txt',
+					'src/build/keep/a.bin',
+					'src/build/a.bin',
+				}, debug)
+
+	def test_14_minimize(self):
+		"""
+		Test removing the duplicate and shadowed patterns keeps the results and
+		their pattern indices.
+		"""
+		lines = [
+			'*.log',
+			'/build/',
+			'!*.txt',
+			'build/',
+			'*.log',
+			'!*.txt',
+			'tmp/',
+			'tmp',
+		]
+		for sub_test in self.parameterize_from_lines('gitignore', lines):
+			with sub_test() as spec:
+				files = [
+					'a.log',
+					'build/a.txt',
+					'build/b.bin',
+					'src/build/c.bin',
+					'src/c.bin',
+					'tmp/d.bin',
+				]
+
+				results = list(spec.check_files(files))
+				debug = debug_results(spec, results)
+
+				self.assertEqual(results, [
+					CheckResult('a.log', True, 4),
+					CheckResult('build/a.txt', False, 5),
+					CheckResult('build/b.bin', True, 3),
+					CheckResult('src/build/c.bin', True, 3),
+					CheckResult('src/c.bin', None, None),
+					CheckResult('tmp/d.bin', True, 7),
+				], debug)
+
+		patterns = [GitIgnoreBasicPattern(__line) for __line in lines]
+		backend = SimplePsBackend(patterns)
+		self.assertEqual(backend.get_removed_indices(), [0, 1, 2, 6])
+		self.assertEqual([__index for __index, _ in backend._patterns], [7, 5, 4, 3])
+		self.assertEqual(SimplePsBackend(patterns, no_filter=True).get_removed_indices(), [])
+
+		for backend in ['simple', *BACKENDS]:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec = PathSpec.from_lines('gitignore', lines, backend=backend)
+				self.assertEqual(spec.get_removed_indices(), [0, 1, 2, 6])
+				self.assertEqual(
+					(spec + spec).get_removed_indices(),
+					[0, 1, 2, 6, 8, 9, 10, 14],
+				)
+
+	def test_14_literals(self):
+		"""
+		Test the literal-equivalent patterns matched by the Hyperscan literal
+		database keep the results and their pattern indices.
+		"""
+		require_backend('hyperscan')
+		lines = [
+			'/build/',
+			'*.log',
+			'a[bc]',
+			'!keep.log',
+			'docs/',
+			'src/*.py',
+			'!/docs/a.txt',
+		]
+		patterns = [GitIgnoreBasicPattern(__line) for __line in lines]
+		for label, sort_ids in [
+			("forward", None),
+			("reverse", reverse_inplace),
+			("shuffle", shuffle_inplace),
+		]:
+			with self.subTest(label):
+				backend = HyperscanPsBackend(patterns, _test_sort=sort_ids)
+				self.assertEqual([__dat.index for __dat in backend._lit_data], [0, 1, 3, 4, 6])
+				self.assertEqual([__dat.index for __dat in backend._expr_data], [2, 5])
+				self.assertEqual([
+					backend.match_file(__file) for __file in [
+						'build',
+						'build/a.bin',
+						'src/build/a.bin',
+						'a.log',
+						'a.log/b',
+						'a.logx',
+						'src/keep.log',
+						'xkeep.log',
+						'docs',
+						'docs/a.txt',
+						'src/docs/a.txt',
+						'src/ab',
+						'src/a.py',
+						'src/keep.log/a.py',
+					]
+				], [
+					(None, None),
+					(True, 0),
+					(None, None),
+					(True, 1),
+					(True, 1),
+					(None, None),
+					(False, 3),
+					(True, 1),
+					(None, None),
+					(False, 6),
+					(True, 4),
+					(True, 2),
+					(True, 5),
+					(False, 3),
+				])
+
+	def test_14_re2_partitioned(self):
+		"""
+		Test the re2 backend partitions the patterns into several sets, and keeps
+		the results and their pattern indices.
+		"""
+		require_backend('re2')
+		lines = [
+			'*.txt',
+			'!test1/',
+			'dir/**/file.py',
+			'/root.md',
+			'a/b/',
+			'!*.md',
+		]
+		files = [
+			'x.txt',
+			'test1/a.txt',
+			'dir/q/file.py',
+			'root.md',
+			'a/b/c',
+			'z/root.md',
+			'other.py',
+		]
+		patterns = [GitIgnoreBasicPattern(__line) for __line in lines]
+		expected = SimplePsBackend(patterns)
+		backend = Re2PsBackend(patterns, max_mem=RE2_PARTITION_MAX_MEM)
+		self.assertGreater(len(backend._sets), 1)
+		self.assertEqual(
+			[backend.match_file(__file) for __file in files],
+			[expected.match_file(__file) for __file in files],
+		)
+
+		with self.assertRaises(ValueError):
+			Re2PsBackend(patterns, max_mem=1 << 10)
+
+	def test_15_layered(self):
+		"""
+		Test combining specs reuses their backends as layers, and keeps the results
+		and their pattern indices.
+		"""
+		parts = [
+			['*.log', '!keep.log'],
+			[],
+			['build/', '!build/keep/'],
+			['keep.log', '*.tmp'],
+		]
+		files = [
+			'a.log',
+			'keep.log',
+			'build/a.txt',
+			'build/keep/b.txt',
+			'src/c.tmp',
+			'src/d.txt',
+		]
+		for backend in ['simple', *BACKENDS]:
+			with self.subTest(backend):
+				require_backend(backend)
+				specs = [
+					PathSpec.from_lines('gitignore', __lines, backend=backend)
+					for __lines in parts
+				]
+				full_spec = PathSpec.from_lines('gitignore', [
+					__line for __lines in parts for __line in __lines
+				], backend=backend)
+
+				add_spec = specs[0] + specs[1] + specs[2] + specs[3]
+				iadd_spec = PathSpec([], backend=backend)
+				for spec in specs:
+					iadd_spec += spec
+
+				for spec in [add_spec, iadd_spec]:
+					self.assertIsInstance(spec._backend, LayeredPsBackend)
+					self.assertEqual(
+						[__backend for _, __backend in spec._backend._layers],
+						[specs[0]._backend, specs[2]._backend, specs[3]._backend],
+					)
+					self.assertEqual(spec, full_spec)
+					self.assertEqual(
+						list(spec.check_files(files)), list(full_spec.check_files(files)),
+					)
+					self.assertEqual(
+						[spec.check_file(__file) for __file in files],
+						list(full_spec.check_files(files)),
+					)
+
+	def test_15_layered_merge(self):
+		"""
+		Test combining too many specs merges the layers on first use.
+		"""
+		specs = [
+			PathSpec.from_lines('gitignore', [f'*.{__i}', f'!a.{__i}'], backend='simple')
+			for __i in range(MERGE_LAYER_COUNT + 1)
+		]
+		spec = PathSpec([], backend='simple')
+		for sub_spec in specs[:-1]:
+			spec += sub_spec
+			self.assertIsNone(spec._backend._merge)
+
+		spec += specs[-1]
+		self.assertIsNotNone(spec._backend._merge)
+		self.assertEqual(len(spec._backend._layers), MERGE_LAYER_COUNT + 1)
+
+		result = spec.check_file('b.3')
+		self.assertEqual(result, CheckResult('b.3', True, 6))
+		self.assertIsNone(spec._backend._merge)
+		self.assertEqual(len(spec._backend._layers), 1)
+		self.assertEqual(spec.check_file('a.3'), CheckResult('a.3', False, 7))
+
+	def test_15_layered_recompile(self):
+		"""
+		Test combining a spec using a different backend only compiles the added
+		patterns.
+		"""
+		first_spec = PathSpec.from_lines('gitignore', ['*.log'], backend='simple')
+		second_spec = PathSpec.from_lines('gitignore', ['!a.log'], backend='simple')
+		second_spec._backend_name = 'other'  # type: ignore[assignment]
+		spec = first_spec + second_spec
+		layers = spec._backend._layers
+		self.assertEqual([__offset for __offset, _ in layers], [0, 1])
+		self.assertIs(layers[0][1], first_spec._backend)
+		self.assertIsNot(layers[1][1], second_spec._backend)
+		self.assertEqual(spec.check_file('a.log'), CheckResult('a.log', False, 1))
+		self.assertEqual(spec.check_file('b.log'), CheckResult('b.log', True, 0))
@@ -23,18 +23,24 @@ from pathspec.backend import (
 	_Backend)
 from pathspec._backends.hyperscan.gitignore import (
 	HyperscanGiBackend)
+from pathspec._backends.layered import (
+	LayeredPsBackend)
 from pathspec._backends.re2.gitignore import (
 	Re2GiBackend)
 from pathspec._backends.simple.gitignore import (
 	SimpleGiBackend)
 from pathspec.gitignore import (
-	GitIgnoreSpec)
+	GitIgnoreSpec,
+	LayeredGitIgnoreSpec)
 from pathspec.pattern import (
 	Pattern)
 from pathspec._typing import (
 	AnyStr)  # Removed in 3.18.
+from pathspec.util import (
+	SourceCheckResult)
 
 from .util import (
+	RE2_PARTITION_MAX_MEM,
 	debug_results,
 	get_includes,
 	require_backend,
@@ -108,6 +114,11 @@ class GitIgnoreSpecTest(unittest.TestCase):
 					backend,
 					partial(HyperscanGiBackend, _debug_exprs=True, _test_sort=shuffle_inplace)
 				))
+				configs.append((
+					f"hyperscan (shards)",
+					backend,
+					partial(HyperscanGiBackend, shards=3, _debug_exprs=True, _test_sort=shuffle_inplace)
+				))
 			elif backend == 're2':
 				configs.append((
 					f"re2 (forward)",
@@ -124,6 +135,11 @@ class GitIgnoreSpecTest(unittest.TestCase):
 					backend,
 					partial(Re2GiBackend, _debug_regex=True, _test_sort=shuffle_inplace)
 				))
+				configs.append((
+					"re2 (partitioned)",
+					backend,
+					partial(Re2GiBackend, max_mem=RE2_PARTITION_MAX_MEM, _debug_regex=True, _test_sort=shuffle_inplace)
+				))
 			else:
 				configs.append((
 					backend,
@@ -154,6 +170,33 @@ class GitIgnoreSpecTest(unittest.TestCase):
 
 			yield _sub_test
 
+	def test_01_check_files_all_matches(self):
+		"""
+		Test checking files for every matched pattern. A file pattern takes
+		precedence over an earlier directory pattern.
+		"""
+		for sub_test in self.parameterize_from_lines([
+			'*.log',
+			'build/',
+			'!*.log',
+			'b.txt',
+		]):
+			with sub_test() as spec:
+				files = ['a.log', 'build/a.log', 'build/b.txt', 'c.txt']
+				results = {__r.file: __r for __r in spec.check_files(files, all_matches=True)}
+				self.assertEqual({
+					__file: (__r.include, __r.index, __r.matches)
+					for __file, __r in results.items()
+				}, {
+					'a.log': (False, 2, 0b0101),
+					'build/a.log': (False, 2, 0b0111),
+					'build/b.txt': (True, 3, 0b1010),
+					'c.txt': (None, None, 0),
+				})
+				for file, result in results.items():
+					last = spec.check_file(file)
+					self.assertEqual((result.include, result.index), (last.include, last.index), file)
+
 	def test_01_reversed_args(self):
 		"""
 		Test reversed args for `.from_lines()`.
@@ -689,3 +732,281 @@ class GitIgnoreSpecTest(unittest.TestCase):
 				includes = get_includes(results)
 				debug = debug_results(spec, results)
 				self.assertEqual(includes, set(), debug)
+
+	def test_10_dir_memo(self):
+		"""
+		Test checking a batch of files with directory patterns gives the same
+		results as checking each file, and files can still be included from an
+		excluded directory.
+		"""
+		for sub_test in self.parameterize_from_lines([
+			'*.txt',
+			'!test1/',
+			'build/',
+			'!build/*.c',
+			'logs/**',
+			'!logs/*.keep',
+		]):
+			with sub_test() as spec:
+				files = [
+					'a.c',
+					'a.txt',
+					'build/a.c',
+					'build/b.o',
+					'build/sub/a.c',
+					'logs/a.log',
+					'logs/b.keep',
+					'logs/sub/c.keep',
+					'src/test1/b.txt',
+					'test1/a.c',
+					'test1/b.txt',
+					'test1/c/d.txt',
+				]
+
+				results = list(spec.check_files(files))
+				ignores = get_includes(results)
+				debug = debug_results(spec, results)
+
+				self.assertEqual(
+					[(__r.file, __r.include) for __r in results],
+					[(__f, spec.check_file(__f).include) for __f in files],
+					debug,
+				)
+				self.assertEqual(ignores, {
+					'a.txt',
+					'build/b.o',
+					'build/sub/a.c',
+					'logs/a.log',
+					'logs/sub/c.keep',
+					'src/test1/b.txt',
+					'test1/b.txt',
+					'test1/c/d.txt',
+				}, debug)
+
+	def test_11_presorted(self):
+		"""
+		Test checking presorted files gives the same results as checking each file,
+		and out of order files are still checked correctly.
+		"""
+		for sub_test in self.parameterize_from_lines([
+			'*.txt',
+			'!test1/',
+			'build/',
+			'!build/*.c',
+			'logs/**',
+			'!logs/*.keep',
+		]):
+			with sub_test() as spec:
+				files = [
+					'a.txt',
+					'build/sub/a.c',
+					'build/a.c',
+					'build/b.o',
+					'logs/sub/c.keep',
+					'logs/a.log',
+					'logs/b.keep',
+					'test1/c/d.txt',
+					'test1/a.c',
+					'test1/b.txt',
+					'a.c',
+					'build/sub/b.o',
+				]
+
+				results = list(spec.check_files(files, presorted=True))
+				debug = debug_results(spec, results)
+
+				self.assertEqual(
+					[(__r.file, __r.include) for __r in results],
+					[(__f, spec.check_file(__f).include) for __f in files],
+					debug,
+				)
+				self.assertEqual(get_includes(results), {
+					'a.txt',
+					'build/sub/a.c',
+					'build/b.o',
+					'build/sub/b.o',
+					'logs/sub/c.keep',
+					'logs/a.log',
+					'test1/c/d.txt',
+					'test1/b.txt',
+				}, debug)
+
+	def test_12_add(self):
+		"""
+		Test combining specs compiles the combined patterns together because a file
+		pattern takes precedence over a later directory pattern.
+		"""
+		for backend in ['simple', *BACKENDS]:
+			with self.subTest(backend):
+				require_backend(backend)
+				first_spec = GitIgnoreSpec.from_lines(['*.txt'], backend=backend)
+				second_spec = GitIgnoreSpec.from_lines(['!build/'], backend=backend)
+
+				add_spec = first_spec + second_spec
+				iadd_spec = GitIgnoreSpec.from_lines([], backend=backend)
+				iadd_spec += first_spec
+				iadd_spec += second_spec
+
+				for spec in [add_spec, iadd_spec]:
+					self.assertNotIsInstance(spec._backend, LayeredPsBackend)
+					self.assertEqual(spec.check_file('build/a.txt').include, True)
+					self.assertEqual(spec.check_file('build/a.log').include, False)
+
+	def test_12_bytes(self):
+		"""
+		Test checking bytes files.
+		"""
+		for backend in ['simple', *BACKENDS]:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec = GitIgnoreSpec.from_lines(['build/', '!*.txt'], backend=backend)
+				results = list(spec.check_files([b'build/a.txt', b'build/a.log', 'a.log']))
+				self.assertEqual([(__r.file, __r.include) for __r in results], [
+					(b'build/a.txt', False),
+					(b'build/a.log', True),
+					('a.log', None),
+				])
+				self.assertEqual(spec.check_file(b'build/a.log').include, True)
+
+	def test_13_sources(self):
+		"""
+		Test the check results of a layered spec contain the source and line of the
+		matched pattern.
+		"""
+		sources = [
+			('excludes', ['*.log', '*.tmp']),
+			('info/exclude', ['', '# local', 'build/']),
+			('.gitignore', ['!keep.log', '!build/keep.c']),
+		]
+		files = [
+			'a.log',
+			'keep.log',
+			'build/a.c',
+			'build/keep.c',
+			'src/a.c',
+		]
+		for backend in ['simple', *BACKENDS]:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec = LayeredGitIgnoreSpec.from_sources(sources, backend=backend)
+				full_spec = GitIgnoreSpec.from_lines([
+					__line for _, __lines in sources for __line in __lines
+				], backend=backend)
+
+				results = list(spec.check_files(files))
+				self.assertEqual(results, [
+					SourceCheckResult('a.log', True, 0, 'excludes', 1),
+					SourceCheckResult('keep.log', False, 4, '.gitignore', 1),
+					SourceCheckResult('build/a.c', True, 3, 'info/exclude', 3),
+					SourceCheckResult('build/keep.c', False, 5, '.gitignore', 2),
+					SourceCheckResult('src/a.c', None, None, None, None),
+				])
+				self.assertEqual(
+					[(__r.file, __r.include, __r.index) for __r in results],
+					[(__r.file, __r.include, __r.index) for __r in full_spec.check_files(files)],
+				)
+				self.assertEqual([spec.check_file(__f) for __f in files], results)
+
+	def test_13_sources_add(self):
+		"""
+		Test combining a layered spec keeps the sources of the patterns.
+		"""
+		spec = LayeredGitIgnoreSpec.from_sources([
+			('excludes', ['*.log']),
+			('.gitignore', ['', '!keep.log']),
+		], backend='simple')
+		other_spec = GitIgnoreSpec.from_lines(['*.tmp', 'keep.log'], backend='simple')
+		files = ['a.log', 'keep.log', 'a.tmp']
+
+		add_spec = spec + other_spec
+		iadd_spec = LayeredGitIgnoreSpec([], backend='simple')
+		iadd_spec += spec
+		iadd_spec += other_spec
+		for combined_spec in [add_spec, iadd_spec]:
+			self.assertEqual(list(combined_spec.check_files(files)), [
+				SourceCheckResult('a.log', True, 0, 'excludes', 1),
+				SourceCheckResult('keep.log', True, 3, None, 2),
+				SourceCheckResult('a.tmp', True, 2, None, 1),
+			])
+
+	def test_14_hyperscan_shards(self):
+		"""
+		Test the Hyperscan backend with several shards keeps the results of a
+		single database. A file pattern before an include directory pattern in
+		another shard takes precedence.
+		"""
+		require_backend('hyperscan')
+		patterns = GitIgnoreSpec.from_lines([
+			'!/a*',
+			'!a*',
+			'b',
+			'*.py/a.py/*',
+		]).patterns
+		files = ['a.py', 'b/a.py', 'b/c.py', 'c/a.py']
+		backend = HyperscanGiBackend(patterns, shards=1)
+		expected = [backend.match_file(__file) for __file in files]
+		self.assertEqual(expected[1], (False, 1))
+		for shards in [2, 3, 4]:
+			with self.subTest(shards):
+				backend = HyperscanGiBackend(patterns, shards=shards)
+				self.assertGreater(len(backend._dbs), 1)
+				self.assertEqual([backend.match_file(__file) for __file in files], expected)
+				self.assertEqual([
+					backend.match_file_all(__file)[:2] for __file in files
+				], expected)
+
+	def test_14_re2_partitioned(self):
+		"""
+		Test the re2 backend partitions the patterns into several sets, and keeps
+		the results and their pattern indices.
+		"""
+		require_backend('re2')
+		spec = GitIgnoreSpec.from_lines([
+			'*.txt',
+			'!test1/',
+			'dir/**/file.py',
+			'/root.md',
+			'a/b/',
+			'!*.md',
+		], backend='simple')
+		files = [
+			'x.txt',
+			'test1/a.txt',
+			'dir/q/file.py',
+			'root.md',
+			'a/b/c',
+			'z/root.md',
+			'other.py',
+		]
+		backend = Re2GiBackend(spec.patterns, max_mem=RE2_PARTITION_MAX_MEM)
+		self.assertGreater(len(backend._sets), 1)
+		self.assertEqual(
+			[backend.match_file(__file) for __file in files],
+			[spec._backend.match_file(__file) for __file in files],
+		)
+
+	def test_14_re2_partitioned_fold(self):
+		"""
+		Test the re2 backend with several sets keeps the results of a single set.
+		A file pattern before an include directory pattern in another set takes
+		precedence.
+		"""
+		require_backend('re2')
+		patterns = GitIgnoreSpec.from_lines([
+			'!/a*',
+			'!a*',
+			'b',
+			'*.py/a.py/*',
+		]).patterns
+		files = ['a.py', 'b/a.py', 'b/c.py', 'c/a.py']
+		backend = Re2GiBackend(patterns)
+		self.assertEqual(len(backend._sets), 1)
+		expected = [backend.match_file(__file) for __file in files]
+		self.assertEqual(expected[1], (False, 1))
+
+		backend = Re2GiBackend(patterns, max_mem=RE2_PARTITION_MAX_MEM)
+		self.assertGreater(len(backend._sets), 1)
+		self.assertEqual([backend.match_file(__file) for __file in files], expected)
+		self.assertEqual([
+			backend.match_file_all(__file)[:2] for __file in files
+		], expected)
@@ -0,0 +1,153 @@
+"""
+This script tests :class:`.SpecRegistry`.
+"""
+
+import unittest
+
+from pathspec import (
+	GitIgnoreSpec,
+	PathSpec)
+from pathspec.registry import (
+	SpecRegistry)
+
+
+class SpecRegistryTest(unittest.TestCase):
+	"""
+	The :class:`SpecRegistryTest` class tests the :class:`.SpecRegistry` class.
+	"""
+
+	def test_01_shared_backend(self):
+		"""
+		Test path-specs with identical pattern lines share their backend.
+		"""
+		registry = SpecRegistry()
+		first_spec = registry.from_lines(GitIgnoreSpec, None, [
+			'*.txt',
+			'!test1/',
+		], backend='simple')
+		second_spec = registry.from_lines(GitIgnoreSpec, None, [
+			'*.txt',
+			'',
+			'!test1/',
+		], backend='simple')
+
+		self.assertIsInstance(first_spec, GitIgnoreSpec)
+		self.assertIsNot(first_spec, second_spec)
+		self.assertIs(first_spec._backend, second_spec._backend)
+		self.assertIs(first_spec.patterns, second_spec.patterns)
+		self.assertEqual(first_spec, second_spec)
+		self.assertEqual(len(registry), 1)
+		self.assertEqual(first_spec, GitIgnoreSpec.from_lines([
+			'*.txt',
+			'!test1/',
+		]))
+
+	def test_01_different_keys(self):
+		"""
+		Test path-specs are only shared when their class, pattern factory, and
+		backend are also identical.
+		"""
+		registry = SpecRegistry()
+		lines = ['*.txt', '!test1/']
+		specs = [
+			registry.from_lines(GitIgnoreSpec, None, lines, backend='simple'),
+			registry.from_lines(PathSpec, 'gitignore', lines, backend='simple'),
+			registry.from_lines(GitIgnoreSpec, None, lines, backend='best'),
+			registry.from_lines(GitIgnoreSpec, None, [*lines, '*.log'], backend='simple'),
+		]
+
+		self.assertEqual(len(registry), 4)
+		self.assertEqual(len({id(__spec._backend) for __spec in specs}), 4)
+		self.assertIsInstance(specs[1], PathSpec)
+		self.assertNotIsInstance(specs[1], GitIgnoreSpec)
+
+	def test_02_iadd(self):
+		"""
+		Test adding patterns to an interned path-spec does not affect the others.
+		"""
+		registry = SpecRegistry()
+		first_spec = registry.from_lines(PathSpec, 'gitignore', ['*.txt'])
+		second_spec = registry.from_lines(PathSpec, 'gitignore', ['*.txt'])
+
+		first_spec += PathSpec.from_lines('gitignore', ['*.log'])
+
+		self.assertEqual(len(first_spec), 2)
+		self.assertEqual(len(second_spec), 1)
+		self.assertTrue(first_spec.match_file('a.log'))
+		self.assertFalse(second_spec.match_file('a.log'))
+		self.assertEqual(second_spec, registry.from_lines(PathSpec, 'gitignore', [
+			'*.txt',
+		]))
+
+	def test_03_evict(self):
+		"""
+		Test the least recently used path-specs are evicted when the memory budget
+		is exceeded.
+		"""
+		registry = SpecRegistry()
+		first_spec = registry.from_lines(PathSpec, 'gitignore', ['*.a'])
+		registry.max_memory = registry.memory * 2
+
+		registry.from_lines(PathSpec, 'gitignore', ['*.b'])
+		self.assertEqual(len(registry), 2)
+
+		# Use the first path-spec so the second is the least recently used.
+		self.assertIs(
+			registry.from_lines(PathSpec, 'gitignore', ['*.a'])._backend,
+			first_spec._backend,
+		)
+
+		registry.from_lines(PathSpec, 'gitignore', ['*.c'])
+		self.assertEqual(len(registry), 2)
+		self.assertLessEqual(registry.memory, registry.max_memory)
+		self.assertIs(
+			registry.from_lines(PathSpec, 'gitignore', ['*.a'])._backend,
+			first_spec._backend,
+		)
+
+	def test_03_evict_keep_last(self):
+		"""
+		Test the most recently used path-spec is kept even when it exceeds the
+		memory budget.
+		"""
+		registry = SpecRegistry(max_memory=0)
+		first_spec = registry.from_lines(PathSpec, 'gitignore', ['*.a'])
+		self.assertEqual(len(registry), 1)
+
+		second_spec = registry.from_lines(PathSpec, 'gitignore', ['*.b'])
+		self.assertEqual(len(registry), 1)
+		self.assertIs(
+			registry.from_lines(PathSpec, 'gitignore', ['*.b'])._backend,
+			second_spec._backend,
+		)
+		self.assertIsNot(
+			registry.from_lines(PathSpec, 'gitignore', ['*.a'])._backend,
+			first_spec._backend,
+		)
+
+	def test_04_clear(self):
+		"""
+		Test clearing the registry.
+		"""
+		registry = SpecRegistry()
+		registry.from_lines(PathSpec, 'gitignore', ['*.a'])
+		registry.clear()
+
+		self.assertEqual(len(registry), 0)
+		self.assertEqual(registry.memory, 0)
+
+	def test_04_negative_memory(self):
+		"""
+		Test a negative memory budget is invalid.
+		"""
+		with self.assertRaises(ValueError):
+			SpecRegistry(max_memory=-1)
+
+	def test_04_no_factory(self):
+		"""
+		Test only a path-spec class with a default pattern factory accepts no
+		factory.
+		"""
+		registry = SpecRegistry()
+		with self.assertRaises(TypeError):
+			registry.from_lines(PathSpec, None, ['*.a'])
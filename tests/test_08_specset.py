@@ -0,0 +1,181 @@
+"""
+This script tests :class:`.PathSpecSet`.
+"""
+
+import itertools
+import unittest
+
+from pathspec import (
+	GitIgnoreSpec,
+	PathSpec,
+	PathSpecSet)
+from pathspec.backend import (
+	BackendNamesHint)
+from pathspec._backends._utils import (
+	fold_gitignore_match)
+from pathspec.util import (
+	CheckResult)
+
+from .util import (
+	require_backend)
+
+BACKENDS: list[BackendNamesHint] = [
+	'hyperscan',
+	're2',
+	'simple',
+]
+"""
+The backend parameters.
+"""
+
+FILES = [
+	'a.txt',
+	'a.log',
+	'build/a.c',
+	'build/keep.c',
+	'docs/index.md',
+	'src/build/b.o',
+	'src/main.c',
+	'test1/a.txt',
+]
+"""
+The files to check.
+"""
+
+
+class PathSpecSetTest(unittest.TestCase):
+	"""
+	The :class:`PathSpecSetTest` class tests the :class:`.PathSpecSet` class.
+	"""
+
+	def make_specs(self, backend: BackendNamesHint) -> list[PathSpec]:
+		"""
+		Create the path-specs to combine.
+
+		*backend* (:class:`str`) is the backend.
+
+		Returns the path-specs (:class:`list` of :class:`.PathSpec`).
+		"""
+		return [
+			GitIgnoreSpec.from_lines([
+				'*.txt',
+				'!test1/',
+				'build/',
+				'!build/keep.c',
+			], backend=backend),
+			PathSpec.from_lines('gitignore', [
+				'*.c',
+				'!src/',
+				'*.txt',
+				'*.txt',
+			], backend=backend),
+			PathSpec.from_lines('gitignore', [], backend=backend),
+			PathSpec.from_lines('gitignore', [
+				'docs/**',
+				'# comment',
+				'/src/**/*.o',
+			], backend=backend),
+			GitIgnoreSpec.from_lines([
+				'*',
+				'!*.log',
+			], backend=backend),
+		]
+
+	def test_01_check_file(self):
+		"""
+		Test the check results of each path-spec are the same as checking each
+		path-spec separately.
+		"""
+		for backend in BACKENDS:
+			with self.subTest(backend):
+				require_backend(backend)
+				specs = self.make_specs(backend)
+				spec_set = PathSpecSet(specs, backend=backend)
+				self.assertEqual(len(spec_set), len(specs))
+
+				for file in FILES:
+					expected = {}
+					for spec_index, spec in enumerate(specs):
+						result = spec.check_file(file)
+						if result.include is not None:
+							expected[spec_index] = result
+
+					self.assertEqual(spec_set.check_file(file), expected, file)
+
+	def test_02_match_file(self):
+		"""
+		Test matching files returns the indices of the path-specs which include
+		them.
+		"""
+		for backend in BACKENDS:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec_set = PathSpecSet(self.make_specs(backend), backend=backend)
+
+				self.assertEqual(spec_set.match_file('a.txt'), [0, 1, 4])
+				self.assertEqual(spec_set.match_file('a.log'), [])
+				self.assertEqual(spec_set.match_file('build/keep.c'), [1, 4])
+				self.assertEqual(spec_set.match_file('src/main.c'), [4])
+				self.assertEqual(spec_set.match_file('test1/a.txt'), [0, 1, 4])
+				self.assertEqual(list(spec_set.match_files(FILES)), [
+					(__file, spec_set.match_file(__file)) for __file in FILES
+				])
+				self.assertEqual(
+					spec_set.check_file('src/build/b.o'),
+					{
+						0: CheckResult('src/build/b.o', True, 2),
+						1: CheckResult('src/build/b.o', False, 1),
+						3: CheckResult('src/build/b.o', True, 2),
+						4: CheckResult('src/build/b.o', True, 0),
+					},
+				)
+
+	def test_03_empty(self):
+		"""
+		Test a set without patterns.
+		"""
+		for backend in BACKENDS:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec_set = PathSpecSet([
+					PathSpec.from_lines('gitignore', [], backend=backend),
+				], backend=backend)
+				self.assertEqual(spec_set.check_file('a.txt'), {})
+				self.assertEqual(spec_set.match_file('a.txt'), [])
+
+				self.assertEqual(PathSpecSet([], backend=backend).match_file('a.txt'), [])
+
+	def test_04_gitignore_fold(self):
+		"""
+		Test the gitignore matches of a path-spec do not depend on the order they
+		are folded in. A file pattern before an include directory pattern takes
+		precedence.
+		"""
+		for backend in BACKENDS:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec = GitIgnoreSpec.from_lines([
+					'!/a*',
+					'!a*',
+					'b',
+					'*.py/a.py/*',
+				], backend=backend)
+				spec_set = PathSpecSet([spec], backend=backend)
+				expected = CheckResult('b/a.py', False, 1)
+				self.assertEqual(spec.check_file('b/a.py'), expected)
+				self.assertEqual(spec_set.check_file('b/a.py'), {0: expected})
+
+		# Fold the matches in every order.
+		matches = [
+			(True, 0, False),
+			(False, 1, False),
+			(True, 2, True),
+			(True, 4, True),
+			(False, 3, True),
+		]
+		for order in itertools.permutations(matches):
+			out = (None, -1, 0)
+			for include, index, is_dir_pattern in order:
+				out = fold_gitignore_match(out, include, index, is_dir_pattern)
+
+			self.assertEqual(out, (False, 1, 2), order)
@@ -0,0 +1,92 @@
+"""
+This script tests :class:`.PathSpecMap`.
+"""
+
+import unittest
+
+from pathspec import (
+	PathSpecMap)
+from pathspec.backend import (
+	BackendNamesHint)
+from pathspec.patterns.gitignore.basic import (
+	GitIgnoreBasicPattern)
+
+from .util import (
+	require_backend)
+
+BACKENDS: list[BackendNamesHint] = [
+	'hyperscan',
+	're2',
+	'simple',
+]
+"""
+The backend parameters.
+"""
+
+OWNERS = [
+	('*', '@default'),
+	('', '@ignored'),
+	('*.js', '@js'),
+	('/docs/', '@docs'),
+	('build/', '@build'),
+	('!build/keep.js', None),
+	('/docs/api/**/*.md', '@api'),
+]
+"""
+The CODEOWNERS-style rules.
+"""
+
+
+class PathSpecMapTest(unittest.TestCase):
+	"""
+	The :class:`PathSpecMapTest` class tests the :class:`.PathSpecMap` class.
+	"""
+
+	def test_01_lookup(self):
+		"""
+		Test the value of the last matching rule wins.
+		"""
+		files = [
+			'README.md',
+			'src/a.js',
+			'docs/a.js',
+			'docs/api/v1/b.md',
+			'src/docs/c.txt',
+			'build/a.js',
+			'build/keep.js',
+			'lib/build/d.txt',
+		]
+		for backend in BACKENDS:
+			with self.subTest(backend):
+				require_backend(backend)
+				spec_map = PathSpecMap.from_lines('gitignore', OWNERS, backend=backend)
+				self.assertEqual(len(spec_map), 6)
+				self.assertEqual(spec_map.values, [
+					'@default', '@js', '@docs', '@build', None, '@api',
+				])
+
+				expected = [
+					('README.md', '@default'),
+					('src/a.js', '@js'),
+					('docs/a.js', '@docs'),
+					('docs/api/v1/b.md', '@api'),
+					('src/docs/c.txt', '@default'),
+					('build/a.js', '@build'),
+					('build/keep.js', None),
+					('lib/build/d.txt', '@build'),
+				]
+				self.assertEqual([(__f, spec_map.lookup(__f)) for __f in files], expected)
+				self.assertEqual(list(spec_map.lookup_files(files)), expected)
+				self.assertEqual(list(spec_map.lookup_files(sorted(files), presorted=True)), sorted(expected))
+
+	def test_02_no_match(self):
+		"""
+		Test a file without a matching rule has no value.
+		"""
+		spec_map = PathSpecMap([
+			(GitIgnoreBasicPattern('*.py'), 1),
+			(GitIgnoreBasicPattern('*.txt'), 2),
+		], backend='simple')
+		self.assertIsNone(spec_map.lookup('a.md'))
+		self.assertEqual(spec_map.lookup('a.txt'), 2)
+		self.assertEqual(spec_map.lookup('a\\b.py', separators=['\\']), 1)
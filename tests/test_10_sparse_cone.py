@@ -0,0 +1,120 @@
+"""
+This script tests :class:`.SparseConePattern` and its backend.
+"""
+
+import unittest
+
+from pathspec import (
+	PathSpec)
+from pathspec._backends.cone.pathspec import (
+	ConePsBackend)
+from pathspec._backends.simple.pathspec import (
+	SimplePsBackend)
+from pathspec.patterns.gitignore.cone import (
+	SparseConePattern)
+from pathspec.util import (
+	lookup_pattern)
+
+CONE_LINES = [
+	'/*',
+	'!/*/',
+	'/A/',
+	'!/A/*/',
+	'/A/B/',
+	'/C/',
+	'!/C/D/',
+]
+"""
+The sparse-checkout patterns in the cone-mode format.
+"""
+
+FILES = [
+	'root.txt',
+	'A/a.txt',
+	'A/B/b.txt',
+	'A/B/sub/c.txt',
+	'A/X/x.txt',
+	'C/c.txt',
+	'C/D/d.txt',
+	'C/E/e.txt',
+	'Z/z.txt',
+]
+"""
+The files to check.
+"""
+
+
+class SparseConeTest(unittest.TestCase):
+	"""
+	The :class:`SparseConeTest` class tests the :class:`.SparseConePattern` class
+	and the :class:`.ConePsBackend` class.
+	"""
+
+	def test_01_cone(self):
+		"""
+		Test the cone-mode form of the patterns.
+		"""
+		self.assertIs(lookup_pattern('sparse-cone'), SparseConePattern)
+		for pattern, expected in [
+			('/*', ('recursive', '')),
+			('!/*/', ('children', '')),
+			('/A/', ('recursive', 'A/')),
+			('!/A/*/', ('children', 'A/')),
+			('/A/B c/d.e/', ('recursive', 'A/B c/d.e/')),
+			('/A/\\*/', ('recursive', 'A/*/')),
+			('/A/**', ('recursive', 'A/')),
+			('# comment', None),
+			('/A', None),
+			('A/', None),
+			('/A*/', None),
+			('/A/*', None),
+			('/A/*/B/', None),
+			('/**/A/', None),
+		]:
+			with self.subTest(pattern):
+				self.assertEqual(SparseConePattern(pattern)._get_cone(), expected)
+
+	def test_02_backend(self):
+		"""
+		Test the cone-mode backend gives the same results as matching the globs.
+		"""
+		spec = PathSpec.from_lines('sparse-cone', CONE_LINES)
+		self.assertIsInstance(spec._backend, ConePsBackend)
+
+		simple = SimplePsBackend(spec.patterns)
+		batch_match = spec._backend.make_batch_matcher(presorted=True)
+		for file in FILES:
+			with self.subTest(file):
+				self.assertEqual(spec._backend.match_file(file), simple.match_file(file))
+				self.assertEqual(batch_match(file), simple.match_file(file))
+				self.assertEqual(spec._backend.match_file_all(file), simple.match_file_all(file))
+
+		self.assertEqual(set(spec.match_files(FILES)), {
+			'root.txt',
+			'A/a.txt',
+			'A/B/b.txt',
+			'A/B/sub/c.txt',
+			'C/c.txt',
+			'C/E/e.txt',
+		})
+
+	def test_03_fallback(self):
+		"""
+		Test the patterns not in the cone-mode format are matched as globs.
+		"""
+		for lines in [
+			[*CONE_LINES, '*.log'],
+			['# comment'],
+			[],
+		]:
+			with self.subTest(lines):
+				spec = PathSpec.from_lines('sparse-cone', lines)
+				self.assertNotIsInstance(spec._backend, ConePsBackend)
+
+		spec = PathSpec.from_lines('sparse-cone', [*CONE_LINES, '!*.txt', '/C/D/keep.txt'])
+		self.assertEqual(set(spec.match_files([*FILES, 'C/D/keep.txt'])), {
+			'C/D/keep.txt',
+		})
+
+		spec = PathSpec.from_lines('sparse-cone', CONE_LINES, backend='simple')
+		self.assertIsInstance(spec._backend, SimplePsBackend)
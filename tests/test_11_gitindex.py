@@ -0,0 +1,166 @@
+"""
+This script tests the Git index reader in :mod:`pathspec.gitindex`.
+"""
+
+import os
+import pathlib
+import tempfile
+import unittest
+
+from pathspec import (
+	GitIgnoreSpec)
+from pathspec.gitindex import (
+	GitIndexEntry,
+	GitIndexError,
+	iter_index_entries,
+	iter_index_files)
+
+DATA_DIR = pathlib.Path(__file__).parent / 'data' / 'gitindex'
+"""
+The directory containing the index files created by Git.
+"""
+
+FILES = [
+	'README.md',
+	'build/out.log',
+	'café.txt',
+	'docs/index.rst',
+	'link.md',
+	'run.sh',
+	'src/pkg/__init__.py',
+	'src/pkg/mod.py',
+	'src/pkg/sub/deep.py',
+]
+"""
+The files tracked by each index. The version 3 and 4 indexes also track
+"new.txt" which was added with ``git add --intent-to-add`` and uses the
+extended flags.
+"""
+
+VERSION_FILES = {
+	'index-v2': FILES,
+	'index-v3': sorted(FILES + ['new.txt']),
+	'index-v4': sorted(FILES + ['new.txt']),
+}
+"""
+Maps each index file to its tracked files.
+"""
+
+
+class GitIndexTest(unittest.TestCase):
+	"""
+	The :class:`GitIndexTest` class tests the Git index reader.
+	"""
+
+	def test_01_files(self):
+		"""
+		Test reading the files from each version of the index.
+		"""
+		for name, expected in VERSION_FILES.items():
+			with self.subTest(name):
+				files = list(iter_index_files(DATA_DIR / name))
+				self.assertEqual(files, expected)
+
+	def test_01_files_bytes(self):
+		"""
+		Test reading the files as bytes.
+		"""
+		for name, expected in VERSION_FILES.items():
+			with self.subTest(name):
+				files = list(iter_index_files(os.fsencode(DATA_DIR / name)))
+				self.assertEqual(files, [os.fsencode(__file) for __file in expected])
+
+	def test_02_entries(self):
+		"""
+		Test reading the entries of the index.
+		"""
+		entries = {
+			__entry.path: __entry
+			for __entry in iter_index_entries(DATA_DIR / 'index-v4')
+		}
+		self.assertEqual(sorted(entries), VERSION_FILES['index-v4'])
+
+		entry = entries['src/pkg/sub/deep.py']
+		self.assertIsInstance(entry, GitIndexEntry)
+		self.assertEqual(entry.name, 'deep.py')
+		self.assertEqual(entry.mode, 0o100644)
+		self.assertEqual(entry.stage, 0)
+		self.assertTrue(entry.is_file())
+		self.assertFalse(entry.is_dir())
+		self.assertFalse(entry.is_symlink())
+		self.assertGreater(entry.mtime, 0)
+		self.assertEqual(entry.size, 2)
+
+		self.assertEqual(entries['run.sh'].mode, 0o100755)
+
+		link = entries['link.md']
+		self.assertEqual(link.mode, 0o120000)
+		self.assertTrue(link.is_symlink())
+		self.assertFalse(link.is_file())
+
+	def test_02_entries_conflict(self):
+		"""
+		Test reading an index with a conflicted file.
+		"""
+		entries = [
+			(__entry.path, __entry.stage)
+			for __entry in iter_index_entries(DATA_DIR / 'index-conflict')
+		]
+		self.assertEqual(entries, [
+			('a.txt', 1),
+			('a.txt', 2),
+			('a.txt', 3),
+			('z.txt', 0),
+		])
+
+		files = list(iter_index_files(DATA_DIR / 'index-conflict'))
+		self.assertEqual(files, ['a.txt', 'z.txt'])
+
+	def test_03_invalid(self):
+		"""
+		Test reading invalid index files.
+		"""
+		valid = (DATA_DIR / 'index-v2').read_bytes()
+		for name, data in [
+			('empty', b''),
+			('header', valid[:8]),
+			('signature', b'XXXX' + valid[4:]),
+			('version', valid[:4] + b'\0\0\0\x05' + valid[8:]),
+			('entry', valid[:40]),
+			('path', valid[:12 + 62 + 3]),
+		]:
+			with self.subTest(name), tempfile.TemporaryDirectory() as temp_dir:
+				index_file = pathlib.Path(temp_dir) / 'index'
+				index_file.write_bytes(data)
+				with self.assertRaises(GitIndexError):
+					list(iter_index_files(index_file))
+
+	def test_04_match(self):
+		"""
+		Test matching the files of an index with a path-spec.
+		"""
+		spec = GitIgnoreSpec.from_lines([
+			'*.py',
+			'!src/pkg/mod.py',
+			'build/',
+		])
+		expected = [
+			'build/out.log',
+			'src/pkg/__init__.py',
+			'src/pkg/sub/deep.py',
+		]
+		for name, files in VERSION_FILES.items():
+			index_file = DATA_DIR / name
+			with self.subTest(name):
+				self.assertEqual(list(spec.match_index_files(index_file)), expected)
+				self.assertEqual(
+					list(spec.match_index_files(index_file, negate=True)),
+					[__file for __file in files if __file not in expected],
+				)
+				self.assertEqual([
+					__entry.path for __entry in spec.match_index_entries(index_file)
+				], expected)
+				self.assertEqual({
+					__res.file for __res in spec.check_index_files(index_file)
+					if __res.include
+				}, set(expected))
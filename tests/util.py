@@ -40,6 +40,12 @@ from pathspec.util import (
 	TStrPath,
 	TreeEntry)
 
+RE2_PARTITION_MAX_MEM = 1 << 15
+"""
+The memory budget (in bytes) of each re2 regex set used to test partitioning.
+This splits the patterns of most test specs into several sets.
+"""
+
 
 def debug_includes(spec: PathSpec, files: set[str], includes: set[str]) -> str:
 	"""